@@ -0,0 +1,185 @@
+"""
+Micro-benchmarks for each move generator, with stored baselines.
+
+Times every entry in move_functions, plus get_placeable_locations and can_remove_piece, on
+positions curated per piece type - a few hand built boards like those in the unit tests, plus
+every piece found in positions sampled from the replays in game_strings/.  Results are grouped
+by board size, so it's clear which generator dominates as the hive grows:
+
+    small: up to 10 pieces,  medium: up to 20,  large: more
+
+The position cache is turned off while timing (otherwise repeat calls are just lookups), so
+the numbers are the cost of working each result out.
+
+    python -m hive.benchmark.move_generators --save baseline.json
+    python -m hive.benchmark.move_generators --compare baseline.json --threshold 0.2
+
+--compare flags (and exits non-zero on) any benchmark slower than the baseline by more than
+the threshold.  Timings are the best of --repeat runs, in microseconds per call.
+"""
+import argparse
+import json
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from hive.game_engine import pieces
+from hive.game_engine.game_state import BLACK, WHITE, Grid, Location, Piece, initial_game
+from hive.game_engine.grid_functions import can_remove_piece, get_placeable_locations
+from hive.game_engine.moves import move_functions
+from hive.game_engine.position_cache import configure_position_cache, position_cache
+
+SIZES = (("small", 10), ("medium", 20), ("large", None))
+
+PLACEABLE = "get_placeable_locations"
+CAN_REMOVE = "can_remove_piece"
+
+# (grid, location, stack_idx) for a piece
+PieceCase = Tuple[Grid, Location, int]
+
+
+def size_of(grid: Grid) -> str:
+    count = sum(len(stack) for stack in grid.values())
+    for name, limit in SIZES:
+        if limit is None or count <= limit:
+            return name
+
+
+def curated_grids() -> List[Grid]:
+    """Hand built boards, in the style of the unit tests"""
+    grids = [
+        {(0, 0): (Piece(WHITE, pieces.QUEEN, 1),),
+         (2, 0): (Piece(WHITE, pieces.PILLBUG, 1),)},
+        {(0, 0): (Piece(WHITE, pieces.LADYBUG, 1),),
+         (2, 0): (Piece(WHITE, pieces.ANT, 2),),
+         (4, 0): (Piece(WHITE, pieces.QUEEN, 1),)},
+        {(0, 2): (Piece(BLACK, pieces.BEETLE, 1),),
+         (2, 4): (Piece(BLACK, pieces.ANT, 3),),
+         (6, 2): (Piece(WHITE, pieces.ANT, 3),),
+         (3, 3): (Piece(BLACK, pieces.PILLBUG, 1),),
+         (7, 1): (Piece(BLACK, pieces.GRASSHOPPER, 2),),
+         (-2, -2): (Piece(BLACK, pieces.ANT, 1),),
+         (-1, -1): (Piece(WHITE, pieces.MOSQUITO, 1),),
+         (1, 5): (Piece(WHITE, pieces.ANT, 2),),
+         (2, 2): (Piece(BLACK, pieces.QUEEN, 1),),
+         (0, 0): (Piece(WHITE, pieces.GRASSHOPPER, 3),),
+         (3, 1): (Piece(WHITE, pieces.SPIDER, 1),),
+         (5, 3): (Piece(BLACK, pieces.ANT, 2),),
+         (-1, 1): (Piece(BLACK, pieces.GRASSHOPPER, 1),),
+         (-3, -3): (Piece(WHITE, pieces.LADYBUG, 1),),
+         (1, 1): (Piece(BLACK, pieces.LADYBUG, 1),),
+         (-2, 2): (Piece(WHITE, pieces.SPIDER, 2),),
+         (1, 3): (Piece(BLACK, pieces.MOSQUITO, 1),),
+         (0, -2): (Piece(WHITE, pieces.QUEEN, 1),),
+         (-3, -1): (Piece(WHITE, pieces.PILLBUG, 1),)},
+        {(0, 0): (Piece(WHITE, pieces.QUEEN, 1), Piece(BLACK, pieces.BEETLE, 1)),
+         (2, 0): (Piece(BLACK, pieces.QUEEN, 1),),
+         (1, 1): (Piece(WHITE, pieces.SPIDER, 1),),
+         (-1, 1): (Piece(BLACK, pieces.ANT, 1),)},
+    ]
+    return [initial_game(grid).grid for grid in grids]
+
+
+def corpus_grids(games_per_file: int = 2, every: int = 5) -> List[Grid]:
+    """Positions sampled from the replays in game_strings/"""
+    from hive.benchmark.perft import sample_positions
+    return [game.grid for _, game in sample_positions(games_per_file, every) if len(game.grid) > 0]
+
+
+def piece_cases(grids: List[Grid]) -> Dict[str, List[PieceCase]]:
+    """Every piece on top of a stack, by piece type"""
+    cases = defaultdict(list)
+    for grid in grids:
+        for loc, stack in grid.items():
+            cases[stack[-1].name].append((grid, loc, len(stack) - 1))
+    return cases
+
+
+def _best_time(func: Callable, calls: List[tuple], repeat: int) -> float:
+    """Best of `repeat` runs over all the calls, in microseconds per call"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for args in calls:
+            func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best / len(calls) * 1e6
+
+
+def run_benchmarks(grids: List[Grid], repeat: int = 3) -> Dict[str, float]:
+    """Microseconds per call for each '<benchmark>/<board size>'"""
+    calls = defaultdict(list)  # (benchmark, size) -> argument tuples
+    for name, cases in piece_cases(grids).items():
+        for grid, loc, stack_idx in cases:
+            calls[(name, size_of(grid))].append((grid, loc, stack_idx))
+            calls[(CAN_REMOVE, size_of(grid))].append((grid, loc))
+    for grid in grids:
+        calls[(PLACEABLE, size_of(grid))].extend([(grid, WHITE), (grid, BLACK)])
+
+    functions = dict(move_functions)
+    functions[PLACEABLE] = get_placeable_locations
+    functions[CAN_REMOVE] = can_remove_piece
+
+    was_enabled = position_cache.enabled
+    configure_position_cache(enabled=False)
+    try:
+        return {f"{name}/{size}": _best_time(functions[name], args, repeat)
+                for (name, size), args in sorted(calls.items())}
+    finally:
+        configure_position_cache(enabled=was_enabled)
+
+
+def find_regressions(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> Dict[str, float]:
+    """Benchmarks slower than the baseline by more than threshold (0.2 = 20%), with their slowdown"""
+    regressions = {}
+    for key, micros in results.items():
+        base = baseline.get(key)
+        if base is not None and base > 0 and micros > base * (1 + threshold):
+            regressions[key] = micros / base - 1
+    return regressions
+
+
+def format_results(results: Dict[str, float], baseline: Optional[Dict[str, float]] = None) -> str:
+    lines = [f"{'benchmark':<40} {'us/call':>10} {'baseline':>10} {'change':>8}"]
+    for key, micros in results.items():
+        base = (baseline or {}).get(key)
+        if base:
+            lines.append(f"{key:<40} {micros:>10.1f} {base:>10.1f} {micros / base - 1:>+8.0%}")
+        else:
+            lines.append(f"{key:<40} {micros:>10.1f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time each move generator by piece type and board size")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--games", type=int, default=2, help="replays to sample from each game_strings file")
+    parser.add_argument("--every", type=int, default=5, help="sample every n plies of each replay")
+    parser.add_argument("--save", help="write the results as a json baseline")
+    parser.add_argument("--compare", help="json baseline to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown flagged as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(curated_grids() + corpus_grids(args.games, args.every), repeat=args.repeat)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+    print(format_results(results, baseline))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if baseline is not None:
+        regressions = find_regressions(results, baseline, args.threshold)
+        for key, slowdown in regressions.items():
+            print(f"REGRESSION {key}: {slowdown:+.0%}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,157 @@
+"""
+Perft - count every line of play to a fixed depth.
+
+Walks the full game tree from a position, playing every move given by
+get_players_possible_moves_or_placements, and reports for each start position:
+    - leaves: positions reached at the full depth (finished games aren't expanded further)
+    - nodes: all positions visited, and nodes per second
+    - checksum: sum of the Zobrist hashes of the leaves (mod 2^64)
+
+The counts and checksum only depend on the move generator, so they're a regression oracle:
+save them before changing moves.py / grid_functions.py, and check them after - in the same
+run that times the new code.
+
+    python -m hive.benchmark.perft --depth 2 --save perft.json
+    python -m hive.benchmark.perft --depth 2 --check perft.json
+
+Start positions are the empty board plus positions sampled from the replays in game_strings/.
+The tree is walked on a Board (make / unmake) rather than building a Game per node.
+"""
+import argparse
+import glob
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from hive.game_engine.board import Board
+from hive.game_engine.game_functions import get_winner
+from hive.game_engine.game_state import Game, initial_game
+from hive.game_engine.player_functions import get_players_possible_moves_or_placements
+from hive.game_engine.zobrist import MASK_64
+
+GAME_STRINGS_DIR = os.path.join(Path(__file__).parents[2], "game_strings")
+
+
+@dataclass
+class PerftResult:
+    name: str
+    depth: int
+    leaves: int
+    nodes: int
+    checksum: int
+    seconds: float
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds > 0 else 0.0
+
+
+def perft(game: Game, depth: int, name: str = "") -> PerftResult:
+    """Count the lines of play from game to the given depth"""
+    board = Board.from_game(game)
+    start = time.perf_counter()
+    leaves, nodes, checksum = _perft(board, depth)
+    return PerftResult(name=name, depth=depth, leaves=leaves, nodes=nodes,
+                       checksum=checksum, seconds=time.perf_counter() - start)
+
+
+def _perft(board: Board, depth: int) -> Tuple[int, int, int]:
+    """(leaves, nodes, checksum) below this position"""
+    if depth == 0:
+        return 1, 1, board.zobrist
+    if get_winner(board) is not None:
+        return 0, 1, 0  # game over - no lines continue from here
+
+    leaves, nodes, checksum = 0, 1, 0
+    for move in get_players_possible_moves_or_placements(board.current_turn, board):
+        board.play(move)
+        child_leaves, child_nodes, child_checksum = _perft(board, depth - 1)
+        board.undo()
+        leaves += child_leaves
+        nodes += child_nodes
+        checksum = (checksum + child_checksum) & MASK_64
+    return leaves, nodes, checksum
+
+
+def sample_positions(games_per_file: int = 2, every: int = 10,
+                     directory: str = GAME_STRINGS_DIR) -> List[Tuple[str, Game]]:
+    """The empty board, plus every `every`th ply of the first games_per_file replays of each file"""
+    from hive.trajectory.game_string import load_replay_game_strings
+    from hive.trajectory.boardspace import replay_trajectory
+
+    positions = [("empty", initial_game())]
+    for filepath in sorted(glob.glob(os.path.join(directory, "*.txt"))):
+        stem = Path(filepath).stem
+        for idx, game_string in enumerate(load_replay_game_strings(filepath, start_end_idx=(0, games_per_file))):
+            for ply in range(every, len(game_string.moves) + 1, every):
+                game = replay_trajectory(game_string.moves[:ply])
+                if get_winner(game) is None:
+                    positions.append((f"{stem}#{idx}@{ply}", game))
+    return positions
+
+
+def run_perft(positions: List[Tuple[str, Game]], depth: int) -> List[PerftResult]:
+    return [perft(game, depth, name=name) for name, game in positions]
+
+
+def save_results(results: List[PerftResult], filepath: str):
+    with open(filepath, "w") as f:
+        json.dump([asdict(result) for result in results], f, indent=2)
+
+
+def check_results(results: List[PerftResult], filepath: str) -> List[str]:
+    """Differences in leaves / checksum against saved results - empty if everything matches"""
+    with open(filepath, "r") as f:
+        expected: Dict[Tuple[str, int], dict] = {(r["name"], r["depth"]): r for r in json.load(f)}
+
+    differences = []
+    for result in results:
+        saved = expected.get((result.name, result.depth))
+        if saved is None:
+            differences.append(f"{result.name} depth {result.depth}: no saved result")
+        elif (saved["leaves"], saved["checksum"]) != (result.leaves, result.checksum):
+            differences.append(f"{result.name} depth {result.depth}: leaves {result.leaves} checksum {result.checksum:016x}, "
+                               f"expected leaves {saved['leaves']} checksum {saved['checksum']:016x}")
+    return differences
+
+
+def format_results(results: List[PerftResult]) -> str:
+    lines = [f"{'position':<50} {'depth':>5} {'leaves':>10} {'nodes':>10} {'nodes/s':>10}  checksum"]
+    for r in results:
+        lines.append(f"{r.name:<50} {r.depth:>5} {r.leaves:>10} {r.nodes:>10} {r.nodes_per_second:>10.0f}  {r.checksum:016x}")
+    nodes = sum(r.nodes for r in results)
+    seconds = sum(r.seconds for r in results)
+    lines.append(f"total: {sum(r.leaves for r in results)} leaves, {nodes} nodes in {seconds:.2f}s "
+                 f"({nodes / seconds if seconds > 0 else 0:.0f} nodes/s)")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Count lines of play to a fixed depth (perft)")
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--games", type=int, default=2, help="replays to sample from each game_strings file")
+    parser.add_argument("--every", type=int, default=10, help="sample every n plies of each replay")
+    parser.add_argument("--save", help="write the results to this json file")
+    parser.add_argument("--check", help="compare leaves and checksums against this json file")
+    args = parser.parse_args(argv)
+
+    results = run_perft(sample_positions(args.games, args.every), args.depth)
+    print(format_results(results))
+
+    if args.save:
+        save_results(results, args.save)
+    if args.check:
+        differences = check_results(results, args.check)
+        for difference in differences:
+            print(f"MISMATCH {difference}")
+        if differences:
+            return 1
+        print("all leaf counts and checksums match")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
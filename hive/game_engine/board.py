@@ -0,0 +1,173 @@
+"""
+A mutable board for search.
+
+Playing a move on a Game builds a new immutable state (new grid, turn counts, unplayed pieces,
+queens and a parent link).  That's what we want for replays and training data, but a search
+only ever looks at one position at a time, so allocating a new state per node is wasted work.
+
+Board holds the same information as a Game in plain mutable containers, and plays / undoes
+moves in place:
+
+    board = Board.from_game(game)
+    for move in get_players_possible_moves_or_placements(board.current_turn, board):
+        board.play(move)
+        ...  # search the child position
+        board.undo()
+
+Board has the same attributes the move generators and board scores read from a Game (grid,
+current_turn, player_turns, queens, unplayed_pieces, move, piece_moved_last_turn, zobrist,
+piece_locations),
+so it can be passed to them directly.  Board.to_game() gives back an equivalent Game.
+The placement frontier (frontier.py) is not tracked on a Board - placements are worked out
+from the grid instead.
+"""
+from typing import Dict, List, Optional, Union
+
+from pyrsistent import pmap
+
+from hive.game_engine import pieces
+from hive.game_engine.frontier import compute_frontier
+from hive.game_engine.game_functions import opposite_colour
+from hive.game_engine.game_state import Colour, Game, Location, MutableGrid, Piece, index_pieces
+from hive.game_engine.moves import Move, NoMove
+from hive.game_engine.zobrist import last_move_key, piece_key, register_grid_hash, turn_key
+
+
+class Board:
+    """Mutable game state with make / unmake of moves"""
+    __slots__ = ('grid', 'current_turn', 'player_turns', 'queens', 'unplayed_pieces',
+                 'piece_moved_last_turn', 'move', 'piece_locations', '_history')
+
+    def __init__(self,
+                 grid: MutableGrid,
+                 current_turn: Colour,
+                 player_turns: Dict[Colour, int],
+                 queens: Dict[Colour, Location],
+                 unplayed_pieces: Dict[Colour, List[Piece]],
+                 piece_moved_last_turn: Optional[Piece] = None,
+                 move: Optional[Union[Move, NoMove]] = None):
+        self.grid = grid
+        self.current_turn = current_turn
+        self.player_turns = player_turns
+        self.queens = queens
+        self.unplayed_pieces = unplayed_pieces
+        self.piece_moved_last_turn = piece_moved_last_turn
+        self.move = move
+        self.piece_locations = index_pieces(grid)  # Piece -> (Location, stack_idx)
+        self._history: List[tuple] = []  # one undo record per move played
+
+    @classmethod
+    def from_game(cls, game: Game) -> 'Board':
+        grid_zobrist = game.zobrist ^ turn_key(game.current_turn) ^ last_move_key(game.piece_moved_last_turn, game.move)
+        grid = MutableGrid(game.grid, zobrist=grid_zobrist)
+        return cls(grid=grid,
+                   current_turn=game.current_turn,
+                   player_turns=dict(game.player_turns),
+                   queens=dict(game.queens),
+                   unplayed_pieces={colour: list(unplayed) for colour, unplayed in game.unplayed_pieces.items()},
+                   piece_moved_last_turn=game.piece_moved_last_turn,
+                   move=game.move)
+
+    def to_game(self, parent: Optional[Game] = None) -> Game:
+        """An immutable copy of the current position"""
+        game = Game(grid=pmap(self.grid),
+                    current_turn=self.current_turn,
+                    player_turns=self.player_turns,
+                    queens=self.queens,
+                    unplayed_pieces={colour: tuple(unplayed) for colour, unplayed in self.unplayed_pieces.items()},
+                    piece_moved_last_turn=self.piece_moved_last_turn,
+                    move=self.move,
+                    parent=parent,
+                    zobrist=self.zobrist,
+                    piece_locations=self.piece_locations)
+        register_grid_hash(game.grid, self.grid.zobrist)
+        return game.set('frontier', compute_frontier(game.grid))
+
+    @property
+    def zobrist(self) -> int:
+        return self.grid.zobrist ^ turn_key(self.current_turn) ^ last_move_key(self.piece_moved_last_turn, self.move)
+
+    @property
+    def ply(self) -> int:
+        """Number of moves played on this board since it was created"""
+        return len(self._history)
+
+    def play(self, move: Union[Move, NoMove]):
+        """Play a move in place.  The move is assumed to be legal (as given by the move generators)"""
+        unplayed_idx, previous_queen = None, None
+        previous = (self.move, self.piece_moved_last_turn, self.current_turn)
+
+        if isinstance(move, NoMove):
+            colour = move.colour
+            self.piece_moved_last_turn = None
+        elif move.current_location is None:
+            colour = move.piece.colour  # placements count towards the piece's colour (see place_piece)
+            unplayed = self.unplayed_pieces[colour]
+            unplayed_idx = unplayed.index(move.piece)
+            del unplayed[unplayed_idx]
+            self._push(move.new_location, move.piece)
+            previous_queen = self._update_queen(move.piece, move.new_location)
+            self.piece_moved_last_turn = None
+        else:
+            colour = move.colour
+            piece = self._pop(move.current_location)
+            self._push(move.new_location, piece)
+            previous_queen = self._update_queen(piece, move.new_location)
+            self.piece_moved_last_turn = piece
+
+        self.player_turns[colour] = self.player_turns.get(colour, 0) + 1
+        self.current_turn = opposite_colour(colour)
+        self.move = move
+        self._history.append((move, colour, unplayed_idx, previous_queen) + previous)
+
+    def undo(self):
+        """Take back the last move played"""
+        move, colour, unplayed_idx, previous_queen, previous_move, previous_piece_moved, previous_turn = self._history.pop()
+
+        self.player_turns[colour] -= 1
+        self.current_turn = previous_turn
+        self.move = previous_move
+        self.piece_moved_last_turn = previous_piece_moved
+
+        if isinstance(move, NoMove):
+            return
+
+        piece = self._pop(move.new_location)
+        if move.current_location is None:
+            self.unplayed_pieces[piece.colour].insert(unplayed_idx, piece)
+        else:
+            self._push(move.current_location, piece)
+        self._restore_queen(piece, previous_queen)
+
+    def _push(self, location: Location, piece: Piece):
+        stack = self.grid.get(location, ())
+        self.grid[location] = stack + (piece,)
+        self.piece_locations[piece] = (location, len(stack))
+        self.grid.zobrist ^= piece_key(piece, location, len(stack))
+
+    def _pop(self, location: Location) -> Piece:
+        stack = self.grid[location]
+        piece = stack[-1]
+        if len(stack) == 1:
+            del self.grid[location]
+        else:
+            self.grid[location] = stack[:-1]
+        del self.piece_locations[piece]
+        self.grid.zobrist ^= piece_key(piece, location, len(stack) - 1)
+        return piece
+
+    def _update_queen(self, piece: Piece, location: Location) -> Optional[Location]:
+        """Track the queen, returning where it was before"""
+        if piece.name != pieces.QUEEN:
+            return None
+        previous = self.queens.get(piece.colour)
+        self.queens[piece.colour] = location
+        return previous
+
+    def _restore_queen(self, piece: Piece, previous: Optional[Location]):
+        if piece.name != pieces.QUEEN:
+            return
+        if previous is None:
+            del self.queens[piece.colour]
+        else:
+            self.queens[piece.colour] = previous
@@ -0,0 +1,150 @@
+"""
+Position keys that are the same under translation, rotation and reflection.
+
+The hive has no fixed origin or orientation, so a position shifted across the board, turned
+by a multiple of 60 degrees or mirrored is the same position - but its grid, and so its
+Zobrist hash, differ.  canonical_position tries all 12 rotations / reflections, shifts each
+so its first location (by row, then column) is at (0, 0), and keeps the one that hashes lowest:
+
+    position = canonical_position(game)
+    position.key          # the same for every equivalent position
+    position.transform    # maps this game's locations onto the canonical ones
+
+Moves can be stored in the canonical frame (eg in an opening book or transposition table)
+and mapped back onto any equivalent game:
+
+    stored = transform_move(move, position.transform)
+    move = untransform_move(stored, other_position.transform)
+
+Like game.zobrist, the key covers the grid, the side to move and the piece moved last turn, and
+pieces keep their numbers.
+
+Symmetries are applied in cube coordinates: a doubled (q, r) location is the cube location
+x = (q - r) / 2, z = r, y = -x - z.
+"""
+from typing import Dict, List, NamedTuple, Tuple, Union
+
+from hive.game_engine.game_state import Game, Grid, Location
+from hive.game_engine.moves import Move, NoMove
+from hive.game_engine.position_cache import position_cached
+from hive.game_engine.zobrist import last_move_key, piece_key, turn_key
+
+ROTATIONS = 6
+
+
+class Transform(NamedTuple):
+    """Reflect (if reflected), rotate by rotation x 60 degrees, then shift by offset"""
+    rotation: int
+    reflected: bool
+    offset: Location
+
+
+IDENTITY = Transform(0, False, (0, 0))
+
+SYMMETRIES: Tuple[Tuple[int, bool], ...] = tuple((rotation, reflected)
+                                                 for reflected in (False, True)
+                                                 for rotation in range(ROTATIONS))
+
+
+class CanonicalPosition(NamedTuple):
+    key: int
+    transform: Transform
+
+
+def _to_cube(loc: Location) -> Tuple[int, int, int]:
+    q, r = loc
+    x = (q - r) // 2
+    return x, -x - r, r
+
+
+def _from_cube(x: int, y: int, z: int) -> Location:
+    return 2 * x + z, z
+
+
+def _apply_symmetry(loc: Location, rotation: int, reflected: bool) -> Location:
+    x, y, z = _to_cube(loc)
+    if reflected:
+        y, z = z, y
+    for _ in range(rotation):
+        x, y, z = -z, -x, -y
+    return _from_cube(x, y, z)
+
+
+def _invert_symmetry(loc: Location, rotation: int, reflected: bool) -> Location:
+    loc = _apply_symmetry(loc, (ROTATIONS - rotation) % ROTATIONS, False)
+    if reflected:
+        loc = _apply_symmetry(loc, 0, True)
+    return loc
+
+
+def transform_location(loc: Location, transform: Transform) -> Location:
+    q, r = _apply_symmetry(loc, transform.rotation, transform.reflected)
+    return q + transform.offset[0], r + transform.offset[1]
+
+
+def inverse_location(loc: Location, transform: Transform) -> Location:
+    """The location transform_location maps onto loc"""
+    shifted = (loc[0] - transform.offset[0], loc[1] - transform.offset[1])
+    return _invert_symmetry(shifted, transform.rotation, transform.reflected)
+
+
+def transform_grid(grid: Grid, transform: Transform) -> Dict[Location, tuple]:
+    return {transform_location(loc, transform): stack for loc, stack in grid.items()}
+
+
+def transform_move(move: Union[Move, NoMove], transform: Transform) -> Union[Move, NoMove]:
+    """The move, with its locations mapped by transform (passes are unchanged)"""
+    return _map_move(move, lambda loc: transform_location(loc, transform))
+
+
+def untransform_move(move: Union[Move, NoMove], transform: Transform) -> Union[Move, NoMove]:
+    """Undo transform_move"""
+    return _map_move(move, lambda loc: inverse_location(loc, transform))
+
+
+def _map_move(move: Union[Move, NoMove], map_location) -> Union[Move, NoMove]:
+    if isinstance(move, NoMove):
+        return move
+    current_location = None if move.current_location is None else map_location(move.current_location)
+    return Move(piece=move.piece,
+                current_location=current_location,
+                current_stack_idx=move.current_stack_idx,
+                new_location=map_location(move.new_location),
+                new_stack_idx=move.new_stack_idx,
+                colour=move.colour,
+                pillbug_moved_other_piece=move.pillbug_moved_other_piece)
+
+
+@position_cached
+def canonical_grid(grid: Grid) -> CanonicalPosition:
+    """The canonical key of the pieces on the board (not including the side to move)"""
+    if len(grid) == 0:
+        return CanonicalPosition(0, IDENTITY)
+
+    stacks: List[tuple] = list(grid.items())
+    best = None
+    for rotation, reflected in SYMMETRIES:
+        locations = [_apply_symmetry(loc, rotation, reflected) for loc, _ in stacks]
+        anchor_r, anchor_q = min((r, q) for q, r in locations)
+        offset = (-anchor_q, -anchor_r)
+
+        key = 0
+        for (q, r), (_, stack) in zip(locations, stacks):
+            shifted = (q + offset[0], r + offset[1])
+            for stack_idx, piece in enumerate(stack):
+                key ^= piece_key(piece, shifted, stack_idx)
+
+        if best is None or key < best.key:
+            best = CanonicalPosition(key, Transform(rotation, reflected, offset))
+    return best
+
+
+def canonical_position(game: Game) -> CanonicalPosition:
+    """The canonical key of the position (grid, side to move and last move), and the transform onto it"""
+    grid_key, transform = canonical_grid(game.grid)
+    key = grid_key ^ turn_key(game.current_turn) ^ last_move_key(game.piece_moved_last_turn, game.move)
+    return CanonicalPosition(key, transform)
+
+
+def canonical_key(game: Game) -> int:
+    return canonical_position(game).key
@@ -0,0 +1,94 @@
+"""
+The placement frontier, kept up to date on every Game.
+
+The frontier is every empty location touching the hive.  A piece can be placed at a frontier
+location if every piece touching it (top of stack) is the placing player's colour.
+
+Working that out from scratch means walking every occupied location and its neighbours, which
+was done for every call to get_placeable_locations.  But a placement or move only changes one
+or two stacks, and a location's status only depends on its neighbours, so only the locations on
+and around the changed stacks need looking at again.  place_piece and move_piece do that as they
+build the next state, so listing placements costs O(changes) rather than O(board).
+"""
+from typing import FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from hive.game_engine.game_state import BLACK, WHITE, Colour, Game, Grid, Location
+from hive.game_engine.grid_functions import get_empty_locations, get_placeable_locations, positions_around_location
+
+
+class PlacementFrontier(NamedTuple):
+    empty: FrozenSet[Location]  # empty locations touching the hive
+    white: FrozenSet[Location]  # locations where white can place
+    black: FrozenSet[Location]  # locations where black can place
+
+    def placeable(self, colour: Colour) -> FrozenSet[Location]:
+        return self.white if colour == WHITE else self.black
+
+
+def compute_frontier(grid: Grid) -> PlacementFrontier:
+    """Work out the frontier from scratch"""
+    return PlacementFrontier(empty=frozenset(get_empty_locations(grid)),
+                             white=_placeable_from_scratch(grid, WHITE),
+                             black=_placeable_from_scratch(grid, BLACK))
+
+
+def _placeable_from_scratch(grid: Grid, colour: Colour) -> FrozenSet[Location]:
+    if len(grid) <= 1:
+        return frozenset()  # no colour rule yet - handled in placeable_locations
+    return frozenset(get_placeable_locations(grid, colour))
+
+
+def update_frontier(frontier: Optional[PlacementFrontier], grid: Grid, changed: Iterable[Location]) -> PlacementFrontier:
+    """The frontier after the stacks at the changed locations have been updated in grid"""
+    if frontier is None or len(grid) <= 2:
+        return compute_frontier(grid)  # small enough to redo, and the colour rule only starts at 2 pieces
+
+    affected = set()
+    for loc in changed:
+        affected.add(loc)
+        affected.update(positions_around_location(loc))
+
+    empty, white, black = [], [], []
+    for loc in affected:
+        if loc in grid:
+            continue  # occupied, so not on the frontier
+        colours = _colours_around(grid, loc)
+        if not colours:
+            continue  # not touching the hive
+        empty.append(loc)
+        if colours == (True, False):
+            white.append(loc)
+        elif colours == (False, True):
+            black.append(loc)
+
+    return PlacementFrontier(empty=frontier.empty.difference(affected).union(empty),
+                             white=frontier.white.difference(affected).union(white),
+                             black=frontier.black.difference(affected).union(black))
+
+
+def _colours_around(grid: Grid, loc: Location) -> Optional[Tuple[bool, bool]]:
+    """(touches white, touches black) looking at the top of each neighbouring stack, None if touching nothing"""
+    touches_white, touches_black = False, False
+    for pos in positions_around_location(loc):
+        stack = grid.get(pos)
+        if stack:
+            if stack[-1].colour == WHITE:
+                touches_white = True
+            else:
+                touches_black = True
+    if not (touches_white or touches_black):
+        return None
+    return touches_white, touches_black
+
+
+def placeable_locations(game: Game, colour: Colour) -> List[Location]:
+    """Return all locations where a piece of the given colour can be placed (see get_placeable_locations)"""
+    frontier = getattr(game, 'frontier', None)
+    if frontier is None:
+        return get_placeable_locations(game.grid, colour)  # eg a mutable Board - no frontier kept
+
+    if len(game.grid) == 0:
+        return [(0, 0)]
+    if len(game.grid) == 1:
+        return list(frontier.empty)
+    return list(frontier.placeable(colour))
@@ -1,10 +1,16 @@
-from functools import lru_cache
-from typing import Optional
+from typing import Optional, Tuple
+
+from pyrsistent import PMap, pmap
 
 from hive.game_engine import pieces
 from hive.game_engine.errors import NoQueenError
+from hive.game_engine.frontier import update_frontier
+from hive.game_engine.history import MOVE, PASS, PLACE, PlayedMove, link_history
 from hive.game_engine.grid_functions import pieces_around_location, check_is_valid_location, check_is_valid_placement, check_is_valid_move
-from hive.game_engine.game_state import BLACK, WHITE, Game, Grid, Piece, Location, Colour
+from hive.game_engine.game_state import BLACK, WHITE, Game, Grid, Piece, Location, Colour, index_pieces
+from hive.game_engine.position_cache import position_cached
+from hive.profiling import profiled
+from hive.game_engine.zobrist import last_move_key, piece_key, register_grid_hash, turn_key
 
 def current_turn_colour(game: Game) -> Colour:
     return game.current_turn
@@ -16,9 +22,19 @@ def check_queen_timely_placement(game: Game, colour: Colour, moves_to_queen=4):
     if not game.queens.get(colour, False):
         raise NoQueenError(f"No Queen found for {colour}")
 
-@lru_cache(maxsize=None)
+def _piece_locations(game: Game) -> PMap:
+    if not game.piece_locations and game.grid:
+        return pmap(index_pieces(game.grid))  # Game built by hand with a grid, rather than by initial_game
+    return game.piece_locations
+
+def locate_piece(game: Game, piece: Piece) -> Optional[Tuple[Location, int]]:
+    """(Location, stack_idx) of a piece, or None if it isn't on the grid"""
+    return _piece_locations(game).get(piece)
+
+@position_cached
 def get_queen_location(grid: Grid, colour: Colour) -> Optional[Location]:
-    """Get the location of the queen for a given colour."""
+    """Get the location of the queen for a given colour.
+    With a Game to hand, game.queens (or locate_piece) is O(1)."""
 
     # loop over grid and find queen
     queen_location = None  # if not found, remains None
@@ -30,6 +46,7 @@ def get_queen_location(grid: Grid, colour: Colour) -> Optional[Location]:
     return queen_location
 
 
+@profiled
 def place_piece(game: Game, piece: Piece, location: Location, move=None) -> Game:
     check_is_valid_location(location)
     check_is_valid_placement(game.grid, location, piece.colour)
@@ -39,7 +56,16 @@ def place_piece(game: Game, piece: Piece, location: Location, move=None) -> Game
     # Add the piece to the stack at the location
     current_stack = game.grid.get(location, ())
     updated_stack = current_stack + (piece,)
-    game_mutable = game_mutable.set('grid', game.grid.set(location, updated_stack))
+    updated_grid = game.grid.set(location, updated_stack)
+    game_mutable = game_mutable.set('grid', updated_grid)
+    zobrist = (game.zobrist
+               ^ turn_key(game.current_turn)
+               ^ last_move_key(game.piece_moved_last_turn, game.move)
+               ^ piece_key(piece, location, len(current_stack)))
+    register_grid_hash(updated_grid, zobrist)
+    game_mutable = game_mutable.set('frontier', update_frontier(game.frontier, updated_grid, (location,)))
+
+    game_mutable = game_mutable.set('piece_locations', _piece_locations(game).set(piece, (location, len(current_stack))))
 
     # Update queen location if needed
     if piece.name == pieces.QUEEN:
@@ -54,6 +80,8 @@ def place_piece(game: Game, piece: Piece, location: Location, move=None) -> Game
     current_turn = game.player_turns.get(piece.colour, 0)
     game_mutable = game_mutable.set('player_turns', game.player_turns.set(piece.colour, current_turn + 1))
     game_mutable = game_mutable.set('current_turn', opposite_colour(piece.colour))
+    zobrist ^= turn_key(opposite_colour(piece.colour))
+    game_mutable = game_mutable.set('zobrist', zobrist)
 
     # set piece moved last turn
     game_mutable = game_mutable.set('piece_moved_last_turn', None)
@@ -62,12 +90,13 @@ def place_piece(game: Game, piece: Piece, location: Location, move=None) -> Game
         game_mutable = game_mutable.set('move', move)
 
     new_game = game_mutable.persistent()
-    new_game = new_game.set('parent', game)  # Store reference to previous game state
+    new_game = link_history(new_game, game, PlayedMove(PLACE, piece=piece, new_location=location, move=move))
 
     check_queen_timely_placement(new_game, piece.colour)
 
     return new_game
 
+@profiled
 def move_piece(game: Game, current_location: Location, location: Location, colour: Colour, move=None) -> Game:
     check_is_valid_location(location)
     check_is_valid_move(game.grid, current_location, location)
@@ -93,6 +122,13 @@ def move_piece(game: Game, current_location: Location, location: Location, colou
     destination_stack = game.grid.get(location, ())
     updated_destination_stack = destination_stack + (piece,)
     updated_grid = updated_grid.set(location, updated_destination_stack)
+    zobrist = (game.zobrist
+               ^ turn_key(game.current_turn)
+               ^ last_move_key(game.piece_moved_last_turn, game.move)
+               ^ piece_key(piece, current_location, len(current_stack) - 1)
+               ^ piece_key(piece, location, len(destination_stack)))
+    register_grid_hash(updated_grid, zobrist)
+    game_mutable = game_mutable.set('piece_locations', _piece_locations(game).set(piece, (location, len(destination_stack))))
 
     # Update queen position if needed
     if piece.name == pieces.QUEEN:  # Fixed: QUEEN -> pieces.QUEEN
@@ -102,10 +138,12 @@ def move_piece(game: Game, current_location: Location, location: Location, colou
     current_turn = game.player_turns.get(colour, 0)
     game_mutable = game_mutable.set('player_turns', game.player_turns.set(colour, current_turn + 1))
     game_mutable = game_mutable.set('current_turn', opposite_colour(colour))
+    zobrist ^= turn_key(opposite_colour(colour))
+    zobrist ^= last_move_key(piece, move if move is not None else game.move)
 
     game_mutable = game_mutable.set('grid', updated_grid)
-
-    game_mutable = game_mutable.set('parent', game)  # Store reference to previous game state
+    game_mutable = game_mutable.set('zobrist', zobrist)
+    game_mutable = game_mutable.set('frontier', update_frontier(game.frontier, updated_grid, (current_location, location)))
 
     # set piece moved last turn
     game_mutable = game_mutable.set('piece_moved_last_turn', piece)
@@ -114,6 +152,8 @@ def move_piece(game: Game, current_location: Location, location: Location, colou
         game_mutable = game_mutable.set('move', move)
 
     new_game = game_mutable.persistent()
+    new_game = link_history(new_game, game, PlayedMove(MOVE, current_location=current_location, new_location=location,
+                                                       colour=colour, move=move))
 
     check_queen_timely_placement(new_game, piece.colour)
 
@@ -126,6 +166,10 @@ def pass_move(game: Game, colour: str, move=None) -> Game:
     current_turn = game.player_turns.get(colour, 0)
     game_mutable = game_mutable.set('player_turns', game.player_turns.set(colour, current_turn + 1))
     game_mutable = game_mutable.set('current_turn', opposite_colour(colour))
+    game_mutable = game_mutable.set('zobrist', (game.zobrist
+                                                ^ turn_key(game.current_turn)
+                                                ^ last_move_key(game.piece_moved_last_turn, game.move)
+                                                ^ turn_key(opposite_colour(colour))))
 
     if move is not None:
         game_mutable = game_mutable.set('move', move)
@@ -134,7 +178,7 @@ def pass_move(game: Game, colour: str, move=None) -> Game:
     game_mutable = game_mutable.set('piece_moved_last_turn', None)
 
     new_game = game_mutable.persistent()
-    new_game = new_game.set('parent', game)  # Store reference to previous game state
+    new_game = link_history(new_game, game, PlayedMove(PASS, colour=colour, move=move))
     return new_game
 
 
@@ -20,6 +20,14 @@ Stack = Tuple[Piece, ...]
 Location = Tuple[int, int]
 Grid = PMap  # PMap[Location, Stack]
 
+class MutableGrid(dict):
+    """A grid which is changed in place (see board.py), carrying the Zobrist hash of its pieces"""
+    __slots__ = ('zobrist',)
+
+    def __init__(self, *args, zobrist: int = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.zobrist = zobrist
+
 class GridLocation(NamedTuple):
     stack: Stack
     location: Location
@@ -31,9 +39,17 @@ class Game(PRecord):
     player_turns = pmap_field(str, int)  # Colour to turn count
     queens = pmap_field(str, tuple)  # Colour to Location (tuple of ints)
     parent = field(initial=None)  # Self-reference to Game, can't use type='Game' directly
+    history = field(initial=None)  # None to keep parent, a GameHistory, or NO_HISTORY (see history.py)
     move = field(initial=None)  # Move that led to this game state
     unplayed_pieces = pmap_field(str, tuple)  # Colour to unplayed pieces (tuple of Pieces
     piece_moved_last_turn = field(initial=None)  # Piece that was moved last turn
+    zobrist = field(type=int, initial=0)  # 64-bit Zobrist hash of grid, side to move and last move (see zobrist.py)
+    frontier = field(initial=None)  # PlacementFrontier - empty / placeable locations (see frontier.py)
+    piece_locations = pmap_field(Piece, tuple)  # Piece to (Location, stack_idx) for every piece on the grid
+
+def index_pieces(grid: Grid) -> Dict[Piece, Tuple[Location, int]]:
+    """Piece to (Location, stack_idx) for every piece on the grid"""
+    return {piece: (loc, idx) for loc, stack in grid.items() for idx, piece in enumerate(stack)}
 
 def create_standard_pieces(colour: str) -> Tuple[Piece, ...]:
     return (Piece(colour, pieces.QUEEN, 1),
@@ -58,6 +74,9 @@ def create_expanded_pieces(colour: str) -> Tuple[Piece, ...]:
 def initial_game(grid: Optional[Grid|dict] = None,
                  pieces_function = create_expanded_pieces,
                  current_turn=WHITE) -> Game:
+    from hive.game_engine.frontier import compute_frontier
+    from hive.game_engine.zobrist import hash_position
+
     white_pieces = pieces_function(WHITE)
     black_pieces = pieces_function(BLACK)
 
@@ -68,29 +87,32 @@ def initial_game(grid: Optional[Grid|dict] = None,
     if isinstance(grid, dict):
         grid = create_immutable_grid(grid)
 
+    piece_locations = index_pieces(grid)
+
     # Find queens if they exist
     queens = {}
-    for loc, stack in grid.items():
-        for piece in stack:
-            if piece.name == QUEEN:
-                queens[piece.colour] = loc
+    for piece, (loc, _) in piece_locations.items():
+        if piece.name == QUEEN:
+            queens[piece.colour] = loc
     queens = pmap(queens)
 
     # remove any played pieces from the unplayed pieces
     unplayed_pieces = {
-        WHITE: tuple(piece for piece in white_pieces if not any(piece in stack for stack in grid.values())),
-        BLACK: tuple(piece for piece in black_pieces if not any(piece in stack for stack in grid.values()))
+        WHITE: tuple(piece for piece in white_pieces if piece not in piece_locations),
+        BLACK: tuple(piece for piece in black_pieces if piece not in piece_locations)
     }
     
     unplayed_pieces = pmap(unplayed_pieces)
 
-    return Game(
+    game = Game(
         grid=grid,
         player_turns={WHITE: 0, BLACK: 0},
         queens=queens,
         unplayed_pieces=unplayed_pieces,
         current_turn=current_turn,
+        piece_locations=piece_locations,
     )
+    return game.set(zobrist=hash_position(game.grid, current_turn), frontier=compute_frontier(game.grid))
 
 def create_immutable_grid(grid_dict: dict) -> Grid:
     """ Create a grid from a dictionary of locations and stacks. """
@@ -1,12 +1,15 @@
 from __future__ import annotations
 from functools import lru_cache
-from typing import List, Tuple, NamedTuple
+from typing import FrozenSet, List, Tuple, NamedTuple
 from typing import TYPE_CHECKING
 from hive.game_engine.errors import BreaksConnectionError, InvalidLocationError, InvalidMoveError, InvalidPlacementError
 from hive.game_engine.game_state import Location, Grid, Colour, Piece, GridLocation
+from hive.game_engine.packed_locations import DIRECTIONS, NEIGHBOUR_OFFSETS, packed_occupied, unpack_locations
+from hive.game_engine.position_cache import position_cached
+from hive.profiling import profiled
 
 
-@lru_cache(maxsize=None)
+@lru_cache(maxsize=2 ** 16)
 def positions_around_location(loc: Location) -> Tuple[Location, Location, Location, Location, Location, Location]:
     """
     Returns the position around a location in a clockwise order
@@ -19,10 +22,10 @@ def positions_around_location(loc: Location) -> Tuple[Location, Location, Locati
     """
 
     q, r = loc
-    return ((q - 1, r - 1), (q + 1, r - 1), (q + 2, r), (q + 1, r + 1), (q - 1, r + 1), (q - 2, r))
+    return tuple((q + dq, r + dr) for dq, dr in DIRECTIONS)
 
 
-@lru_cache(maxsize=None)
+@position_cached
 def pieces_around_location(grid: Grid, loc: Location) -> Tuple[Location, ...]:
     """Return all positions around a location that contain pieces"""
     # Pre-compute the positions once
@@ -32,7 +35,7 @@ def pieces_around_location(grid: Grid, loc: Location) -> Tuple[Location, ...]:
     # This is faster than a generator expression when we need all results
     return tuple(pos for pos in positions if pos in grid)
 
-@lru_cache(maxsize=None)
+@position_cached
 def is_position_connected(grid: Grid, loc: Location, positions_to_ignore: Tuple[Location] = None) -> bool:
     """Check if a position is connected to at least one piece in the grid"""
     piece_locations = pieces_around_location(grid, loc)
@@ -53,16 +56,14 @@ def is_position_connected(grid: Grid, loc: Location, positions_to_ignore: Tuple[
 
 def get_empty_locations(grid: Grid):
     """Return all empty locations 1 move away from any piece"""
-    empty = []
-    for loc in grid.keys():
-        for a_loc in positions_around_location(loc):
-            if not grid.get(a_loc):
-                empty.append(a_loc)
-    empty = list(set(empty))
-    return empty
+    occupied = packed_occupied(grid)
+    empty = {p + d for p in occupied for d in NEIGHBOUR_OFFSETS}
+    empty.difference_update(occupied)
+    return unpack_locations(empty)
 
 
-@lru_cache(maxsize=None)  # Increased cache size for better performance
+@profiled
+@position_cached
 def one_move_away(grid: Grid, loc: Location, positions_to_ignore: Tuple[Location] = None) -> List[Location]:
     """Return all connected empty locations 1 move away from location
     But must be able to slide to that location without breaking connection
@@ -94,7 +95,7 @@ def one_move_away(grid: Grid, loc: Location, positions_to_ignore: Tuple[Location
         connected_spaces.append(space)
     return connected_spaces
 
-@lru_cache(maxsize=None)  # Increased cache size for better performance
+@position_cached
 def beetle_one_move_away(grid: Grid, loc: Location, positions_to_ignore: Tuple[Location] = None) -> List[Location]:
     """Return all connected locations 1 move away from location for a beetle
     Beetles can move on top of other pieces, so we check differently than other pieces
@@ -116,7 +117,7 @@ def beetle_one_move_away(grid: Grid, loc: Location, positions_to_ignore: Tuple[L
     return connected_spaces
 
 
-@lru_cache(maxsize=None)  # Cache the results for better performance
+@position_cached
 def check_can_slide_to(grid: Grid, loc: Location, to_loc: Location, positions_to_ignore: Tuple[Location] = None) -> bool:
     """Check if a piece can slide to a location"""
     #  eg (5,3) -> (6,2) is not possible because of pieces at (4,2) and (7, 3)
@@ -187,19 +188,68 @@ def get_placeable_locations(grid: Grid, colour: Colour) -> List[Location]:
             allowed.append(pos)
     return allowed
 
+@profiled
 def can_remove_piece(grid: Grid, loc: Location) -> bool:
     """ does removing piece break the hive? """
     if len(grid) <= 2:
         return True  # if less than 2 pieces in the hive, can always remove a piece
 
-    # are all the positions around the current location still connected if the piece is removed?
-    piece_locations_current = pieces_around_location(grid, loc)
-    for piece_loc in piece_locations_current:
-        # would removing this piece disconnect the hive?
-        if is_piece_connected_to_hive(grid, piece_loc, ignore_positions=[loc]) == False:
-            return False
-    return True
+    return loc not in get_pinned_locations(grid)
+
+@profiled
+@position_cached
+def get_pinned_locations(grid: Grid) -> FrozenSet[Location]:
+    """Return all locations which can't be emptied without breaking the hive.
+
+    These are the articulation points of the graph of occupied locations, found with a single
+    depth first search (Tarjan), so computed once per position rather than once per piece.
+    """
+    if len(grid) <= 2:
+        return frozenset()
+
+    # work on packed locations - this is one of the hottest loops in move generation
+    occupied = packed_occupied(grid)
+
+    def neighbours(p):
+        return iter([p + d for d in NEIGHBOUR_OFFSETS if p + d in occupied])
+
+    root = next(iter(occupied))
+    discovery = {root: 0}  # order in which each location was reached
+    low = {root: 0}  # earliest discovered location reachable from the subtree below each location
+    pinned = set()
+    root_children = 0
+
+    to_visit = [(root, None, neighbours(root))]
+    while to_visit:
+        current, parent, current_neighbours = to_visit[-1]
+        for neighbour in current_neighbours:
+            if neighbour not in discovery:
+                discovery[neighbour] = low[neighbour] = len(discovery)
+                to_visit.append((neighbour, current, neighbours(neighbour)))
+                break
+            if neighbour != parent:
+                low[current] = min(low[current], discovery[neighbour])
+        else:
+            # finished with this location - pass its low value back up to its parent
+            to_visit.pop()
+            if parent is None:
+                continue
+            low[parent] = min(low[parent], low[current])
+            if parent == root:
+                root_children += 1
+            elif low[current] >= discovery[parent]:
+                pinned.add(parent)  # nothing below current reaches above parent
+
+    if root_children > 1:
+        pinned.add(root)
+
+    # hive already in pieces - only a piece with no neighbours can be removed without leaving it split
+    if len(discovery) < len(occupied):
+        return frozenset(loc for loc in grid if pieces_around_location(grid, loc))
+
+    return frozenset(unpack_locations(pinned))
 
+@profiled
 def all_connected(grid: Grid, loc: Location, ignore_positions: List[Location] = None):
     """Get all the pieces connected to a piece (should be entire hive)"""
     if ignore_positions is None:
@@ -0,0 +1,201 @@
+"""
+How a Game remembers the positions before it.
+
+By default every Game keeps a reference to the Game before it (game.parent), so a finished game
+holds every intermediate state - grid, frontier, piece index and all.  That's simple, but memory
+grows with plies x games when many replayed games are held at once.  game.history picks one of
+three modes, and place_piece / move_piece / pass_move carry it on to the next state:
+
+    - None (default): the full parent chain
+    - GameHistory: checkpointed - the list of moves played plus a snapshot every `interval` plies.
+      Any earlier position is rebuilt on demand by replaying from the nearest snapshot.
+    - NO_HISTORY: nothing kept, eg for search nodes
+
+    game = with_checkpointed_history(initial_game(), interval=16)
+    ...
+    previous_game(game)        # the position before the last move, in any mode
+    game_at_ply(game, 10)      # random access
+    for earlier in iter_history(game): ...   # newest first, back to the start
+
+Code that walks back through a game should use these rather than game.parent.
+"""
+from typing import Iterator, List, NamedTuple, Optional
+
+from pyrsistent import PMap, PVector, pmap, pvector
+
+from hive.game_engine.game_state import Colour, Game, Location, Piece
+
+DEFAULT_CHECKPOINT_INTERVAL = 16
+
+
+class _NoHistory:
+    """The type of NO_HISTORY - a singleton, also once pickled and loaded, so it can be compared with `is`"""
+
+    def __repr__(self):
+        return 'NO_HISTORY'
+
+    def __reduce__(self):
+        return 'NO_HISTORY'  # pickled by reference to the module attribute
+
+
+NO_HISTORY = _NoHistory()
+
+PLACE = 'PLACE'
+MOVE = 'MOVE'
+PASS = 'PASS'
+
+
+class PlayedMove(NamedTuple):
+    """Enough to play a move again exactly as it was played"""
+    kind: str  # PLACE, MOVE or PASS
+    piece: Optional[Piece] = None  # placed piece
+    current_location: Optional[Location] = None
+    new_location: Optional[Location] = None
+    colour: Optional[Colour] = None  # colour moving or passing
+    move: object = None  # the move recorded on the resulting Game
+
+
+class GameHistory(NamedTuple):
+    moves: PVector  # PlayedMove for each ply - moves[i] leads from ply i to ply i+1
+    checkpoints: PMap  # ply to snapshot Game (without history)
+    interval: int
+
+    def extended(self, played: PlayedMove, new_game: Game) -> 'GameHistory':
+        """The history of new_game, the result of playing `played` on the last position of this history"""
+        moves = self.moves.append(played)
+        checkpoints = self.checkpoints
+        if len(moves) % self.interval == 0:
+            checkpoints = checkpoints.set(len(moves), _snapshot(new_game))
+        return GameHistory(moves, checkpoints, self.interval)
+
+    def truncated(self, ply: int) -> 'GameHistory':
+        """The history as it was at an earlier ply"""
+        checkpoints = pmap({k: snapshot for k, snapshot in self.checkpoints.items() if k <= ply})
+        return GameHistory(pvector(self.moves[:ply]), checkpoints, self.interval)
+
+
+def _snapshot(game: Game) -> Game:
+    return game.set(parent=None, history=None)
+
+
+def link_history(new_game: Game, game: Game, played: PlayedMove) -> Game:
+    """Record game as the position before new_game, in whichever mode game uses"""
+    history = game.history
+    if history is None:
+        return new_game.set('parent', game)  # Store reference to previous game state
+    if history is NO_HISTORY:
+        return new_game.set(parent=None, history=NO_HISTORY)
+    return new_game.set(parent=None, history=history.extended(played, new_game))
+
+
+def with_checkpointed_history(game: Game, interval: int = DEFAULT_CHECKPOINT_INTERVAL) -> Game:
+    """Start a checkpointed history from this game - it becomes ply 0, and anything before it is dropped"""
+    if interval < 1:
+        raise ValueError(f"Checkpoint interval must be at least 1, not {interval}")
+    history = GameHistory(pvector(), pmap({0: _snapshot(game)}), interval)
+    return game.set(parent=None, history=history)
+
+
+def without_history(game: Game) -> Game:
+    """This game, keeping no record of earlier positions from here on"""
+    return game.set(parent=None, history=NO_HISTORY)
+
+
+def history_length(game: Game) -> int:
+    """Number of earlier positions that can be got back to"""
+    history = game.history
+    if history is None:
+        length = 0
+        while game.parent is not None:
+            length += 1
+            game = game.parent
+        return length
+    if history is NO_HISTORY:
+        return 0
+    return len(history.moves)
+
+
+def previous_game(game: Game) -> Optional[Game]:
+    """The position before the last move, or None if it isn't kept"""
+    history = game.history
+    if history is None:
+        return game.parent
+    if history is NO_HISTORY or len(history.moves) == 0:
+        return None
+    return game_at_ply(game, len(history.moves) - 1)
+
+
+def game_at_ply(game: Game, ply: int) -> Game:
+    """The position after `ply` moves from the start of the game's history"""
+    length = history_length(game)
+    if not 0 <= ply <= length:
+        raise IndexError(f"Ply {ply} out of range, history has {length} moves")
+    if ply == length:
+        return game
+
+    history = game.history
+    if history is None:
+        for _ in range(length - ply):
+            game = game.parent
+        return game
+
+    start = (ply // history.interval) * history.interval
+    return _replay(history, start, ply)[-1]
+
+
+def iter_history(game: Game) -> Iterator[Game]:
+    """The game, then each earlier position back to the start of its history"""
+    history = game.history
+    if history is None:
+        while game is not None:
+            yield game
+            game = game.parent
+        return
+
+    yield game
+    if history is NO_HISTORY:
+        return
+
+    # rebuild one checkpoint interval at a time, newest first, so only that many positions are held
+    end = len(history.moves) - 1
+    while end >= 0:
+        start = (end // history.interval) * history.interval
+        yield from reversed(_replay(history, start, end))
+        end = start - 1
+
+
+def replace_last_move(game: Game, move) -> Game:
+    """Set the move recorded on this game (eg to mark a pillbug move once it's known), keeping the history in step"""
+    from hive.game_engine.zobrist import set_last_move
+
+    game = set_last_move(game, move)
+    history = game.history
+    if history is None or history is NO_HISTORY or len(history.moves) == 0:
+        return game
+
+    ply = len(history.moves)
+    moves = history.moves.set(ply - 1, history.moves[ply - 1]._replace(move=move))
+    checkpoints = history.checkpoints
+    if ply in checkpoints:
+        checkpoints = checkpoints.set(ply, set_last_move(checkpoints[ply], move))
+    return game.set('history', GameHistory(moves, checkpoints, history.interval))
+
+
+def _replay(history: GameHistory, start: int, end: int) -> List[Game]:
+    """The positions at plies start..end, replayed from the checkpoint at start"""
+    game = history.checkpoints[start].set(history=NO_HISTORY)
+    games = [game]
+    for ply in range(start, end):
+        game = _play(game, history.moves[ply])
+        games.append(game)
+    return [g.set(history=history.truncated(ply)) for ply, g in zip(range(start, end + 1), games)]
+
+
+def _play(game: Game, played: PlayedMove) -> Game:
+    from hive.game_engine.game_functions import move_piece, pass_move, place_piece
+
+    if played.kind == PLACE:
+        return place_piece(game, played.piece, played.new_location, move=played.move)
+    if played.kind == MOVE:
+        return move_piece(game, played.current_location, played.new_location, played.colour, move=played.move)
+    return pass_move(game, played.colour, move=played.move)
@@ -0,0 +1,187 @@
+"""
+Moves packed into a single 64-bit int.
+
+Move is a dataclass holding a Piece and two location tuples, so hashing or comparing one
+(transposition tables, move ordering, move labels) builds tuples every time.  A move code
+holds the same information in one int, so hashing and equality are O(1), and lists of
+moves can be stored as array('Q') rather than lists of objects:
+
+    code = pack_move(move)
+    unpack_move(code) == move
+    codes = pack_moves(moves)      # array('Q')
+
+Bit layout, low to high:
+    0-21    new location        (q, r) - 11 bits each, offset by LOCATION_OFFSET
+    22-43   current location    (q, r) - 0 for placements and passes
+    44-46   new stack idx
+    47-49   current stack idx
+    50      placement
+    51      pass (NoMove)
+    52      colour making the move (differs from the piece's colour when a pillbug moves it)
+    53      pillbug moved other piece
+    54      piece colour
+    55-58   piece name (see zobrist.PIECE_NAME_INDEX)
+    59-63   piece number
+
+Codes compare exactly, unlike Move.__eq__ which matches placements on the piece name only.
+"""
+from array import array
+from typing import Iterable, List, Optional, Union
+
+from hive.game_engine.game_state import Location, Piece
+from hive.game_engine.moves import Move, NoMove
+from hive.game_engine.zobrist import COLOUR_INDEX, PIECE_NAME_INDEX
+
+MoveCode = int
+
+LOCATION_BITS = 11
+LOCATION_OFFSET = 1 << (LOCATION_BITS - 1)  # coordinates must lie within +-1024
+_COORD_MASK = (1 << LOCATION_BITS) - 1
+_LOCATION_MASK = (1 << (2 * LOCATION_BITS)) - 1
+_STACK_MASK = 0b111
+_NUMBER_MASK = 0b11111
+
+NEW_LOCATION_SHIFT = 0
+CURRENT_LOCATION_SHIFT = 22
+NEW_STACK_SHIFT = 44
+CURRENT_STACK_SHIFT = 47
+PLACEMENT_BIT = 1 << 50
+PASS_BIT = 1 << 51
+COLOUR_SHIFT = 52
+PILLBUG_BIT = 1 << 53
+PIECE_COLOUR_SHIFT = 54
+PIECE_NAME_SHIFT = 55
+PIECE_NUMBER_SHIFT = 59
+
+INDEX_TO_COLOUR = {index: colour for colour, index in COLOUR_INDEX.items()}
+INDEX_TO_PIECE_NAME = {index: name for name, index in PIECE_NAME_INDEX.items()}
+
+
+def _pack_location(loc: Location) -> int:
+    q, r = loc[0] + LOCATION_OFFSET, loc[1] + LOCATION_OFFSET
+    if not (0 <= q <= _COORD_MASK and 0 <= r <= _COORD_MASK):
+        raise ValueError(f"Location {loc} out of range for a move code")
+    return (r << LOCATION_BITS) | q
+
+
+def _unpack_location(bits: int) -> Location:
+    return ((bits & _COORD_MASK) - LOCATION_OFFSET, (bits >> LOCATION_BITS) - LOCATION_OFFSET)
+
+
+def _pack_stack_idx(idx: int) -> int:
+    if not 0 <= idx <= _STACK_MASK:
+        raise ValueError(f"Stack index {idx} out of range for a move code")
+    return idx
+
+
+def pack_move(move: Union[Move, NoMove]) -> MoveCode:
+    """The code for a move (lossless, see unpack_move)"""
+    code = COLOUR_INDEX[move.colour] << COLOUR_SHIFT
+    if move.pillbug_moved_other_piece:
+        code |= PILLBUG_BIT
+    if isinstance(move, NoMove):
+        return code | PASS_BIT
+
+    piece = move.piece
+    if not 0 <= piece.number <= _NUMBER_MASK:
+        raise ValueError(f"Piece number {piece.number} out of range for a move code")
+    code |= ((COLOUR_INDEX[piece.colour] << PIECE_COLOUR_SHIFT)
+             | (PIECE_NAME_INDEX[piece.name] << PIECE_NAME_SHIFT)
+             | (piece.number << PIECE_NUMBER_SHIFT)
+             | (_pack_location(move.new_location) << NEW_LOCATION_SHIFT)
+             | (_pack_stack_idx(move.new_stack_idx) << NEW_STACK_SHIFT))
+
+    if move.current_location is None:
+        return code | PLACEMENT_BIT
+    return (code
+            | (_pack_location(move.current_location) << CURRENT_LOCATION_SHIFT)
+            | (_pack_stack_idx(move.current_stack_idx) << CURRENT_STACK_SHIFT))
+
+
+def unpack_move(code: MoveCode) -> Union[Move, NoMove]:
+    """The Move (or NoMove) a code was packed from"""
+    colour = INDEX_TO_COLOUR[(code >> COLOUR_SHIFT) & 1]
+    pillbug = bool(code & PILLBUG_BIT)
+    if code & PASS_BIT:
+        return NoMove(colour=colour, pillbug_moved_other_piece=pillbug)
+
+    piece = code_piece(code)
+    new_location = _unpack_location((code >> NEW_LOCATION_SHIFT) & _LOCATION_MASK)
+    new_stack_idx = (code >> NEW_STACK_SHIFT) & _STACK_MASK
+
+    current_location, current_stack_idx = None, None
+    if not code & PLACEMENT_BIT:
+        current_location = _unpack_location((code >> CURRENT_LOCATION_SHIFT) & _LOCATION_MASK)
+        current_stack_idx = (code >> CURRENT_STACK_SHIFT) & _STACK_MASK
+
+    return Move(piece=piece,
+                current_location=current_location,
+                current_stack_idx=current_stack_idx,
+                new_location=new_location,
+                new_stack_idx=new_stack_idx,
+                colour=colour,
+                pillbug_moved_other_piece=pillbug)
+
+
+def code_piece(code: MoveCode) -> Optional[Piece]:
+    """The piece a code moves or places, without unpacking the rest.  None for a pass"""
+    if code & PASS_BIT:
+        return None
+    return Piece(colour=INDEX_TO_COLOUR[(code >> PIECE_COLOUR_SHIFT) & 1],
+                 name=INDEX_TO_PIECE_NAME[(code >> PIECE_NAME_SHIFT) & 0b1111],
+                 number=(code >> PIECE_NUMBER_SHIFT) & _NUMBER_MASK)
+
+
+def is_placement_code(code: MoveCode) -> bool:
+    return bool(code & PLACEMENT_BIT)
+
+
+def is_pass_code(code: MoveCode) -> bool:
+    return bool(code & PASS_BIT)
+
+
+def pack_moves(moves: Iterable[Union[Move, NoMove]]) -> array:
+    """A list of moves as a compact array of codes"""
+    return array('Q', [pack_move(move) for move in moves])
+
+
+def unpack_moves(codes: Iterable[MoveCode]) -> List[Union[Move, NoMove]]:
+    return [unpack_move(code) for code in codes]
+
+
+class PackedMove:
+    """A move held as its code - hashes and compares as an int"""
+    __slots__ = ('code',)
+
+    def __init__(self, code: MoveCode):
+        self.code = code
+
+    @classmethod
+    def from_move(cls, move: Union[Move, NoMove]) -> 'PackedMove':
+        return cls(pack_move(move))
+
+    def to_move(self) -> Union[Move, NoMove]:
+        return unpack_move(self.code)
+
+    @property
+    def piece(self) -> Optional[Piece]:
+        return code_piece(self.code)
+
+    @property
+    def is_placement(self) -> bool:
+        return is_placement_code(self.code)
+
+    @property
+    def is_pass(self) -> bool:
+        return is_pass_code(self.code)
+
+    def __eq__(self, other):
+        if not isinstance(other, PackedMove):
+            return False
+        return self.code == other.code
+
+    def __hash__(self):
+        return hash(self.code)
+
+    def __repr__(self):
+        return f"PackedMove({self.to_move()!r})"
@@ -1,9 +1,13 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from hive.game_engine.game_functions import move_piece, pass_move, place_piece
 from hive.game_engine.game_state import Colour, Game, Grid, Location, Piece
 from hive.game_engine.grid_functions import one_move_away, is_position_connected, beetle_one_move_away, can_remove_piece, pieces_around_location, positions_around_location
 from hive.game_engine import pieces
+from hive.game_engine.packed_locations import NEIGHBOUR_OFFSETS, pack_location, packed_occupied, unpack_location
+from hive.game_engine.history import previous_game
+from hive.game_engine.slide_graph import get_slide_reachable, get_slide_walk_ends
+from hive.profiling import profiled
 
 @dataclass
 class Move:
@@ -69,7 +73,10 @@ class Move:
 
 
     def __hash__(self):
-        return hash(str(self._move_string()))
+        # consistent with __eq__, so placements hash on the piece name only (see move_codes.py for exact codes)
+        if self.current_location is None:
+            return hash((self.piece.name, self.colour, self.new_location, self.new_stack_idx))
+        return hash((self.piece, self.current_location, self.new_location, self.new_stack_idx))
 
 
 @dataclass
@@ -88,19 +95,29 @@ class NoMove:
         return f"Pass ({self.colour})"
     
     def __hash__(self):
-        return hash(str(self))
+        return hash(('Pass', self.colour))
 
-def get_ant_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
-    """Get all possible moves for an ant piece
+def _moves_to(grid: Grid, loc: Location, stack_idx: int, destinations: List[Location]) -> List[Move]:
+    """Moves of the piece at loc to each destination - onto the top of the stack there, if any"""
+    if not destinations:
+        return []
+    piece = grid[loc][stack_idx]
+    return [Move(piece=piece,
+                 current_location=loc,
+                 current_stack_idx=stack_idx,
+                 new_location=new_loc,
+                 new_stack_idx=len(grid.get(new_loc, ())))
+            for new_loc in destinations]
+
+def get_ant_destinations(grid: Grid, loc: Location, stack_idx: int) -> List[Location]:
+    """Get all the locations an ant piece can move to
     
     Ants can move to any empty space connected to the hive.
-    We use a breadth-first search to find all possible moves.
+    Their moves are everything reachable over the slide graph of the position.
     """
     stack = grid.get(loc, ())
     if len(stack) == 0:
         raise ValueError("No pieces at the given location")
-    
-    piece = stack[stack_idx]
 
     # if theres a piece on top, cant move
     if len(stack) > 1:
@@ -110,54 +127,22 @@ def get_ant_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
     if not can_remove_piece(grid, loc):
         return []
 
-    visited = {loc}
-    to_visit = set()
-    
-    # Initial moves
-    initial_moves = one_move_away(grid, loc)
-    to_visit.update(initial_moves)
-    
-    # Breadth-first search to find all possible moves
-    while to_visit:
-        current = to_visit.pop()
-        if current in visited:
-            continue
-            
-        visited.add(current)
-        
-        # Get next possible moves
-        next_moves = one_move_away(grid, current, positions_to_ignore=(loc,))
-        for move in next_moves:
-            if move not in visited:
-                to_visit.add(move)
-    
-    # Remove the starting location
-    visited.remove(loc)
-    
-    visited = list(visited)
+    # reachability over the shared slide graph (see slide_graph.py)
+    return get_slide_reachable(grid, loc)
 
-    moves = []
-    for new_loc in visited:
-        mv = Move(piece=piece, 
-                  current_location=loc, 
-                  current_stack_idx=stack_idx, 
-                  new_location=new_loc,
-                  new_stack_idx=0)
-        moves.append(mv)
-    return moves
+def get_ant_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
+    return _moves_to(grid, loc, stack_idx, get_ant_destinations(grid, loc, stack_idx))
 
 
 
-def get_beetle_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
-    """Get all possible moves for a beetle piece
+def get_beetle_destinations(grid: Grid, loc: Location, stack_idx: int) -> List[Location]:
+    """Get all the locations a beetle piece can move to
     
     Beetles can move one space in any direction, including on top of other pieces.
     """
     stack = grid.get(loc, ())
     if len(stack) == 0:
         raise ValueError("No pieces at the given location")
-    
-    piece = stack[stack_idx]
 
     # if theres a piece on top, cant move
     # if stack of 3, and beetle is idx 1, then beetle is in the middle, but cant move
@@ -176,59 +161,42 @@ def get_beetle_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
     else:
         positions_to_ignore = (loc,)
     
-    locations = beetle_one_move_away(grid, loc, positions_to_ignore=positions_to_ignore)
+    return beetle_one_move_away(grid, loc, positions_to_ignore=positions_to_ignore)
 
-    moves = []
-    for new_loc in locations:
-        # get the stack height at each location - beetle can move to the top of a stack
-        stack_height = len(grid.get(new_loc, ()))
-        mv = Move(piece=piece,
-                  current_location=loc, 
-                  current_stack_idx=stack_idx, 
-                  new_location=new_loc,
-                  new_stack_idx=stack_height)
-        moves.append(mv)
-
-    return moves
+def get_beetle_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
+    return _moves_to(grid, loc, stack_idx, get_beetle_destinations(grid, loc, stack_idx))
 
-def get_grasshopper_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
+def get_grasshopper_destinations(grid: Grid, loc: Location, stack_idx: int) -> List[Location]:
     if can_remove_piece(grid, loc) == False:
         return []
     
     stack = grid.get(loc, ())
     if len(stack) == 0:
         raise ValueError("No pieces at the given location")
-    
-    piece = stack[stack_idx]
 
-    line_transformations = [(-1, -1), (+1, -1), (-2, 0), (+2, 0), (-1, +1), (+1, +1)]
+    # walk each line on packed locations - each step is an int addition
+    occupied = packed_occupied(grid)
+    start = pack_location(loc)
 
     jumps = set()
-    for transform in line_transformations:
-        pieces_jumped = 0
-        pos = (loc[0] + transform[0], loc[1] + transform[1])
-        while grid.get(pos) is not None:
-            pieces_jumped += 1
-            pos = (pos[0] + transform[0], pos[1] + transform[1])
-
-        if pieces_jumped == 0:
-            continue
-        elif is_position_connected(grid, pos, positions_to_ignore=(loc,)) == True:
+    for step in NEIGHBOUR_OFFSETS:
+        packed_pos = start + step
+        if packed_pos not in occupied:
+            continue  # nothing to jump over
+        while packed_pos in occupied:
+            packed_pos += step
+
+        pos = unpack_location(packed_pos)
+        if is_position_connected(grid, pos, positions_to_ignore=(loc,)) == True:
             jumps.add(pos)
 
-    moves = []
-    for jump in jumps:
-        mv = Move(piece=piece,
-                  current_location=loc, 
-                  current_stack_idx=stack_idx,
-                  new_location=jump,
-                  new_stack_idx=0)
-        moves.append(mv)
-    
-    return moves
+    return list(jumps)
 
-def get_queen_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
-    """Get all possible moves for a queen piece
+def get_grasshopper_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
+    return _moves_to(grid, loc, stack_idx, get_grasshopper_destinations(grid, loc, stack_idx))
+
+def get_queen_destinations(grid: Grid, loc: Location, stack_idx: int) -> List[Location]:
+    """Get all the locations a queen piece can move to
     
     Queens can move one space in any direction, but cannot climb on top of other pieces.
     """
@@ -239,23 +207,14 @@ def get_queen_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
     stack = grid.get(loc, ())
     if len(stack) == 0:
         raise ValueError("No pieces at the given location")
-    
-    piece = stack[stack_idx]
 
-    locs = one_move_away(grid, loc)
+    return one_move_away(grid, loc)
 
-    moves = []
-    for new_loc in locs:
-        mv = Move(piece=piece,
-                  current_location=loc, 
-                  current_stack_idx=stack_idx, 
-                  new_location=new_loc,
-                  new_stack_idx=0)
-        moves.append(mv)
-    return moves
+def get_queen_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
+    return _moves_to(grid, loc, stack_idx, get_queen_destinations(grid, loc, stack_idx))
 
-def get_spider_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
-    """Get all possible moves for a spider piece
+def get_spider_destinations(grid: Grid, loc: Location, stack_idx: int) -> List[Location]:
+    """Get all the locations a spider piece can move to (one per path, so may repeat)
     
     Spiders must move exactly 3 steps around the hive.
     """
@@ -266,44 +225,22 @@ def get_spider_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
     stack = grid.get(loc, ())
     if len(stack) == 0:
         raise ValueError("No pieces at the given location")
-    
-    piece = stack[stack_idx]
 
-    # Use a more efficient approach with a single function for all steps
-    def get_next_steps(current_paths, positions_to_ignore):
-        next_paths = []
-        for path in current_paths:
-            current_pos = path[-1]
-            # Get all possible next positions
-            next_positions = one_move_away(grid, current_pos, positions_to_ignore=positions_to_ignore)
-            # Only consider positions not already in the path
-            for next_pos in next_positions:
-                if next_pos not in path:
-                    next_paths.append(path + [next_pos])
-        return next_paths
+    # every path of exactly 3 steps over the shared slide graph (see slide_graph.py)
+    return get_slide_walk_ends(grid, loc, 3)
 
-    # Start with the initial position
-    paths = [[loc]]
-    
-    # Perform exactly 3 steps
-    paths = get_next_steps(paths, (loc,))
-    paths = get_next_steps(paths, (loc,))
-    paths = get_next_steps(paths, (loc,))
-
-    locs = [path[-1] for path in paths]
-
-    moves = []
-    for new_loc in locs:
-        mv = Move(piece=piece,
-                  current_location=loc, 
-                  current_stack_idx=stack_idx, 
-                  new_location=new_loc,
-                  new_stack_idx=0)
-        moves.append(mv)
-    return moves
+def get_spider_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
+    return _moves_to(grid, loc, stack_idx, get_spider_destinations(grid, loc, stack_idx))
 
 def get_mosquito_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
-    """Get all possible moves for a mosquito piece
+    """Get all possible moves for a mosquito piece (see get_mosquito_copied_types)"""
+    all_moves = []
+    for piece_type in get_mosquito_copied_types(grid, loc, stack_idx):
+        all_moves += move_functions[piece_type](grid, loc, stack_idx)
+    return all_moves
+
+def get_mosquito_copied_types(grid: Grid, loc: Location, stack_idx: int) -> List[str]:
+    """The piece types whose moves a mosquito piece can make
     
     The Mosquito mimics the movement ability of any piece it's touching.
     For example, if touching a Beetle, it can move like a Beetle.
@@ -323,8 +260,6 @@ def get_mosquito_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
     stack = grid.get(loc, ())
     if len(stack) == 0:
         raise ValueError("No pieces at the given location")
-    
-    piece = stack[stack_idx]
 
     # Get all adjacent pieces
     adjacent_positions = pieces_around_location(grid, loc)
@@ -350,7 +285,7 @@ def get_mosquito_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
 
     # If mosquito is on top of another piece, it can only move like a beetle
     if len(stack) > 1:
-        return get_beetle_moves(grid, loc, stack_idx)
+        return [pieces.BEETLE]
 
     # Collect all possible moves from adjacent pieces
 
@@ -378,12 +313,7 @@ def get_mosquito_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
         elif adj_piece.name == pieces.LADYBUG:
             adjacent_piece_types.add(pieces.LADYBUG)
 
-
-    all_moves = []
-    for piece_type in adjacent_piece_types:
-        all_moves += move_functions[piece_type](grid, loc, stack_idx)
-
-    return all_moves
+    return list(adjacent_piece_types)
 
 def check_can_slide_with_height(grid: Grid, from_loc: Location, to_loc: Location, height_threshold: int) -> bool:
     """
@@ -442,8 +372,6 @@ def get_pillbug_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
           This special ability cannot be used on a piece that was moved in the opponent's last turn.
           The pillbug can not move pieces through narrow gaps.
     """
-    moves = []
-
     stack = grid.get(loc, ())
     if len(stack) == 0:
         raise ValueError("No pieces at the given location")
@@ -453,11 +381,27 @@ def get_pillbug_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
         return []
 
     pillbug_piece = stack[stack_idx]
-    pillbug_height = len(stack)  # Height of the pillbug stack
 
     # Moves the pillbug can make - 1 move away like queen
     pillbug_moves = get_queen_moves(grid, loc, stack_idx)
 
+    moves = []
+    for adj_piece, pos, move_loc in get_pillbug_throws(grid, loc):
+        move = Move(piece=adj_piece,
+                    current_stack_idx=0,
+                    current_location=pos,
+                    new_stack_idx=0,
+                    new_location=move_loc,
+                    colour=pillbug_piece.colour,
+                    pillbug_moved_other_piece=True)
+        moves.append(move)
+
+    return pillbug_moves + moves
+
+def get_pillbug_throws(grid: Grid, loc: Location) -> List[Tuple[Piece, Location, Location]]:
+    """(piece, from, to) for each adjacent piece the pillbug at loc can move, and where to"""
+    pillbug_height = len(grid[loc])  # Height of the pillbug stack
+
     # Now moving adjacent pieces.
     # First lets get all the positions a piece on top of the pillbug, could move to
     # ..we can do this by pretending to be a beetle on top of the pillbug
@@ -484,7 +428,7 @@ def get_pillbug_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
     # Ok so now we have pieces we could move, and possible locations
     # (we know these are connected because only 1 move away)
 
-    moves = []
+    throws = []
     for adj_piece, pos in adjacent_pieces:
         for move_loc in locations:
             # Check if the piece can slide to the pillbug (first step)
@@ -498,20 +442,13 @@ def get_pillbug_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
                 continue
                 
             # If both checks pass, add the move
-            move = Move(piece=adj_piece,
-                        current_stack_idx=0,
-                        current_location=pos,
-                        new_stack_idx=0,
-                        new_location=move_loc,
-                        colour=pillbug_piece.colour,
-                        pillbug_moved_other_piece=True)
-            moves.append(move)
+            throws.append((adj_piece, pos, move_loc))
 
-    return pillbug_moves + moves
+    return throws
 
 
-def get_ladybug_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
-    """Get all possible moves for a ladybug piece
+def get_ladybug_destinations(grid: Grid, loc: Location, stack_idx: int) -> List[Location]:
+    """Get all the locations a ladybug piece can move to
     
     The Ladybug moves exactly three spaces:
         two on top of the hive followed by one down to the ground level.
@@ -531,8 +468,6 @@ def get_ladybug_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
     if len(stack) == 0:
         raise ValueError("No pieces at the given location")
     
-    piece = stack[stack_idx]
-    
     # First steps - get all the positions containing a piece around the ladybug
     first_steps = set()
     for pos in pieces_around_location(grid, loc):
@@ -571,16 +506,10 @@ def get_ladybug_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
         if is_position_connected(grid, pos, positions_to_ignore=(loc,)):
             final_positions.add(pos)
 
-    moves = []
-    for new_loc in final_positions:
-        mv = Move(piece=piece,
-                  current_location=loc, 
-                  current_stack_idx=stack_idx, 
-                  new_location=new_loc,
-                  new_stack_idx=0)
-        moves.append(mv)
+    return list(final_positions)
 
-    return moves
+def get_ladybug_moves(grid: Grid, loc: Location, stack_idx: int) -> List[Move]:
+    return _moves_to(grid, loc, stack_idx, get_ladybug_destinations(grid, loc, stack_idx))
 
 move_functions = {pieces.ANT: get_ant_moves,
                   pieces.BEETLE: get_beetle_moves,
@@ -591,6 +520,7 @@ move_functions = {pieces.ANT: get_ant_moves,
                   pieces.PILLBUG: get_pillbug_moves,
                   pieces.LADYBUG: get_ladybug_moves,
                   }
+@profiled
 def get_possible_moves(grid: Grid, location: Location, stack_idx: int) -> List[Move]:
     stack = grid.get(location)
     if not stack:
@@ -599,6 +529,41 @@ def get_possible_moves(grid: Grid, location: Location, stack_idx: int) -> List[M
     piece = stack[-1]
     return move_functions[piece.name](grid, location, stack_idx)
 
+destination_functions = {pieces.ANT: get_ant_destinations,
+                         pieces.BEETLE: get_beetle_destinations,
+                         pieces.GRASSHOPPER: get_grasshopper_destinations,
+                         pieces.QUEEN: get_queen_destinations,
+                         pieces.SPIDER: get_spider_destinations,
+                         pieces.LADYBUG: get_ladybug_destinations,
+                         }
+
+def count_possible_moves(grid: Grid, location: Location, stack_idx: int) -> int:
+    """len(get_possible_moves(...)), from the same destinations but without building any Moves"""
+    stack = grid.get(location)
+    if not stack:
+        return 0
+
+    piece = stack[-1]
+    return _count_moves(piece.name, grid, location, stack_idx)
+
+def has_possible_moves(grid: Grid, location: Location, stack_idx: int) -> bool:
+    return count_possible_moves(grid, location, stack_idx) > 0
+
+def _count_moves(piece_name: str, grid: Grid, loc: Location, stack_idx: int) -> int:
+    if piece_name == pieces.MOSQUITO:
+        return sum(_count_moves(piece_type, grid, loc, stack_idx)
+                   for piece_type in get_mosquito_copied_types(grid, loc, stack_idx))
+
+    if piece_name == pieces.PILLBUG:
+        stack = grid.get(loc, ())
+        if len(stack) == 0:
+            raise ValueError("No pieces at the given location")
+        if len(stack) > 1:
+            return 0
+        return len(get_queen_destinations(grid, loc, stack_idx)) + len(get_pillbug_throws(grid, loc))
+
+    return len(destination_functions[piece_name](grid, loc, stack_idx))
+
 
 def is_pillbug_move(game, move):
     """
@@ -653,10 +618,11 @@ def is_pillbug_move(game, move):
     # Step 2: Check if this move could have been made WITHOUT the pillbug
     
     # Case 1: Different color - definitely a pillbug move
-    if game.parent is None:
+    parent_game = previous_game(game)
+    if parent_game is None:
         return False
         
-    current_player_color = game.parent.current_turn  # Color of player who just moved
+    current_player_color = parent_game.current_turn  # Color of player who just moved
     if move.piece.colour != current_player_color:
         return True
     
@@ -664,7 +630,6 @@ def is_pillbug_move(game, move):
     # Get all possible moves for this piece
     
     # We need to check the game state BEFORE the move was made
-    parent_game = game.parent
     possible_moves = get_possible_moves(parent_game.grid, start_loc, move.current_stack_idx)
     
     # Check if the actual move is in the list of possible moves
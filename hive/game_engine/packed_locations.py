@@ -0,0 +1,56 @@
+"""
+Locations packed into a single int.
+
+A Location is a (q, r) tuple in doubled coordinates.  In the innermost loops of the engine
+(connectivity, empty neighbours, sliding around the hive) building and hashing those tuples is
+a large part of the cost, so these loops can work on packed ints instead:
+
+    p = pack_location((q, r))       # (r + OFFSET) * STRIDE + (q + OFFSET)
+    neighbours = [p + d for d in NEIGHBOUR_OFFSETS]
+    unpack_location(p) == (q, r)
+
+Adding one of NEIGHBOUR_OFFSETS moves one hex in that direction, so neighbours are plain int
+additions, and ints hash for free.  Coordinates must lie within +-OFFSET (far beyond any
+real game).  Tuples remain the public form - convert at the edges.
+"""
+from typing import FrozenSet, Iterable, List, Tuple
+
+from hive.game_engine.game_state import Grid, Location
+from hive.game_engine.position_cache import position_cached
+
+OFFSET = 1 << 15
+STRIDE = 1 << 16
+
+PackedLocation = int
+
+# (dq, dr) for each neighbour, in the same clockwise order as positions_around_location
+DIRECTIONS: Tuple[Tuple[int, int], ...] = ((-1, -1), (1, -1), (2, 0), (1, 1), (-1, 1), (-2, 0))
+NEIGHBOUR_OFFSETS: Tuple[int, ...] = tuple(dr * STRIDE + dq for dq, dr in DIRECTIONS)
+
+
+def pack_location(loc: Location) -> PackedLocation:
+    return (loc[1] + OFFSET) * STRIDE + loc[0] + OFFSET
+
+
+def unpack_location(p: PackedLocation) -> Location:
+    r, q = divmod(p, STRIDE)
+    return (q - OFFSET, r - OFFSET)
+
+
+def pack_locations(locs: Iterable[Location]) -> List[PackedLocation]:
+    return [(r + OFFSET) * STRIDE + q + OFFSET for q, r in locs]
+
+
+def unpack_locations(ps: Iterable[PackedLocation]) -> List[Location]:
+    return [unpack_location(p) for p in ps]
+
+
+def packed_neighbours(p: PackedLocation) -> Tuple[PackedLocation, ...]:
+    """The six locations around p, clockwise"""
+    return tuple(p + d for d in NEIGHBOUR_OFFSETS)
+
+
+@position_cached
+def packed_occupied(grid: Grid) -> FrozenSet[PackedLocation]:
+    """All occupied locations of a grid, packed"""
+    return frozenset(pack_locations(grid.keys()))
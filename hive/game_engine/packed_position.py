@@ -0,0 +1,79 @@
+"""
+A position packed into a few arrays of ints, for sending to another process.
+
+Pickling a Game pickles everything it references - its parent, and so every earlier position
+in the game - plus the frontier and piece index, which can be rebuilt from the grid.  A
+PackedPosition holds just what the rules need, as move codes (see move_codes.py):
+
+    - each piece on the grid as the code of placing it where it is (location and stack idx)
+    - each unplayed piece as the code of placing it at the origin
+    - the side to move, turn counts, last move and piece moved last turn (for the pillbug rules)
+
+    packed = pack_position(game)      # a few hundred bytes pickled
+    game = unpack_position(packed)    # an equivalent Game, with no parent
+"""
+from array import array
+from typing import NamedTuple, Optional, Tuple
+
+from hive.game_engine.board import Board
+from hive.game_engine.game_state import BLACK, WHITE, Colour, Game, MutableGrid, Piece
+from hive.game_engine.move_codes import MoveCode, code_piece, pack_move, unpack_move
+from hive.game_engine.moves import Move
+from hive.game_engine.pieces import QUEEN
+from hive.game_engine.zobrist import hash_grid
+
+_ORIGIN = (0, 0)
+
+
+class PackedPosition(NamedTuple):
+    pieces: array  # array('Q') of placement codes, bottom of each stack first
+    unplayed: array  # array('Q') of placement codes at the origin, in order, white's then black's
+    n_unplayed_white: int
+    current_turn: Colour
+    player_turns: Tuple[Tuple[Colour, int], ...]
+    move: Optional[MoveCode]  # the move which led to the position
+    piece_moved_last_turn: Optional[MoveCode]
+
+
+def _piece_code(piece: Piece, location=_ORIGIN, stack_idx: int = 0) -> MoveCode:
+    return pack_move(Move(piece, None, None, location, stack_idx, colour=piece.colour))
+
+
+def pack_position(game: Game) -> PackedPosition:
+    on_grid = sorted(((stack_idx, location, piece) for location, stack in game.grid.items()
+                      for stack_idx, piece in enumerate(stack)), key=lambda item: item[0])
+    unplayed_white = game.unplayed_pieces.get(WHITE, ())
+    unplayed = list(unplayed_white) + list(game.unplayed_pieces.get(BLACK, ()))
+    return PackedPosition(
+        pieces=array('Q', [_piece_code(piece, location, stack_idx) for stack_idx, location, piece in on_grid]),
+        unplayed=array('Q', [_piece_code(piece) for piece in unplayed]),
+        n_unplayed_white=len(unplayed_white),
+        current_turn=game.current_turn,
+        player_turns=tuple(sorted(game.player_turns.items())),
+        move=pack_move(game.move) if game.move is not None else None,
+        piece_moved_last_turn=(_piece_code(game.piece_moved_last_turn)
+                               if game.piece_moved_last_turn is not None else None))
+
+
+def unpack_position(packed: PackedPosition) -> Game:
+    grid = MutableGrid()
+    queens = {}
+    for code in packed.pieces:
+        move = unpack_move(code)
+        grid[move.new_location] = grid.get(move.new_location, ()) + (move.piece,)
+        if move.piece.name == QUEEN:
+            queens[move.piece.colour] = move.new_location
+    grid.zobrist = hash_grid(grid)
+
+    unplayed = [code_piece(code) for code in packed.unplayed]
+
+    board = Board(grid=grid,
+                  current_turn=packed.current_turn,
+                  player_turns=dict(packed.player_turns),
+                  queens=queens,
+                  unplayed_pieces={WHITE: unplayed[:packed.n_unplayed_white],
+                                   BLACK: unplayed[packed.n_unplayed_white:]},
+                  piece_moved_last_turn=(code_piece(packed.piece_moved_last_turn)
+                                         if packed.piece_moved_last_turn is not None else None),
+                  move=unpack_move(packed.move) if packed.move is not None else None)
+    return board.to_game()
@@ -1,13 +1,13 @@
-from typing import List
+from typing import Dict, List
 
 from hive.game_engine.game_state import Game, Colour
 
 from hive.game_engine.errors import NoQueenError
 from hive.game_engine.game_functions import check_queen_timely_placement
-from hive.game_engine.game_state import Colour, Game
-from hive.game_engine.grid_functions import get_placeable_locations
-from hive.game_engine.moves import Move, NoMove, get_possible_moves
-from hive.game_engine.pieces import QUEEN, PILLBUG
+from hive.game_engine.game_state import BLACK, WHITE, Colour, Game, Location
+from hive.game_engine.frontier import placeable_locations
+from hive.game_engine.moves import Move, NoMove, count_possible_moves, get_possible_moves
+from hive.game_engine.pieces import MOSQUITO, QUEEN, PILLBUG
 
 
 def get_players_possible_moves_or_placements(colour: Colour, game: Game) -> List[Move]:
@@ -41,6 +41,31 @@ def get_players_moves(colour: Colour, game: Game) -> List[Move]:
 
     return possible_moves
 
+def count_players_moves(colour: Colour, game: Game) -> Dict[Location, int]:
+    """Number of moves (not placements) for each of the player's pieces, by location.
+    The same counts as get_players_moves, without building Moves unless the pillbug rules need them."""
+    counts = {}
+    for loc, stack in game.grid.items():
+        if not stack or stack[-1].colour != colour:
+            continue
+        piece = stack[-1]
+        if _pillbug_rules_apply(game, piece):
+            piece_possible_moves = get_possible_moves(game.grid, loc, len(stack)-1)
+            counts[loc] = len(_filter_pillbug_moves(game, piece_possible_moves, piece))
+        else:
+            counts[loc] = count_possible_moves(game.grid, loc, len(stack)-1)
+    return counts
+
+def get_mobility(game: Game) -> Dict[Colour, int]:
+    """Total number of moves (not placements) for each colour"""
+    return {colour: sum(count_players_moves(colour, game).values()) for colour in (WHITE, BLACK)}
+
+def _pillbug_rules_apply(game: Game, piece) -> bool:
+    """Could _filter_pillbug_moves remove any of this piece's moves"""
+    if game.piece_moved_last_turn is None:
+        return False
+    return piece.name in (PILLBUG, MOSQUITO) or piece == game.piece_moved_last_turn
+
 def _must_play_queen(colour: Colour, game: Game) -> bool:
     try:
         check_queen_timely_placement(game, colour, moves_to_queen=3)
@@ -53,10 +78,10 @@ def _play_queen_placements(colour: Colour, game: Game) -> List[Move]:
 
     unplayed_pieces = game.unplayed_pieces[colour]
     queen = [piece for piece in unplayed_pieces if piece.name == QUEEN][0]
-    placeable_locations = get_placeable_locations(game.grid, colour)
+    locations = placeable_locations(game, colour)
 
     possible_moves = []
-    for location in placeable_locations:
+    for location in locations:
         possible_moves.append(Move(piece=queen,
                                    current_location=None,
                                    current_stack_idx=None,
@@ -83,9 +108,9 @@ def _all_placements(colour: Colour, game: Game, one_per_type=True) -> List[Move]
         unplayed = game.unplayed_pieces[colour]
 
     possible_moves = []
-    placeable_locations = get_placeable_locations(game.grid, colour)
+    locations = placeable_locations(game, colour)
     for piece in unplayed:
-        for location in placeable_locations:
+        for location in locations:
             possible_moves.append(Move(piece=piece,
                                        current_location=None,
                                        current_stack_idx=None,
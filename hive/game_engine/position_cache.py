@@ -0,0 +1,137 @@
+"""
+A bounded cache for grid functions, keyed by position.
+
+The grid functions (pieces_around_location, one_move_away, ...) are called many times
+with the same grid while generating moves, so caching them pays off.  Using
+lru_cache(maxsize=None) keyed on the grid itself grows without limit, keeps every
+grid alive, and has to hash the whole PMap to look anything up.
+
+Instead results are grouped per position, using the Zobrist hash of the grid as the
+key (O(1) for any grid built by the engine, see zobrist.py).  Only the most recently
+used max_positions positions are kept.
+
+    @position_cached
+    def pieces_around_location(grid: Grid, loc: Location): ...
+
+Configuration (per process):
+    - HIVE_POSITION_CACHE=0 turns the cache off
+    - HIVE_POSITION_CACHE_SIZE sets the number of positions kept (default 4096)
+    - configure_position_cache(max_positions=..., enabled=...) does the same at runtime
+    - clear_position_cache() drops everything, eg between games
+"""
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, Dict, Optional
+
+from hive import profiling
+from hive.game_engine.game_state import Grid
+from hive.game_engine.zobrist import grid_hash
+
+DEFAULT_MAX_POSITIONS = 4096
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # positions dropped to stay within max_positions
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class PositionCache:
+    """LRU cache of function results, grouped by position"""
+
+    def __init__(self, max_positions: int = DEFAULT_MAX_POSITIONS, enabled: bool = True):
+        self.max_positions = max_positions
+        self.enabled = enabled
+        self.stats = CacheStats()
+        self._positions: OrderedDict[int, Dict[tuple, object]] = OrderedDict()  # grid hash -> {call key: result}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def results_for(self, grid: Grid) -> Optional[Dict[tuple, object]]:
+        """The results stored for this grid, marking it as most recently used.
+        Returns None for grids that can't be hashed (eg hand built test grids which don't hold stacks of Pieces)"""
+        try:
+            key = grid_hash(grid)
+        except (AttributeError, TypeError, KeyError):
+            return None
+        results = self._positions.get(key)
+        if results is None:
+            results = {}
+            self._positions[key] = results
+            self._evict()
+        else:
+            self._positions.move_to_end(key)
+        return results
+
+    def resize(self, max_positions: int):
+        self.max_positions = max_positions
+        self._evict()
+
+    def _evict(self):
+        """Drop the least recently used positions until within budget"""
+        while len(self._positions) > self.max_positions:
+            self._positions.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self):
+        """Drop all cached positions and reset the statistics"""
+        self._positions.clear()
+        self.stats = CacheStats()
+
+
+position_cache = PositionCache(max_positions=int(os.environ.get("HIVE_POSITION_CACHE_SIZE", DEFAULT_MAX_POSITIONS)),
+                               enabled=os.environ.get("HIVE_POSITION_CACHE", "1") != "0")
+
+
+def configure_position_cache(max_positions: Optional[int] = None, enabled: Optional[bool] = None):
+    """Change the size of the cache, or turn it on / off for this process"""
+    if enabled is not None:
+        position_cache.enabled = enabled
+        if not enabled:
+            position_cache.clear()
+    if max_positions is not None:
+        position_cache.resize(max_positions)
+
+
+def clear_position_cache():
+    position_cache.clear()
+
+
+def position_cache_stats() -> CacheStats:
+    return position_cache.stats
+
+
+def position_cached(func: Callable) -> Callable:
+    """Cache a function whose first argument is the grid, in the shared position cache"""
+
+    @wraps(func)
+    def wrapper(grid: Grid, *args, **kwargs):
+        if not position_cache.enabled:
+            return func(grid, *args, **kwargs)
+
+        results = position_cache.results_for(grid)
+        if results is None:
+            return func(grid, *args, **kwargs)
+        call_key = (func, args, tuple(kwargs.items())) if kwargs else (func, args)
+        try:
+            result = results[call_key]
+            position_cache.stats.hits += 1
+            if profiling.is_enabled():
+                profiling.record_cache_hit(func.__name__)
+            return result
+        except KeyError:
+            position_cache.stats.misses += 1
+            result = func(grid, *args, **kwargs)
+            results[call_key] = result
+            return result
+
+    return wrapper
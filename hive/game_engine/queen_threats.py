@@ -0,0 +1,200 @@
+"""
+Moves that win, or nearly win, by surrounding the opponent's queen.
+
+Finding a win by generating every move and playing each one costs a full move generation plus
+a Game per move.  But a move can only fill one location, so a win needs the opponent's queen
+to have exactly one empty neighbour, and a threat (leaving it one from surrounded) needs two.
+So this starts from those empty neighbours and only asks which of the player's pieces could
+reach them (placements can't - a new piece may not touch the opponent's queen):
+
+    threats = find_queen_threats(game, colour)
+    threats.wins       # moves after which colour has won
+    threats.threats    # moves filling a neighbour of the queen, leaving one empty
+
+Pieces are only asked for their destinations if they could get that far (a queen or beetle
+must be next to the location, a grasshopper in line with it, and so on), and each candidate is
+checked on the grid directly rather than by playing it.  The one other way to win - a pillbug
+throwing the opponent's queen into an enclosed hole - is checked for pillbugs next to the queen.
+
+The moves are the same Moves as get_players_possible_moves_or_placements gives, with the pillbug
+rules applied.
+"""
+from typing import Iterable, List, NamedTuple, Optional, Set
+
+from hive.game_engine import pieces
+from hive.game_engine.game_functions import opposite_colour
+from hive.game_engine.game_state import Colour, Game, Grid, Location, Piece
+from hive.game_engine.grid_functions import positions_around_location
+from hive.game_engine.moves import Move, _moves_to, destination_functions, get_mosquito_copied_types, get_pillbug_throws
+from hive.game_engine.player_functions import _filter_pillbug_moves, _must_play_queen
+from hive.profiling import profiled
+
+# how far each piece type can move, in hexes (None = anywhere)
+REACH = {pieces.QUEEN: 1,
+         pieces.BEETLE: 1,
+         pieces.PILLBUG: 1,
+         pieces.SPIDER: 3,
+         pieces.LADYBUG: 3,
+         pieces.GRASSHOPPER: None,
+         pieces.ANT: None}
+
+
+class QueenThreats(NamedTuple):
+    wins: List[Move]
+    threats: List[Move]
+
+
+def hex_distance(a: Location, b: Location) -> int:
+    """Number of steps between two locations (doubled coordinates)"""
+    dq, dr = abs(a[0] - b[0]), abs(a[1] - b[1])
+    return dr + max(0, (dq - dr) // 2)
+
+
+def _in_line(a: Location, b: Location) -> bool:
+    """Could a grasshopper at a land on b - a straight line, jumping at least one location"""
+    dq, dr = abs(a[0] - b[0]), abs(a[1] - b[1])
+    if dr == 0:
+        return dq >= 4 and dq % 2 == 0
+    return dq == dr and dr >= 2
+
+
+def _could_reach(piece_type: str, loc: Location, targets: Iterable[Location]) -> bool:
+    if piece_type == pieces.GRASSHOPPER:
+        return any(_in_line(loc, target) for target in targets)
+    reach = REACH[piece_type]
+    if reach is None:
+        return True
+    return any(hex_distance(loc, target) <= reach for target in targets)
+
+
+def empty_queen_neighbours(grid: Grid, queen_loc: Location) -> List[Location]:
+    return [loc for loc in positions_around_location(queen_loc) if not grid.get(loc)]
+
+
+@profiled
+def find_queen_threats(game: Game, colour: Colour) -> QueenThreats:
+    """Moves for colour that surround the opponent's queen (wins), or leave it one from surrounded (threats)"""
+    queen_loc = game.queens.get(opposite_colour(colour))
+    if queen_loc is None:
+        return QueenThreats([], [])
+
+    grid = game.grid
+    targets = empty_queen_neighbours(grid, queen_loc)
+    if len(targets) == 0:
+        return QueenThreats([], [])  # already surrounded - the game is over
+
+    if _must_play_queen(colour, game) or game.queens.get(colour) is None:
+        return QueenThreats([], [])  # can only place, and a placement can't touch the opponent's queen
+
+    wins, threats = [], []
+    for move in _moves_to_targets(game, colour, queen_loc, targets):
+        opponent_empty, own_empty = _empty_around_queens(grid, move, colour, queen_loc, game.queens.get(colour))
+        if opponent_empty == 0 and own_empty != 0:  # both queens surrounded is a draw
+            wins.append(move)
+        elif opponent_empty == 1 and len(targets) > 1:
+            threats.append(move)
+    return QueenThreats(wins, threats)
+
+
+def find_winning_moves(game: Game, colour: Colour) -> List[Move]:
+    return find_queen_threats(game, colour).wins
+
+
+def _moves_to_targets(game: Game, colour: Colour, queen_loc: Location, targets: List[Location]) -> List[Move]:
+    """Moves of colour's pieces onto the targets, plus pillbug throws of the opponent's queen"""
+    grid = game.grid
+    can_fill = len(targets) <= 2
+    target_set = set(targets)
+
+    moves = []
+    for loc, stack in grid.items():
+        piece = stack[-1]
+        if piece.colour != colour:
+            continue
+        stack_idx = len(stack) - 1
+
+        piece_types = [piece.name]
+        if piece.name == pieces.MOSQUITO:
+            piece_types = get_mosquito_copied_types(grid, loc, stack_idx)
+
+        piece_moves = []
+        for piece_type in piece_types:
+            if piece_type == pieces.PILLBUG:
+                piece_moves += _pillbug_moves_to(grid, loc, stack_idx, queen_loc, target_set, can_fill)
+            elif can_fill and _could_reach(piece_type, loc, targets):
+                destinations = destination_functions[piece_type](grid, loc, stack_idx)
+                piece_moves += _moves_to(grid, loc, stack_idx, _unique(d for d in destinations if d in target_set))
+
+        if piece_moves:
+            moves += _filter_pillbug_moves(game, piece_moves, piece)
+    return moves
+
+
+def _pillbug_moves_to(grid: Grid, loc: Location, stack_idx: int, queen_loc: Location,
+                      target_set: Set[Location], can_fill: bool) -> List[Move]:
+    """A pillbug's own moves onto the targets, and the throws landing on them or moving the opponent's queen"""
+    if len(grid[loc]) > 1:
+        return []  # covered, so can't move or throw
+
+    moves = []
+    if can_fill and _could_reach(pieces.PILLBUG, loc, target_set):
+        destinations = destination_functions[pieces.QUEEN](grid, loc, stack_idx)
+        moves += _moves_to(grid, loc, stack_idx, [d for d in destinations if d in target_set])
+
+    if hex_distance(loc, queen_loc) > 2:
+        return moves  # can't reach the targets or the queen
+
+    thrower = grid[loc][stack_idx]
+    for piece, from_loc, to_loc in get_pillbug_throws(grid, loc):
+        if (can_fill and to_loc in target_set) or from_loc == queen_loc:
+            moves.append(Move(piece=piece,
+                              current_stack_idx=0,
+                              current_location=from_loc,
+                              new_stack_idx=0,
+                              new_location=to_loc,
+                              colour=thrower.colour,
+                              pillbug_moved_other_piece=True))
+    return moves
+
+
+def _empty_around_queens(grid: Grid, move: Move, colour: Colour, opponent_queen: Location,
+                         own_queen: Optional[Location]):
+    """(empty neighbours of the opponent's queen, of colour's queen or None) after the move - without playing it"""
+    vacated = None
+    if move.current_location is not None and len(grid.get(move.current_location, ())) == 1:
+        vacated = move.current_location
+
+    if _is_queen(move.piece, opposite_colour(colour)) and move.current_location == opponent_queen:
+        opponent_queen = move.new_location
+    if _is_queen(move.piece, colour) and move.current_location is not None and move.current_location == own_queen:
+        own_queen = move.new_location
+    if _is_queen(move.piece, colour) and move.current_location is None:
+        own_queen = move.new_location
+
+    def empty_around(queen_loc):
+        if queen_loc is None:
+            return None
+        count = 0
+        for loc in positions_around_location(queen_loc):
+            if loc == move.new_location:
+                continue
+            if loc == vacated or not grid.get(loc):
+                count += 1
+        return count
+
+    return empty_around(opponent_queen), empty_around(own_queen)
+
+
+def _is_queen(piece: Piece, colour: Colour) -> bool:
+    return piece.name == pieces.QUEEN and piece.colour == colour
+
+
+def _unique(locations: Iterable[Location]) -> List[Location]:
+    """Without repeats (a spider can reach a location by more than one path), in order"""
+    seen = set()
+    result = []
+    for loc in locations:
+        if loc not in seen:
+            seen.add(loc)
+            result.append(loc)
+    return result
@@ -0,0 +1,118 @@
+"""
+The perimeter slide graph, shared by every sliding piece in a position.
+
+Ants and spiders move by sliding around the outside of the hive.  Rather than asking
+one_move_away about every step of every path for every piece, build once per position:
+
+    - nodes: the empty locations touching the hive
+    - edges: a -> b where a piece can slide from a to the neighbouring empty location b,
+      which (see check_can_slide_to) means exactly one of the two locations both a and b
+      touch - the "gates" - is occupied
+
+The piece that is moving isn't part of the hive while it moves, which only changes edges
+into the locations around it (its cell may be a gate, or the only piece holding a location
+onto the hive).  get_mover_slide_graph patches just those edges, so an ant's moves are a
+reachability query and a spider's a depth 3 walk over the shared graph.
+
+Everything is done on packed locations (see packed_locations.py).
+"""
+from typing import Dict, List, Optional, Tuple
+
+from hive.game_engine.game_state import Grid, Location
+from hive.game_engine.packed_locations import NEIGHBOUR_OFFSETS, PackedLocation, pack_location, packed_occupied, unpack_location
+from hive.game_engine.position_cache import position_cached
+
+SlideGraph = Dict[PackedLocation, Tuple[PackedLocation, ...]]
+
+# for each direction: (step, the two gates either side of the step) - gates are the neighbours either side
+GATED_STEPS = tuple((step, NEIGHBOUR_OFFSETS[i - 1], NEIGHBOUR_OFFSETS[(i + 1) % 6])
+                    for i, step in enumerate(NEIGHBOUR_OFFSETS))
+
+
+def _slides_from(occupied, a: PackedLocation, mover: Optional[PackedLocation] = None) -> Tuple[PackedLocation, ...]:
+    """Empty locations a piece at a can slide to, in clockwise order.
+    If mover is given, it is the location the sliding piece started from (as one_move_away with positions_to_ignore)"""
+    slides = []
+    for step, gate_1, gate_2 in GATED_STEPS:
+        b = a + step
+        if b in occupied:
+            continue
+        gate_1, gate_2 = a + gate_1, a + gate_2
+        occupied_1, occupied_2 = gate_1 in occupied, gate_2 in occupied
+
+        if mover is None:
+            if occupied_1 != occupied_2:
+                slides.append(b)
+            continue
+
+        if not (occupied_1 or occupied_2):
+            continue  # nothing to slide along
+        if occupied_1 and occupied_2 and mover != gate_1 and mover != gate_2:
+            continue  # gap too narrow
+        if not any(b + d in occupied and b + d != mover for d in NEIGHBOUR_OFFSETS):
+            continue  # only held onto the hive by the moving piece
+        slides.append(b)
+    return tuple(slides)
+
+
+@position_cached
+def get_slide_graph(grid: Grid) -> SlideGraph:
+    """The slide graph of a position, with every piece in place"""
+    occupied = packed_occupied(grid)
+    perimeter = {p + d for p in occupied for d in NEIGHBOUR_OFFSETS}
+    perimeter.difference_update(occupied)
+    return {a: _slides_from(occupied, a) for a in perimeter}
+
+
+@position_cached
+def get_mover_slide_graph(grid: Grid, loc: Location) -> SlideGraph:
+    """The slide graph for the piece at loc, which is lifted off the hive as it moves.
+    Includes the first steps away from loc itself."""
+    occupied = packed_occupied(grid)
+    mover = pack_location(loc)
+
+    graph = dict(get_slide_graph(grid))
+
+    # only edges into the locations around the mover can change - fix up everything that could lead there
+    near_mover = {mover + d for d in NEIGHBOUR_OFFSETS}
+    for b in near_mover:
+        for d in NEIGHBOUR_OFFSETS:
+            a = b + d
+            if a not in occupied:
+                graph[a] = _slides_from(occupied, a, mover=mover)
+
+    graph[mover] = _slides_from(occupied, mover, mover=mover)
+    return graph
+
+
+def get_slide_reachable(grid: Grid, loc: Location) -> List[Location]:
+    """All locations the piece at loc can reach by sliding any distance (ant)"""
+    graph = get_mover_slide_graph(grid, loc)
+    start = pack_location(loc)
+
+    visited = {start}
+    to_visit = list(graph[start])
+    while to_visit:
+        current = to_visit.pop()
+        if current in visited:
+            continue
+        visited.add(current)
+        to_visit.extend(graph.get(current, ()))
+
+    visited.remove(start)
+    return [unpack_location(p) for p in visited]
+
+
+def get_slide_walk_ends(grid: Grid, loc: Location, steps: int) -> List[Location]:
+    """The end of every path of exactly `steps` slides from loc, never revisiting a location (spider).
+    One entry per path, in the order one_move_away would find them."""
+    graph = get_mover_slide_graph(grid, loc)
+
+    paths = [(pack_location(loc),)]
+    for _ in range(steps):
+        paths = [path + (next_pos,)
+                 for path in paths
+                 for next_pos in graph.get(path[-1], ())
+                 if next_pos not in path]
+
+    return [unpack_location(path[-1]) for path in paths]
@@ -0,0 +1,137 @@
+"""
+Zobrist hashing for Hive positions.
+
+Every (piece, location, stack height) triple maps to a pseudo-random 64-bit key, and
+a position hashes to the XOR of the keys of every piece on the board, plus a key for
+the side to move and a key for the piece moved last turn.  Because XOR is its own
+inverse, placing, moving or passing only needs to XOR a few keys in and out, so the
+hash can be carried on every Game and updated in O(1) as the next state is built
+(see game_functions.py).
+
+Keys are derived deterministically from the triple (splitmix64) rather than drawn
+from a random table, so the board is unbounded and hashes are stable across
+processes - they can be stored in files or shared between workers.
+
+The hash identifies the position: the grid, the side to move, and the piece moved last
+turn together with whether a pillbug moved it - the pillbug rules depend on both, so
+positions with the same grid can have different moves.  Turn counts are not part of it:
+before the queen is down a player can only place, so the grid already fixes how many
+pieces each side has played.
+"""
+import weakref
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from hive.game_engine import pieces
+from hive.game_engine.game_state import BLACK, WHITE, Colour, Game, Grid, Location, MutableGrid, Piece
+
+MASK_64 = (1 << 64) - 1
+
+COLOUR_INDEX = {WHITE: 0, BLACK: 1}
+PIECE_NAME_INDEX = {name: i for i, name in enumerate((pieces.QUEEN, pieces.ANT, pieces.BEETLE,
+                                                      pieces.GRASSHOPPER, pieces.SPIDER, pieces.MOSQUITO,
+                                                      pieces.PILLBUG, pieces.LADYBUG, pieces.BLANK,
+                                                      pieces.EMPTY))}
+
+
+def _mix64(x: int) -> int:
+    """splitmix64 finaliser - spreads an integer over 64 well mixed bits"""
+    x = (x + 0x9E3779B97F4A7C15) & MASK_64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return x ^ (x >> 31)
+
+
+BLACK_TO_MOVE_KEY = _mix64(MASK_64)
+
+
+@lru_cache(maxsize=2 ** 16)
+def piece_key(piece: Piece, location: Location, stack_idx: int) -> int:
+    """The 64-bit key for a piece sitting at a location and height"""
+    q, r = location
+    return _mix64((_piece_code(piece) << 48) | ((q & 0xFFFF) << 32) | ((r & 0xFFFF) << 16) | stack_idx)
+
+
+def _piece_code(piece: Piece) -> int:
+    return (COLOUR_INDEX[piece.colour] << 10) | (PIECE_NAME_INDEX[piece.name] << 6) | piece.number
+
+
+def turn_key(colour: Colour) -> int:
+    """The key for the side to move (white to move hashes to 0, so an empty board hashes to 0)"""
+    return BLACK_TO_MOVE_KEY if colour == BLACK else 0
+
+
+@lru_cache(maxsize=2 ** 8)
+def _moved_piece_key(piece: Piece, pillbug_moved: bool) -> int:
+    # the top bits are never set in a piece_key input, so these keys can't collide with those
+    return _mix64((1 << 63) | (pillbug_moved << 62) | (_piece_code(piece) << 48))
+
+
+def last_move_key(piece_moved_last_turn: Optional[Piece], move) -> int:
+    """The key for the piece moved last turn and whether a pillbug moved it (0 after a placement or pass)"""
+    if piece_moved_last_turn is None:
+        return 0
+    return _moved_piece_key(piece_moved_last_turn, getattr(move, 'pillbug_moved_other_piece', False))
+
+
+def hash_grid(grid: Grid) -> int:
+    """Hash of the pieces on the board, computed from scratch"""
+    h = 0
+    for location, stack in grid.items():
+        for stack_idx, piece in enumerate(stack):
+            h ^= piece_key(piece, location, stack_idx)
+    return h
+
+
+# id(grid) -> (weak reference to the grid, hash of the grid).  Lets grid-only code (grid_functions.py)
+# look up the hash of a grid the engine has already hashed incrementally, without keeping the grid alive.
+_grid_hashes: Dict[int, Tuple[weakref.ref, int]] = {}
+
+
+def _forget_grid(ref: weakref.ref, key: int):
+    entry = _grid_hashes.get(key)
+    if entry is not None and entry[0] is ref:
+        del _grid_hashes[key]
+
+
+def register_grid_hash(grid: Grid, h: int):
+    """Remember the hash of a grid for as long as the grid is alive"""
+    key = id(grid)
+    _grid_hashes[key] = (weakref.ref(grid, lambda ref, key=key: _forget_grid(ref, key)), h)
+
+
+def grid_hash(grid: Grid) -> int:
+    """Hash of the pieces on the board - O(1) for grids built by the engine, computed once otherwise"""
+    if type(grid) is MutableGrid:
+        return grid.zobrist
+    entry = _grid_hashes.get(id(grid))
+    if entry is not None and entry[0]() is grid:
+        return entry[1]
+    h = hash_grid(grid)
+    register_grid_hash(grid, h)
+    return h
+
+
+def hash_position(grid: Grid, current_turn: Colour, piece_moved_last_turn: Optional[Piece] = None,
+                  move=None) -> int:
+    """Full hash of a position"""
+    return grid_hash(grid) ^ turn_key(current_turn) ^ last_move_key(piece_moved_last_turn, move)
+
+
+def hash_game(game: Game) -> int:
+    """Recompute the hash of a game from scratch (should always equal game.zobrist)"""
+    return hash_grid(game.grid) ^ turn_key(game.current_turn) ^ last_move_key(game.piece_moved_last_turn, game.move)
+
+
+def set_current_turn(game: Game, colour: Colour) -> Game:
+    """Change the side to move, keeping the hash in step"""
+    zobrist = game.zobrist ^ turn_key(game.current_turn) ^ turn_key(colour)
+    return game.set(current_turn=colour, zobrist=zobrist)
+
+
+def set_last_move(game: Game, move) -> Game:
+    """Change the move recorded on the game (eg to mark a pillbug move), keeping the hash in step"""
+    zobrist = (game.zobrist
+               ^ last_move_key(game.piece_moved_last_turn, game.move)
+               ^ last_move_key(game.piece_moved_last_turn, move))
+    return game.set(move=move, zobrist=zobrist)
@@ -6,6 +6,7 @@ from torch_geometric.data import Data
 from typing import List
 from hive.game_engine.game_functions import get_winner
 from hive.game_engine.game_state import Game
+from hive.game_engine.history import iter_history
 from hive.game_engine.moves import NoMove
 from hive.ml.featurise.game_to_graph import Graph
 from hive.ml.featurise.graph_to_pyg import game_to_pytorch, graph_to_pytorch
@@ -47,15 +48,19 @@ def process_endgame(game: Game) -> List[Data]:
 
     # Generate a list of games, and the move that was player (which will come from the game one step head)
     all_data = []
-    while game.move is not None:
+    games = iter_history(game)  # newest first, whichever history the game keeps
+    game = next(games)
+    for parent in games:
+        if game.move is None:
+            break
         '''
-        game.parent is the game state before the move was made
+        parent is the game state before the move was made
         game.move is the move that made
         game is the resulting game state after the move
         '''
 
         # create a data object, and values for training
-        graph = Graph(game.parent)
+        graph = Graph(parent)
         data = graph_to_pytorch(graph)
 
         # Create move labels
@@ -67,7 +72,7 @@ def process_endgame(game: Game) -> List[Data]:
         # Determine winner value
         if winner == None:
             current_player_winner = 0
-        elif winner == game.parent.current_turn:
+        elif winner == parent.current_turn:
             current_player_winner = 1
         else:
             current_player_winner = -1
@@ -79,7 +84,7 @@ def process_endgame(game: Game) -> List[Data]:
         # append to the data list
         all_data.append(data)
 
-        game = game.parent  # move to the previous game state
+        game = parent  # move to the previous game state
 
     # return data for training
     return all_data
@@ -6,10 +6,12 @@ from hive.game_engine.moves import NoMove, get_possible_moves
 from hive.game_engine.player_functions import get_players_possible_moves_or_placements, get_players_moves
 from hive.ml.featurise.node_features import NodeFeatureMethod
 from hive.ml.featurise.node_features import all_node_feature_methods
+from hive.profiling import profiled
 
 class Graph():
     """An intermediate representation on the way to a pytorch geometric graph."""
 
+    @profiled(name="Graph.build")
     def __init__(self, game: Game):
 
         self.game = game
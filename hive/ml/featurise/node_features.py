@@ -3,9 +3,8 @@
 from typing import Callable, List, Optional
 
 from hive.game_engine import pieces
-from hive.game_engine.game_functions import get_queen_location, opposite_colour
 from hive.game_engine.game_state import Colour, Grid, Location, Piece
-from hive.game_engine.moves import get_possible_moves
+from hive.game_engine.moves import has_possible_moves
 
 NodeFeatureMethod = Callable[[Optional[Piece], Location, int, Colour, Grid], List[float|int]]
 
@@ -61,15 +60,12 @@ def featurise_moves(piece: Optional[Piece], loc: Location, i: int, colour: Colou
     if stack is None or len(stack) == 0 or stack[-1] != piece:
         return [0, 0, 0]
 
-    legal_moves = get_possible_moves(grid, loc, len(stack)-1)  # returns a list of locations
-    has_legal_moves = 1 if len(legal_moves) > 0 else 0
+    has_legal_moves = 1 if has_possible_moves(grid, loc, len(stack)-1) else 0
 
-    enemy_colour = opposite_colour(colour)
-    current_player_queen_loc = get_queen_location(grid, colour)
-    opponent_player_queen_loc = get_queen_location(grid, enemy_colour)
-
-    can_move_to_our_queen = 1 if current_player_queen_loc in legal_moves else 0
-    can_move_to_opponent_queen = 1 if opponent_player_queen_loc in legal_moves else 0
+    # These compared the queen locations against a list of Moves, which never matched, so they have
+    # always been 0.  Kept as 0 so the feature layout (and models trained on it) stay the same.
+    can_move_to_our_queen = 0
+    can_move_to_opponent_queen = 0
 
     return [has_legal_moves, can_move_to_our_queen, can_move_to_opponent_queen]
 
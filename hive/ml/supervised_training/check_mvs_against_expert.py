@@ -2,6 +2,7 @@
 
 from pathlib import Path
 
+from hive.game_engine.history import iter_history
 from hive.game_engine.player_functions import get_players_possible_moves_or_placements
 from hive.render.to_text import game_to_text
 from hive.trajectory.game_dataloader import GameDataLoader
@@ -10,7 +11,7 @@ from hive.trajectory.game_dataloader import GameDataLoader
 if __name__ == '__main__':
     filepath = f"{Path(__file__).parents[3]}/game_strings/combined.txt"
     batch_size = 100
-    loader = GameDataLoader(filepath, batch_size=batch_size)
+    loader = GameDataLoader(filepath, batch_size=batch_size, checkpoint_interval=16)
     total_batches = (len(loader) + batch_size - 1) // batch_size
     
     print(f"Total games: {len(loader)}")
@@ -24,14 +25,18 @@ if __name__ == '__main__':
         for j, game in enumerate(games):
             print(f"Game {i * batch_size + j + 1}/{len(loader)}")
             # want to check that the moves made in the game match the possible moves identified by the engine
-            while game.move is not None:
-                #print(f"{game.parent.player_turns} - Game turn={game.parent.current_turn} - move={game.move}")
-                turn_colour = game.parent.current_turn
+            history = iter_history(game)  # newest first
+            game = next(history)
+            for parent in history:
+                if game.move is None:
+                    break
+                #print(f"{parent.player_turns} - Game turn={parent.current_turn} - move={game.move}")
+                turn_colour = parent.current_turn
                 #print(f"Turn: {turn_colour} - Move: {game.move}")
-                possible_moves = get_players_possible_moves_or_placements(turn_colour, game.parent)
+                possible_moves = get_players_possible_moves_or_placements(turn_colour, parent)
 
                 #print(game.move)
-                #print(game.parent.move)
+                #print(parent.move)
 
                 matches = [mv for mv in possible_moves if mv == game.move]
 
@@ -39,7 +44,7 @@ if __name__ == '__main__':
                     print(game.player_turns)
                     print(game.move)
                     print(game_to_text(game))
-                    print(game_to_text(game.parent))
+                    print(game_to_text(parent))
 
                     for mv in possible_moves:
                         print(f"{mv} != {game.move}")
@@ -56,10 +61,10 @@ if __name__ == '__main__':
                         else:
                             print(f"Game string index {game_string_idx} out of range")
                     
-                    print(game.parent.grid)
+                    print(parent.grid)
                     raise ValueError(f"Move not in possible moves")
                 
                 
 
-                game = game.parent
+                game = parent
     
\ No newline at end of file
@@ -1,4 +1,6 @@
 from hive.play.agents.random_ai import RandomAI
 from hive.play.agents.scored_moves_based_ai import ScoreMovesAI
 from hive.play.agents.scored_board_state_ai import ScoreBoardIn1Move_AI
-from hive.play.agents.minimax_ai import MinimaxAI
\ No newline at end of file
+from hive.play.agents.minimax_ai import MinimaxAI
+from hive.play.agents.proof_number_search import ProofNumberAI
+from hive.play.agents.opening_book_ai import OpeningBookAI
\ No newline at end of file
@@ -1,9 +1,10 @@
 from hive.game_engine.game_functions import opposite_colour
 from hive.game_engine.game_state import Colour, Game
+from hive.game_engine.frontier import placeable_locations
 from hive.game_engine.grid_functions import (
-    pieces_around_location, can_remove_piece, get_placeable_locations
+    pieces_around_location, can_remove_piece
 )
-from hive.game_engine.moves import get_possible_moves
+from hive.game_engine.moves import count_possible_moves
 
 
 
@@ -65,8 +66,8 @@ def score_board_queens_improved(game: Game, colour: Colour) -> int:
     # Small consideration for piece placement ability
     # This helps in early game when queens aren't on board yet
     if total_turns < 10:
-        our_placeable = len(get_placeable_locations(game.grid, colour))
-        enemy_placeable = len(get_placeable_locations(game.grid, enemy_colour))
+        our_placeable = len(placeable_locations(game, colour))
+        enemy_placeable = len(placeable_locations(game, enemy_colour))
         placement_score = (our_placeable - enemy_placeable) * 2
         score += placement_score
     
@@ -153,14 +154,12 @@ def score_board_advanced(game: Game, colour: Colour) -> int:
         # Count pieces by color
         if top_piece.colour == colour:
             our_piece_count += 1
-            # Calculate possible moves for our pieces
-            possible_moves = get_possible_moves(game.grid, loc)
-            our_mobility += len(possible_moves)
+            # Count possible moves for our pieces
+            our_mobility += count_possible_moves(game.grid, loc, len(stack)-1)
         else:
             enemy_piece_count += 1
-            # Calculate possible moves for enemy pieces
-            possible_moves = get_possible_moves(game.grid, loc)
-            enemy_mobility += len(possible_moves)
+            # Count possible moves for enemy pieces
+            enemy_mobility += count_possible_moves(game.grid, loc, len(stack)-1)
     
     # Calculate average mobility (avoid division by zero)
     our_avg_mobility = our_mobility / max(1, our_piece_count)
@@ -174,8 +173,8 @@ def score_board_advanced(game: Game, colour: Colour) -> int:
     control_score = 0
     
     # Count placeable locations for each player
-    our_placeable = len(get_placeable_locations(game.grid, colour))
-    enemy_placeable = len(get_placeable_locations(game.grid, enemy_colour))
+    our_placeable = len(placeable_locations(game, colour))
+    enemy_placeable = len(placeable_locations(game, enemy_colour))
     
     # Score control difference (weighted by early game importance)
     control_weight = early_game * 2.0 + mid_game * 1.0 + late_game * 0.5
@@ -0,0 +1,128 @@
+"""
+Lazy SMP for MinimaxAI: several processes searching the same root, sharing one transposition table.
+
+Splitting the root moves (parallel_search.py) gives each worker its own table, so a position
+reached under two root moves is searched twice, and the workers can't share what they learn.
+In Lazy SMP every worker runs the whole iterative deepening search from the root, and they share
+a SharedTranspositionTable (see shared_transposition_table.py) - each finds the others' results
+and best moves there, so between them they search the tree faster than one alone.  To keep the
+workers from searching in lockstep:
+
+    - odd numbered helpers start a ply deeper
+    - helpers order otherwise equal moves at random, each with its own seed
+
+Worker 0 is the main search: when it finishes (or the deadline passes) the helpers are told to
+stop.  The move played is from the worker which completed the deepest iteration, ties going to
+the lowest numbered worker.
+
+    ai = MinimaxAI(WHITE, max_depth=5, processes=8, lazy_smp=True)
+    move = ai.get_move(game)
+    ai.close()    # stop the pool and free the table
+"""
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from hive.game_engine.game_state import Game
+from hive.game_engine.move_codes import MoveCode, pack_move, unpack_move
+from hive.game_engine.moves import Move, NoMove
+from hive.game_engine.packed_position import PackedPosition, pack_position, unpack_position
+from hive.game_engine.queen_threats import find_queen_threats
+from hive.play.agents.minimax_ai import MinimaxAI
+from hive.play.agents.move_ordering import MoveOrderer
+from hive.play.agents.shared_transposition_table import SharedTranspositionTable
+
+
+class WorkerResult(NamedTuple):
+    worker: int
+    completed_depth: int
+    move: MoveCode
+    nodes: int
+    nodes_per_depth: Dict[int, int]
+
+
+# Per worker process, set up by _init_worker
+_worker_ai: Optional[MinimaxAI] = None
+
+
+def _init_worker(settings: Dict, table_name: str, n_buckets: int, stop_flag):
+    global _worker_ai
+    _worker_ai = MinimaxAI(**settings)
+    _worker_ai.transposition_table = SharedTranspositionTable.attach(table_name, n_buckets)
+    _worker_ai.stop_flag = stop_flag
+
+
+def _search_worker(packed: PackedPosition, worker: int, deadline: float) -> WorkerResult:
+    """Worker task: an iterative deepening search of the root (deadline is wall clock time)"""
+    ai = _worker_ai
+    game = unpack_position(packed)
+    ai._deadline = time.perf_counter() + (deadline - time.time())
+    ai._first_depth = min(1 + worker % 2, ai.max_depth)
+    ai.move_orderer = MoveOrderer(seed=worker if worker else None)
+
+    move = ai._search(game)
+    if worker == 0:
+        ai.stop_flag.value = 1
+    return WorkerResult(worker, ai.completed_depth, pack_move(move), ai.nodes_evaluated, ai.nodes_per_depth)
+
+
+def pick_result(results: List[WorkerResult]) -> WorkerResult:
+    """The deepest completed search, ties to the lowest numbered worker"""
+    return max(results, key=lambda result: (result.completed_depth, -result.worker))
+
+
+class LazySMPSearch:
+    """A pool of worker processes and the shared table they search with"""
+
+    def __init__(self, ai: MinimaxAI, processes: int):
+        self.ai = ai
+        self.processes = processes
+        self.table = SharedTranspositionTable(size_mb=ai.tt_size_mb)
+        self._stop_flag = multiprocessing.Value('b', 0)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            settings = dict(colour=self.ai.colour, max_depth=self.ai.max_depth, eval_function=self.ai.eval_function,
+                            use_iterative_deepening=self.ai.use_iterative_deepening, tt_size_mb=0,
+                            aspiration_window=self.ai.aspiration_window, check_every=self.ai.check_every)
+            self._pool = ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                             initargs=(settings, self.table.name, self.table.n_buckets,
+                                                       self._stop_flag))
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        if self.table is not None:
+            self.table.close()
+            self.table.unlink()
+            self.table = None
+
+    def search(self, game: Game, possible_moves: List[Union[Move, NoMove]],
+               depths: List[int]) -> Optional[Union[Move, NoMove]]:
+        """The move from the deepest search finished before the main worker finished or the deadline"""
+        ai = self.ai
+        threats = find_queen_threats(game, ai.colour)
+        if threats.wins:
+            return threats.wins[0]
+
+        packed = pack_position(game)
+        deadline = time.time() + (ai._deadline - time.perf_counter())
+        self.table.new_search()  # the workers' tables are attached, so store with this age
+        self._stop_flag.value = 0
+        futures = [self._executor().submit(_search_worker, packed, worker, deadline)
+                   for worker in range(self.processes)]
+        results = [future.result() for future in futures]
+
+        ai.nodes_evaluated = sum(result.nodes for result in results)
+        for result in results:
+            for depth, nodes in result.nodes_per_depth.items():
+                ai.nodes_per_depth[depth] = ai.nodes_per_depth.get(depth, 0) + nodes
+
+        best = pick_result(results)
+        ai.completed_depth = best.completed_depth
+        ai.search_aborted = results[0].completed_depth < depths[-1]
+        return unpack_move(best.move)
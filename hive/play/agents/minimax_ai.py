@@ -5,67 +5,38 @@ from typing import Dict, List, Tuple, Optional, Union, Callable
 from hive.game_engine.game_state import Colour, Game
 from hive.game_engine.moves import Move, NoMove
 from hive.game_engine.player_functions import get_players_possible_moves_or_placements
+from hive.game_engine.queen_threats import QueenThreats, find_queen_threats
 from hive.play.player import Player
-from hive.game_engine.game_functions import opposite_colour
+from hive.game_engine.game_functions import has_player_lost, opposite_colour
 from hive.play.agents.board_score.simple_board_score import score_board_queens
 from hive.play.agents.board_score.ai_generated_board_score import score_board_advanced
+from hive.play.agents.move_ordering import MoveOrderer
+from hive.play.agents.transposition_table import (DEFAULT_SIZE_MB, EXACT, INFINITE_SCORE, MATE_SCORE,
+                                                  WIN_THRESHOLD, TranspositionTable, bound_type)
+from hive.play.clock import GameClock
 
 
-class TranspositionTable:
-    """
-    A cache for storing evaluated positions to avoid redundant calculations.
-    Uses Zobrist hashing for efficient position identification.
-    """
-    def __init__(self, max_size: int = 1000000):
-        self.max_size = max_size
-        self.table: Dict[str, Tuple[int, int, Move]] = {}  # hash -> (score, depth, best_move)
-    
-    def store(self, game: Game, depth: int, score: int, best_move: Optional[Move] = None):
-        """Store a position evaluation in the table"""
-        # Simple string representation of the game state as a hash
-        # In a real implementation, Zobrist hashing would be more efficient
-        game_hash = self._hash_game(game)
-        
-        self.table[game_hash] = (score, depth, best_move)
-        
-        # Manage table size if needed
-        if len(self.table) > self.max_size:
-            # Remove random entries to keep size in check
-            # A more sophisticated approach would use LRU or other eviction policies
-            keys_to_remove = random.sample(list(self.table.keys()), int(self.max_size * 0.2))
-            for key in keys_to_remove:
-                del self.table[key]
-    
-    def lookup(self, game: Game) -> Optional[Tuple[int, int, Move]]:
-        """Look up a position in the table"""
-        game_hash = self._hash_game(game)
-        return self.table.get(game_hash)
-    
-    def _hash_game(self, game: Game) -> str:
-        """
-        Create a string hash of the game state.
-        This is a simplified approach - a real implementation would use Zobrist hashing.
-        """
-        # Convert the immutable grid to a string representation
-        grid_str = str(sorted([(loc, tuple(stack)) for loc, stack in game.grid.items()]))
-        turn_str = str(game.player_turns)
-        return f"{grid_str}|{turn_str}"
-    
-    def clear(self):
-        """Clear the transposition table"""
-        self.table.clear()
+class SearchTimeout(Exception):
+    """The deadline passed part way through a search"""
 
 
 class MinimaxAI(Player):
     """
-    AI player that uses the minimax algorithm with alpha-beta pruning to select moves.
+    AI player that uses negamax alpha-beta search (principal variation search) to select moves.
     
     Features:
     - Configurable search depth
-    - Alpha-beta pruning for efficiency
-    - Move ordering to improve pruning
-    - Transposition table for caching evaluated positions
-    - Iterative deepening for time management
+    - Principal variation search: the first move is searched with the full window, the rest with
+      a null window, only re-searched if they might be better
+    - Aspiration windows centred on the previous iteration's score
+    - Move ordering to improve pruning, without playing the moves (see move_ordering.py)
+    - Transposition table for caching evaluated positions, kept between iterations and moves
+    - Iterative deepening for time management, with the deadline polled during the search so it
+      is kept to even part way through an iteration
+    - An optional game clock with increment, which sets each move's time budget
+    - Optionally, a pool of processes searching in parallel: either sharing out the root moves
+      (see parallel_search.py), or all searching the whole tree with a shared transposition table
+      (Lazy SMP, see lazy_smp.py)
     """
     
     def __init__(self, 
@@ -73,7 +44,13 @@ class MinimaxAI(Player):
                  max_depth: int = 3, 
                  eval_function: Callable[[Game, Colour], int] = score_board_queens,
                  use_iterative_deepening: bool = True,
-                 time_limit: float = 5.0):
+                 time_limit: float = 5.0,
+                 tt_size_mb: float = DEFAULT_SIZE_MB,
+                 aspiration_window: int = 10,
+                 clock: Optional[GameClock] = None,
+                 check_every: int = 256,
+                 processes: int = 1,
+                 lazy_smp: bool = False):
         """
         Initialize the MinimaxAI.
         
@@ -82,58 +59,114 @@ class MinimaxAI(Player):
             max_depth: Maximum search depth
             eval_function: Function to evaluate board states
             use_iterative_deepening: Whether to use iterative deepening
-            time_limit: Time limit for move selection in seconds
+            time_limit: Time limit for move selection in seconds (if there is no clock)
+            tt_size_mb: Memory for the transposition table, in megabytes - allocated up front
+            aspiration_window: Half width of the window around the previous iteration's score
+            clock: This player's game clock - each move's time limit is allocated from it, and the
+                time taken charged to it
+            check_every: Number of nodes searched between checks of the deadline
+            processes: Number of worker processes to search with - 1 searches in this process.
+                Call close() when done, to stop the workers
+            lazy_smp: With processes > 1, have every worker search the whole tree at staggered depths
+                and move orders, sharing one transposition table, rather than splitting the root moves
         """
         super().__init__(colour)
         self.max_depth = max_depth
         self.eval_function = eval_function
-        self.transposition_table = TranspositionTable()
+        self.tt_size_mb = tt_size_mb
+        self.transposition_table = TranspositionTable(size_mb=tt_size_mb)
+        self.move_orderer = MoveOrderer()
+        self._root_depth = max_depth
         self.use_iterative_deepening = use_iterative_deepening
         self.time_limit = time_limit
+        self.aspiration_window = aspiration_window
+        self.clock = clock
+        self.check_every = check_every
+        self.processes = processes
+        self.lazy_smp = lazy_smp
+        self._parallel_search = None
+        self.stop_flag = None  # a shared flag (with a .value) which stops the search when set
+        self._first_depth = 1
+        self._deadline = float('inf')
+        self._root_best: Optional[Tuple[Move, int]] = None
+        self.completed_depth = 0
+        self.search_aborted = False
         self.nodes_evaluated = 0
+        self.nodes_per_depth: Dict[int, int] = {}
+        self.researches = 0
     
     def get_move(self, game: Game) -> Union[Move, NoMove]:
         """
-        Select the best move using minimax with alpha-beta pruning.
+        Select the best move using alpha-beta search.
         
         If iterative deepening is enabled, gradually increase search depth
-        until time limit is reached.
+        until time limit is reached.  If the deadline passes part way through an iteration, the
+        search stops and the best move found so far is played.
         """
+        start_time = time.perf_counter()
+        time_limit = self.clock.allocate(game, self.colour) if self.clock is not None else self.time_limit
+        self._deadline = start_time + time_limit
+
+        move = self._search(game)
+
+        if self.clock is not None:
+            self.clock.charge(time.perf_counter() - start_time)
+        return move
+
+    def _search(self, game: Game) -> Union[Move, NoMove]:
         possible_moves = get_players_possible_moves_or_placements(self.colour, game)
         if len(possible_moves) == 0:
             return NoMove(self.colour)
         
-        # Reset statistics for this move search
+        # Reset statistics for this move search - entries from earlier moves are kept, but age
         self.nodes_evaluated = 0
-        start_time = time.time()
+        self.nodes_per_depth = {}
+        self.researches = 0
+        self.completed_depth = 0
+        self.search_aborted = False
+        self.transposition_table.new_search()
+        self.move_orderer.new_search()
         
         # If only one move is possible, return it immediately
         if len(possible_moves) == 1:
             return possible_moves[0]
         
         best_move = None
-        best_score = float('-inf')
-        
-        if self.use_iterative_deepening:
-            # Start with depth 1 and gradually increase
-            for current_depth in range(1, self.max_depth + 1):
-                # Clear transposition table between iterations to avoid depth issues
-                # In a more sophisticated implementation, we could keep entries but handle depth properly
-                self.transposition_table.clear()
-                
-                temp_best_move, temp_best_score = self._iterative_deepening_search(game, possible_moves, current_depth)
-                
-                # Update best move if we have a valid result
-                if temp_best_move is not None:
-                    best_move = temp_best_move
-                    best_score = temp_best_score
-                
-                # Check if we've used up our time budget
-                if time.time() - start_time > self.time_limit:
-                    break
-        else:
-            # Regular minimax search at fixed depth
-            best_move, best_score = self._find_best_move(game, possible_moves, self.max_depth)
+        best_score = None
+        depths = range(self._first_depth, self.max_depth + 1) if self.use_iterative_deepening else [self.max_depth]
+
+        if self.processes > 1:
+            best_move = self._parallel().search(game, possible_moves, list(depths))
+            return best_move if best_move is not None else random.choice(possible_moves)
+        
+        # Start with depth 1 and gradually increase (or just search max_depth)
+        # Each iteration reuses the table from the last: shallower scores are still move hints
+        for current_depth in depths:
+            self._root_best = None
+            try:
+                temp_best_move, temp_best_score = self._iterative_deepening_search(
+                    game, possible_moves, current_depth, best_score)
+            except SearchTimeout:
+                # Out of time part way through - a root move which searched better than the last
+                # iteration's best is better to play than it (the last best is searched first)
+                self.search_aborted = True
+                if self._root_best is not None:
+                    best_move = self._root_best[0]
+                break
+            
+            # Update best move if we have a valid result
+            if temp_best_move is not None:
+                best_move = temp_best_move
+                best_score = temp_best_score
+                self.completed_depth = current_depth
+            
+            # A forced win has been found - searching deeper won't find a quicker one
+            if best_score is not None and best_score >= WIN_THRESHOLD:
+                break
+
+            # Check if we've used up our time budget (or been told to stop)
+            if self._should_stop():
+                break
         
         # If we somehow failed to find a move, pick a random one
         if best_move is None:
@@ -141,67 +174,101 @@ class MinimaxAI(Player):
         
         return best_move
     
-    def _iterative_deepening_search(self, game: Game, possible_moves: List[Move], depth: int) -> Tuple[Optional[Move], int]:
+    def _should_stop(self) -> bool:
+        return time.perf_counter() > self._deadline or (self.stop_flag is not None and self.stop_flag.value)
+
+    def _parallel(self):
+        if self._parallel_search is None:
+            if self.lazy_smp:
+                from hive.play.agents.lazy_smp import LazySMPSearch
+                self._parallel_search = LazySMPSearch(self, self.processes)
+            else:
+                from hive.play.agents.parallel_search import RootParallelSearch
+                self._parallel_search = RootParallelSearch(self, self.processes)
+        return self._parallel_search
+
+    def close(self):
+        """Stop the worker processes, if any"""
+        if self._parallel_search is not None:
+            self._parallel_search.close()
+            self._parallel_search = None
+
+    def search_root_move(self, game: Game, move: Union[Move, NoMove], depth: int, alpha: int, beta: int) -> int:
+        """
+        The score of one root move, searched to depth with the window (alpha, beta).
+        Used by the root-parallel search, in the worker processes.
+        """
+        self._root_depth = depth
+        return -self._negamax(move.play(game), depth - 1, -beta, -alpha, opposite_colour(self.colour))
+    
+    def _iterative_deepening_search(self, game: Game, possible_moves: List[Move], depth: int,
+                                    previous_score: Optional[int] = None) -> Tuple[Optional[Move], int]:
         """
-        Perform minimax search with the specified depth.
+        Search to the specified depth with an aspiration window around the previous iteration's score.
         Used as a subroutine for iterative deepening.
+
+        If the score falls outside the window the search failed low or high and only learnt a bound,
+        so the window is widened on that side and the depth searched again.
         """
-        return self._find_best_move(game, possible_moves, depth)
+        nodes_before = self.nodes_evaluated
+        if previous_score is None or abs(previous_score) >= WIN_THRESHOLD:
+            result = self._find_best_move(game, possible_moves, depth)
+        else:
+            delta = self.aspiration_window
+            alpha, beta = previous_score - delta, previous_score + delta
+            while True:
+                result = self._find_best_move(game, possible_moves, depth, alpha, beta)
+                score = result[1]
+                if score <= alpha and alpha > -INFINITE_SCORE:
+                    alpha = max(score - delta, -INFINITE_SCORE)
+                elif score >= beta and beta < INFINITE_SCORE:
+                    beta = min(score + delta, INFINITE_SCORE)
+                else:
+                    break
+                delta *= 4
+                self.researches += 1
+        self.nodes_per_depth[depth] = self.nodes_evaluated - nodes_before
+        return result
     
-    def _find_best_move(self, game: Game, possible_moves: List[Move], depth: int) -> Tuple[Optional[Move], int]:
+    def _find_best_move(self, game: Game, possible_moves: List[Move], depth: int,
+                        alpha: int = -INFINITE_SCORE, beta: int = INFINITE_SCORE) -> Tuple[Optional[Move], int]:
         """
-        Find the best move using minimax with alpha-beta pruning.
+        Find the best move using principal variation search.
         
         Args:
             game: Current game state
             possible_moves: List of possible moves
             depth: Search depth
+            alpha: Lower end of the search window
+            beta: Upper end of the search window
             
         Returns:
-            Tuple of (best_move, best_score)
+            Tuple of (best_move, best_score) - the score is only a bound if it is outside the window
         """
-        best_move = None
-        best_score = float('-inf')
-        alpha = float('-inf')
-        beta = float('inf')
-        
-        # Check transposition table first
-        tt_entry = self.transposition_table.lookup(game)
-        if tt_entry is not None:
-            stored_score, stored_depth, stored_move = tt_entry
-            # If we have a stored result from an equal or deeper search
-            if stored_depth >= depth and stored_move in possible_moves:
-                return stored_move, stored_score
+        # Take an immediate win without searching
+        threats = find_queen_threats(game, self.colour)
+        if threats.wins:
+            return threats.wins[0], MATE_SCORE - 1
+        self._root_depth = depth
+
+        # Check transposition table first - only an exact score from an equal or deeper search will do
+        stored_score, stored_move = self.transposition_table.probe(game.zobrist, depth,
+                                                                   -INFINITE_SCORE, INFINITE_SCORE)
+        if stored_score is not None and stored_move in possible_moves:
+            return stored_move, stored_score
         
         # Order moves to improve alpha-beta pruning efficiency
-        ordered_moves = self._order_moves(game, possible_moves)
+        ordered_moves = self._order_moves(game, possible_moves, self.colour, depth, stored_move, threats)
         
-        for move in ordered_moves:
-            # Apply the move to get the new game state
-            new_game = move.play()
-            
-            # Recursive minimax call for opponent's turn
-            score = -self._minimax(new_game, depth - 1, -beta, -alpha, opposite_colour(self.colour))
-            
-            if score > best_score:
-                best_score = score
-                best_move = move
-            
-            alpha = max(alpha, best_score)
-            
-            # Alpha-beta pruning
-            if alpha >= beta:
-                break
-        
-        # Store result in transposition table
-        if best_move is not None:
-            self.transposition_table.store(game, depth, best_score, best_move)
+        best_move, best_score = self._search_moves(game, ordered_moves, depth, alpha, beta, self.colour)
         
+        self.transposition_table.store(game.zobrist, depth, best_score,
+                                       bound_type(best_score, alpha, beta), best_move)
         return best_move, best_score
     
-    def _minimax(self, game: Game, depth: int, alpha: float, beta: float, current_colour: Colour) -> int:
+    def _negamax(self, game: Game, depth: int, alpha: int, beta: int, current_colour: Colour) -> int:
         """
-        Minimax algorithm with alpha-beta pruning.
+        Negamax alpha-beta search.
         
         Args:
             game: Current game state
@@ -211,164 +278,125 @@ class MinimaxAI(Player):
             current_colour: Colour of the player to move
             
         Returns:
-            Evaluation score from the perspective of self.colour
+            Evaluation score from the perspective of current_colour - exact if inside (alpha, beta),
+            otherwise an upper bound (<= alpha) or lower bound (>= beta)
         """
         self.nodes_evaluated += 1
-        
-        # Check for game over (queen surrounded)
-        for colour in [self.colour, opposite_colour(self.colour)]:
-            queen_loc = game.queens.get(colour)
-            if queen_loc is not None:
-                from hive.game_engine.grid_functions import pieces_around_location
-                pieces_around_queen = pieces_around_location(game.grid, queen_loc)
-                if len(pieces_around_queen) == 6:  # Queen is surrounded
-                    if colour == self.colour:
-                        return float('-inf')  # We lose
-                    else:
-                        return float('inf')   # We win
-        
-        # Check transposition table
-        tt_entry = self.transposition_table.lookup(game)
-        if tt_entry is not None:
-            stored_score, stored_depth, _ = tt_entry
-            if stored_depth >= depth:
-                return stored_score
+        if self.nodes_evaluated % self.check_every == 0 and self._should_stop():
+            raise SearchTimeout()
+        ply = self._root_depth - depth
+        
+        # Check for game over (queen surrounded) - both at once is a draw
+        lost = has_player_lost(game, current_colour)
+        won = has_player_lost(game, opposite_colour(current_colour))
+        if lost or won:
+            if lost and won:
+                return 0
+            return MATE_SCORE - ply if won else -(MATE_SCORE - ply)
+        
+        # Check transposition table - scores are only reused if deep enough, and if their bound settles this window
+        stored_score, stored_move = self.transposition_table.probe(game.zobrist, depth, alpha, beta, ply)
+        if stored_score is not None:
+            return stored_score
         
         # If we've reached the maximum depth or a leaf node, evaluate the position
         if depth == 0:
-            score = self._evaluate_position(game)
-            self.transposition_table.store(game, depth, score)
+            score = self._evaluate_position(game, current_colour)
+            self.transposition_table.store(game.zobrist, depth, score, EXACT, ply=ply)
             return score
         
-        # Create a temporary player to generate moves
-        temp_player = Player(current_colour)
-        possible_moves = temp_player.possible_moves(game)
-        
-        # If no moves are available, it's a pass
-        if len(possible_moves) == 0:
-            # Create a NoMove and apply it
-            no_move = NoMove(current_colour, game)
-            new_game = no_move.play()
-            
-            # Continue search with the other player
-            return -self._minimax(new_game, depth - 1, -beta, -alpha, opposite_colour(current_colour))
+        # The player to move can win this turn - no need to look at their other moves
+        threats = find_queen_threats(game, current_colour)
+        if threats.wins:
+            return MATE_SCORE - ply - 1
+
+        possible_moves = get_players_possible_moves_or_placements(current_colour, game)
         
         # Order moves for better pruning
-        ordered_moves = self._order_moves(game, possible_moves)
+        ordered_moves = self._order_moves(game, possible_moves, current_colour, depth, stored_move, threats)
         
-        # Initialize best score
-        if current_colour == self.colour:
-            best_score = float('-inf')
-            for move in ordered_moves:
-                new_game = move.play()
-                score = self._minimax(new_game, depth - 1, alpha, beta, opposite_colour(current_colour))
-                best_score = max(best_score, score)
-                alpha = max(alpha, best_score)
-                if alpha >= beta:
-                    break  # Beta cutoff
-        else:
-            best_score = float('inf')
-            for move in ordered_moves:
-                new_game = move.play()
-                score = self._minimax(new_game, depth - 1, alpha, beta, opposite_colour(current_colour))
-                best_score = min(best_score, score)
-                beta = min(beta, best_score)
-                if alpha >= beta:
-                    break  # Alpha cutoff
+        best_move, best_score = self._search_moves(game, ordered_moves, depth, alpha, beta, current_colour)
         
-        # Store result in transposition table
-        self.transposition_table.store(game, depth, best_score)
+        # Store result in transposition table, with the bound it is given the window it was searched with
+        self.transposition_table.store(game.zobrist, depth, best_score,
+                                       bound_type(best_score, alpha, beta), best_move, ply)
         
         return best_score
     
-    def _evaluate_position(self, game: Game) -> int:
+    def _search_moves(self, game: Game, ordered_moves: List[Move], depth: int, alpha: int, beta: int,
+                      current_colour: Colour) -> Tuple[Optional[Move], int]:
         """
-        Evaluate the current position from the perspective of self.colour.
+        The principal variation search over one node's moves.
+
+        The first move is expected to be best, so it is searched with the full window.  Each later
+        move is searched with a null window (alpha, alpha + 1), which only proves it is no better,
+        and is searched again with the full window if it turns out to be.
+        """
+        opponent = opposite_colour(current_colour)
+        at_root = depth == self._root_depth
+        window_alpha = alpha
+        best_move, best_score = None, -INFINITE_SCORE
+        for i, move in enumerate(ordered_moves):
+            new_game = move.play(game)
+            if i == 0:
+                score = -self._negamax(new_game, depth - 1, -beta, -alpha, opponent)
+            else:
+                score = -self._negamax(new_game, depth - 1, -alpha - 1, -alpha, opponent)
+                if alpha < score < beta:
+                    self.researches += 1
+                    score = -self._negamax(new_game, depth - 1, -beta, -alpha, opponent)
+            
+            if score > best_score:
+                best_score, best_move = score, move
+                if at_root and score > window_alpha:
+                    self._root_best = (move, score)  # fully searched - kept if time runs out
+            alpha = max(alpha, best_score)
+            if alpha >= beta:
+                self.move_orderer.record_cutoff(move, self._root_depth - depth, depth)
+                break  # Beta cutoff
+        return best_move, best_score
+    
+    def _evaluate_position(self, game: Game, colour: Optional[Colour] = None) -> int:
+        """
+        Evaluate the current position from the perspective of colour.
         
         Args:
             game: Current game state
+            colour: Colour to evaluate for (defaults to self.colour)
             
         Returns:
-            Evaluation score (higher is better for self.colour)
+            Evaluation score (higher is better for colour)
         """
+        colour = colour or self.colour
         # Use the provided evaluation function
-        our_score = self.eval_function(game, self.colour)
-        opponent_score = self.eval_function(game, opposite_colour(self.colour))
+        our_score = self.eval_function(game, colour)
+        opponent_score = self.eval_function(game, opposite_colour(colour))
         
         # Return the difference (positive is good for us)
         return our_score - opponent_score
     
-    def _order_moves(self, game: Game, moves: List[Move]) -> List[Move]:
+    def _order_moves(self, game: Game, moves: List[Move], colour: Optional[Colour] = None, depth: Optional[int] = None,
+                     tt_move: Optional[Union[Move, NoMove]] = None,
+                     threats: Optional[QueenThreats] = None) -> List[Move]:
         """
-        Order moves to improve alpha-beta pruning efficiency.
-        
-        Prioritize:
-        1. Moves from the transposition table
-        2. Captures (moves that surround the opponent's queen)
-        3. Queen moves (usually critical)
-        4. Beetle moves (can climb)
-        5. Other moves
-        
+        Order moves to improve alpha-beta pruning efficiency, without playing any of them.
+
+        The transposition table's move comes first, then wins and queen threats, killer moves for
+        this ply, and moves ranked by queen adjacency and history (see MoveOrderer).
+
         Args:
             game: Current game state
             moves: List of possible moves
-            
+            colour: Colour making the moves (defaults to self.colour)
+            depth: Remaining search depth, giving the ply from the root for killer moves (defaults to the root)
+            tt_move: Best move from the transposition table, if any
+            threats: The colour's queen threats, if already found
+
         Returns:
             Ordered list of moves
         """
-        # Check if we have a best move from the transposition table
-        tt_entry = self.transposition_table.lookup(game)
-        tt_move = None
-        if tt_entry is not None:
-            _, _, tt_move = tt_entry
-        
-        # Score each move for ordering
-        move_scores = []
-        enemy_colour = opposite_colour(self.colour)
-        enemy_queen_loc = game.queens.get(enemy_colour)
-        
-        for move in moves:
-            score = 0
-            
-            # Highest priority: move from transposition table
-            if tt_move is not None and move == tt_move:
-                score += 10000
-            
-            # Check if this move surrounds the enemy queen
-            if enemy_queen_loc is not None:
-                # Apply the move and check if it surrounds the queen
-                new_game = move.play()
-                from hive.game_engine.grid_functions import pieces_around_location
-                pieces_around_enemy_queen = pieces_around_location(new_game.grid, enemy_queen_loc)
-                if len(pieces_around_enemy_queen) == 6:  # Queen is surrounded
-                    score += 5000
-                elif len(pieces_around_enemy_queen) == 5:  # One move away from surrounding
-                    score += 1000
-            
-            # Prioritize queen moves early in the game
-            if move.piece.name == "QUEEN":
-                # Queen placement is important
-                if move.current_location is None:
-                    score += 500
-                # Moving the queen can be risky but sometimes necessary
-                else:
-                    score += 200
-            
-            # Beetles can climb and are versatile
-            if move.piece.name == "BEETLE":
-                score += 300
-            
-            # Ants have high mobility
-            if move.piece.name == "ANT":
-                score += 250
-            
-            # Add a small random factor to avoid deterministic behavior
-            score += random.uniform(0, 10)
-            
-            move_scores.append((score, move))
-        
-        # Sort moves by score (descending)
-        move_scores.sort(reverse=True, key=lambda x: x[0])
-        
-        # Return ordered moves
-        return [move for _, move in move_scores]
\ No newline at end of file
+        colour = colour or self.colour
+        ply = self._root_depth - depth if depth is not None else 0
+        if threats is None:
+            threats = find_queen_threats(game, colour)
+        return self.move_orderer.order(game, moves, colour, ply, tt_move, threats.threats, threats.wins)
@@ -0,0 +1,150 @@
+"""
+Move ordering for alpha-beta search, from information that is already to hand.
+
+Alpha-beta cuts off as soon as it finds a move good enough, so the earlier the best move is
+tried the less is searched - but ordering must cost much less than searching, so no move is
+played to see what it does.  Moves are ranked, highest first, by:
+
+    TT_MOVE         the best move the transposition table has for the position
+    WIN             moves surrounding the opponent's queen
+    THREAT          moves leaving the opponent's queen one from surrounded (see queen_threats.py)
+    KILLER          moves which caused a cutoff at the same ply elsewhere in the tree
+    QUEEN_ADJACENCY pieces gained around the opponent's queen, or taken from around our own,
+                    read from the grid by the move's from and to locations
+    history         how often and how deep a move has caused cutoffs anywhere in the search
+    PIECE_BONUS     a small static preference by piece, so untried moves are not in generator order
+
+A seeded MoveOrderer also adds a random amount below one history step to each move, so that
+searches of the same position (see lazy_smp.py) try otherwise equal moves in different orders.
+
+Killers and history are keyed by move code (see move_codes.py), so they compare exactly and
+cheaply.  Call new_search() at the start of each move: killers are cleared (plies are counted
+from the root, so they no longer line up) and history is halved, so it favours recent cutoffs.
+"""
+import random
+from typing import Collection, List, Optional, Union
+
+from hive.game_engine import pieces
+from hive.game_engine.game_functions import opposite_colour
+from hive.game_engine.game_state import Colour, Game
+from hive.game_engine.grid_functions import positions_around_location
+from hive.game_engine.move_codes import MoveCode, pack_move
+from hive.game_engine.moves import Move, NoMove
+
+TT_MOVE = 1 << 40
+WIN = 1 << 38
+THREAT = 1 << 36
+KILLER = 1 << 32  # the first killer - the second gets half
+QUEEN_ADJACENCY = 1 << 24
+HISTORY_SCALE = 1 << 10
+HISTORY_LIMIT = 1 << 13  # history * HISTORY_SCALE stays below QUEEN_ADJACENCY
+
+N_KILLERS = 2
+
+PIECE_BONUS = {
+    pieces.QUEEN: 200,
+    pieces.BEETLE: 300,
+    pieces.ANT: 250,
+}
+QUEEN_PLACEMENT_BONUS = 500
+
+
+class MoveOrderer:
+    """Killer moves per ply and a history table, and the ordering which uses them"""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.killers: List[List[MoveCode]] = []
+        self.history = {}
+        self.jitter = random.Random(seed) if seed is not None else None
+
+    def new_search(self):
+        self.killers = []
+        self.history = {code: count // 2 for code, count in self.history.items() if count > 1}
+
+    def order(self, game: Game, moves: List[Union[Move, NoMove]], colour: Colour, ply: int = 0,
+              tt_move: Optional[Union[Move, NoMove]] = None,
+              threats: Collection[Move] = (), wins: Collection[Move] = ()) -> List[Union[Move, NoMove]]:
+        """The moves, most promising first"""
+        if len(moves) <= 1:
+            return list(moves)  # nothing to order (a pass is only ever the one move)
+
+        tt_code = pack_move(tt_move) if tt_move is not None else None
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        threat_codes = {pack_move(move) for move in threats}
+        win_codes = {pack_move(move) for move in wins}
+        history = self.history
+        jitter = self.jitter
+
+        grid = game.grid
+        opponent_queen = game.queens.get(opposite_colour(colour))
+        own_queen = game.queens.get(colour)
+        around_opponent = set(positions_around_location(opponent_queen)) if opponent_queen is not None else ()
+        around_own = set(positions_around_location(own_queen)) if own_queen is not None else ()
+
+        scored = []
+        for move in moves:
+            code = pack_move(move)
+            if code == tt_code:
+                score = TT_MOVE
+            elif code in win_codes:
+                score = WIN
+            elif code in threat_codes:
+                score = THREAT
+            elif code in killers:
+                score = KILLER >> killers.index(code)
+            else:
+                score = 0
+
+            piece = getattr(move, 'piece', None)
+            if piece is not None:
+                score += QUEEN_ADJACENCY * _adjacency_gain(grid, move, opponent_queen, around_opponent, around_own)
+                score += history.get(code, 0) * HISTORY_SCALE
+                if piece.name == pieces.QUEEN and move.current_location is None:
+                    score += QUEEN_PLACEMENT_BONUS
+                else:
+                    score += PIECE_BONUS.get(piece.name, 0)
+            if jitter is not None:
+                score += jitter.randrange(HISTORY_SCALE)
+            scored.append((score, move))
+
+        scored.sort(key=lambda item: -item[0])
+        return [move for _, move in scored]
+
+    def record_cutoff(self, move: Union[Move, NoMove], ply: int, depth: int):
+        """A move caused a beta cutoff at ply, with depth left to search"""
+        code = pack_move(move)
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if code in killers:
+            killers.remove(code)
+        killers.insert(0, code)
+        del killers[N_KILLERS:]
+
+        count = self.history.get(code, 0) + depth * depth
+        self.history[code] = count
+        if count >= HISTORY_LIMIT:
+            self.history = {other: other_count // 2 for other, other_count in self.history.items()}
+
+
+def _adjacency_gain(grid, move: Move, opponent_queen, around_opponent, around_own) -> int:
+    """Pieces the move adds around the opponent's queen, plus those it takes from around our own"""
+    # moving off a stack leaves the location occupied, so only the top piece of a stack of one vacates
+    vacated = None
+    if move.current_location is not None and len(grid[move.current_location]) == 1:
+        vacated = move.current_location
+    new_location = move.new_location
+
+    gain = 0
+    if new_location == opponent_queen:
+        gain += 1  # a beetle on top of the queen pins it
+    elif new_location in around_opponent and not grid.get(new_location):
+        gain += 1
+    if vacated in around_opponent:
+        gain -= 1
+
+    if vacated in around_own:
+        gain += 1
+    if new_location in around_own and not grid.get(new_location) and new_location != vacated:
+        gain -= 1
+    return gain
@@ -0,0 +1,56 @@
+import random
+from typing import Optional, Union
+
+from hive.game_engine.game_state import Colour, Game
+from hive.game_engine.moves import Move, NoMove
+from hive.play.opening_book import OpeningBook
+from hive.play.player import Player
+
+
+class OpeningBookAI(Player):
+    """Plays from an opening book while the position is in it, then asks the fallback player.
+
+    Only book moves played at least min_count times are used.  The most played is chosen, or with
+    weighted=True a random one in proportion to how often it was played.
+    """
+
+    def __init__(self, colour: Colour, book: OpeningBook, fallback: Optional[Player] = None,
+                 min_count: int = 3, weighted: bool = False):
+        super().__init__(colour)
+        if fallback is None:
+            from hive.play.agents.scored_moves_based_ai import ScoreMovesAI
+            fallback = ScoreMovesAI(colour)
+        self.book = book
+        self.fallback = fallback
+        self.min_count = min_count
+        self.weighted = weighted
+
+    def get_move(self, game: Game) -> Union[Move, NoMove]:
+        move = self.book_move(game)
+        if move is not None:
+            return move
+        return self.fallback.get_move(game)
+
+    def book_move(self, game: Game) -> Optional[Union[Move, NoMove]]:
+        """A move from the book for this position, or None if it isn't in the book"""
+        if sum(game.player_turns.values()) >= self.book.max_plies:
+            return None
+
+        candidates = [(move, stats) for move, stats in self.book.lookup(game)
+                      if stats.count >= self.min_count and self._playable(game, move)]
+        if not candidates:
+            return None
+        if self.weighted:
+            return random.choices(candidates, weights=[stats.count for _, stats in candidates])[0][0]
+        return candidates[0][0]
+
+    def _playable(self, game: Game, move: Union[Move, NoMove]) -> bool:
+        """The book is keyed by hash, so check the move fits the position before playing it"""
+        if move.colour != self.colour:
+            return False
+        if isinstance(move, NoMove):
+            return True
+        if move.current_location is None:
+            return move.piece in game.unplayed_pieces[move.piece.colour] and move.new_location not in game.grid
+        stack = game.grid.get(move.current_location, ())
+        return len(stack) == move.current_stack_idx + 1 and stack[-1] == move.piece
@@ -0,0 +1,184 @@
+"""
+Root-parallel search for MinimaxAI: the root moves shared out across a pool of processes.
+
+Each iteration of iterative deepening submits one task per root move.  A worker plays the move
+and searches the reply with its own MinimaxAI (so its own transposition table and move ordering,
+kept between tasks and moves).  Positions are sent as a PackedPosition (see packed_position.py)
+rather than a Game, which would pickle every earlier position through its parent chain.
+
+The best root score found so far by any worker is shared through shared memory, and each task
+searches with it as alpha - so once a good move is found, the others only need to be shown to be
+no better, as in a serial alpha-beta root.  The best move is the one with the highest score, ties
+going to the move first in the root order, whichever worker finishes first: the index of the
+best move so far is shared along with its score, and a move before it in the order searches
+with alpha one lower, so that a tie gets an exact score.
+
+    ai = MinimaxAI(WHITE, max_depth=4, processes=8)
+    move = ai.get_move(game)
+    ai.close()    # stop the pool
+"""
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from hive.game_engine.game_state import Game
+from hive.game_engine.move_codes import MoveCode, pack_move, unpack_move
+from hive.game_engine.moves import Move, NoMove
+from hive.game_engine.packed_position import PackedPosition, pack_position, unpack_position
+from hive.game_engine.queen_threats import find_queen_threats
+from hive.play.agents.minimax_ai import INFINITE_SCORE, WIN_THRESHOLD, MinimaxAI, SearchTimeout
+
+
+class RootResult(NamedTuple):
+    index: int  # of the move in the root order
+    score: Optional[int]  # None if the deadline passed before the move was searched
+    exact: bool  # False if the score is only an upper bound (the move was no better than alpha)
+    nodes: int
+
+
+_INDEX_BITS = 16
+_INDEX_MASK = (1 << _INDEX_BITS) - 1
+
+
+def _encode_best(score: int, index: int) -> int:
+    """(score, index) as one int which orders by score, then by lower index"""
+    return (score << _INDEX_BITS) | (_INDEX_MASK - index)
+
+
+def _decode_best(best: int) -> Tuple[int, int]:
+    return best >> _INDEX_BITS, _INDEX_MASK - (best & _INDEX_MASK)
+
+
+_NO_BEST = _encode_best(-INFINITE_SCORE, _INDEX_MASK)
+
+
+# Per worker process, set up by _init_worker
+_worker_ai: Optional[MinimaxAI] = None
+_shared_best = None
+_root: Tuple[Optional[PackedPosition], Optional[Game]] = (None, None)
+
+
+def _init_worker(settings: Dict, shared_best):
+    global _worker_ai, _shared_best
+    _worker_ai = MinimaxAI(**settings)
+    _shared_best = shared_best
+
+
+def _root_game(packed: PackedPosition) -> Game:
+    """The root position - unpacked once per root, when the worker's tables also start a new search"""
+    global _root
+    if _root[0] != packed:
+        _root = (packed, unpack_position(packed))
+        _worker_ai.transposition_table.new_search()
+        _worker_ai.move_orderer.new_search()
+    return _root[1]
+
+
+def _search_root_move(packed: PackedPosition, index: int, code: MoveCode, depth: int, deadline: float) -> RootResult:
+    """Worker task: the score of one root move, searched to depth (deadline is wall clock time)"""
+    seconds = deadline - time.time()
+    if seconds <= 0:
+        return RootResult(index, None, False, 0)
+
+    ai = _worker_ai
+    game = _root_game(packed)
+    ai._deadline = time.perf_counter() + seconds
+    ai.nodes_evaluated = 0
+    best_score, best_index = _decode_best(_shared_best.value)
+    alpha = max(best_score - 1 if index < best_index else best_score, -INFINITE_SCORE)
+    move = unpack_move(code)
+    try:
+        if alpha > -INFINITE_SCORE:
+            # as in a serial principal variation search, first show whether the move is any better
+            score = ai.search_root_move(game, move, depth, alpha, alpha + 1)
+            if score > alpha:
+                score = ai.search_root_move(game, move, depth, alpha, INFINITE_SCORE)
+        else:
+            score = ai.search_root_move(game, move, depth, alpha, INFINITE_SCORE)
+    except SearchTimeout:
+        return RootResult(index, None, False, ai.nodes_evaluated)
+
+    exact = score > alpha
+    if exact:
+        best = _encode_best(score, index)
+        with _shared_best.get_lock():
+            if best > _shared_best.value:
+                _shared_best.value = best
+    return RootResult(index, score, exact, ai.nodes_evaluated)
+
+
+def merge_results(results: List[RootResult]) -> Optional[RootResult]:
+    """The best move's result: the highest exact score, ties to the lowest index.  None if none are exact"""
+    exact = [result for result in results if result.exact]
+    if not exact:
+        return None
+    return max(exact, key=lambda result: (result.score, -result.index))
+
+
+class RootParallelSearch:
+    """A pool of worker processes, and the iterative deepening that shares root moves out to them"""
+
+    def __init__(self, ai: MinimaxAI, processes: int):
+        self.ai = ai
+        self.processes = processes
+        self._shared_best = multiprocessing.Value('q', _NO_BEST)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            settings = dict(colour=self.ai.colour, eval_function=self.ai.eval_function,
+                            tt_size_mb=self.ai.tt_size_mb, check_every=self.ai.check_every)
+            self._pool = ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                             initargs=(settings, self._shared_best))
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def search(self, game: Game, possible_moves: List[Union[Move, NoMove]],
+               depths: List[int]) -> Optional[Union[Move, NoMove]]:
+        """The best root move from the deepest search finished (or part finished) before the deadline"""
+        ai = self.ai
+        threats = find_queen_threats(game, ai.colour)
+        if threats.wins:
+            return threats.wins[0]
+
+        # the root order: the parent's move ordering, then each iteration's scores
+        ordered = ai.move_orderer.order(game, possible_moves, ai.colour, threats=threats.threats)
+        packed = pack_position(game)
+        deadline = time.time() + (ai._deadline - time.perf_counter())
+
+        best_move = None
+        for depth in depths:
+            self._shared_best.value = _NO_BEST
+            codes = [pack_move(move) for move in ordered]
+            futures = [self._executor().submit(_search_root_move, packed, index, code, depth, deadline)
+                       for index, code in enumerate(codes)]
+            results = [future.result() for future in futures]
+
+            nodes = sum(result.nodes for result in results)
+            ai.nodes_evaluated += nodes
+            ai.nodes_per_depth[depth] = nodes
+
+            completed = all(result.score is not None for result in results)
+            if not completed:
+                # a partial iteration only counts if the last best (searched first) was searched again
+                ai.search_aborted = True
+                if results[0].score is not None:
+                    best = merge_results(results)
+                    best_move = ordered[best.index] if best is not None else best_move
+                break
+
+            best = merge_results(results)
+            best_move = ordered[best.index]
+            ai.completed_depth = depth
+            if best.score >= WIN_THRESHOLD or time.time() > deadline:
+                break
+
+            # next iteration: best first, then by score (bounds by their bound), ties in the current order
+            rank = sorted(results, key=lambda result: (result.index != best.index, -result.score, result.index))
+            ordered = [ordered[result.index] for result in rank]
+        return best_move
@@ -0,0 +1,249 @@
+"""
+Proof-number search for forced wins.
+
+Late in a game the result is often decided by a forced sequence of queen surrounds.  Alpha-beta
+at a fixed depth either misses it or spends its whole time budget looking at every reply.
+Proof-number search only looks where a proof is closest: each node keeps
+    - proof: how many more leaves must be won to prove the attacker wins from here
+    - disproof: how many to show they can't
+and the search always expands the leaf on the path that is cheapest to settle.  It stops once
+the root is proven or disproven, or the node budget runs out:
+
+    result = prove_win(game, WHITE, max_nodes=20000, max_plies=5)
+    result.status    # PROVEN, DISPROVEN or UNKNOWN
+    result.move      # the first move of the win, if proven
+
+Wins are only looked for within max_plies, so DISPROVEN means no forced win within that many
+plies.  Both queens surrounded at once is a draw, so not a win.  The rules come from
+get_players_possible_moves_or_placements and get_winner, played on a Board (make / unmake)
+rather than building a Game per node, and wins one move away are spotted with
+find_winning_moves rather than by expanding every move.  Solved positions are memoised by their
+Zobrist hash, and a ProofNumberSearch keeps its memo between calls - up to max_memo positions,
+dropping the oldest first, so an agent kept for a whole game doesn't keep growing.
+
+ProofNumberAI plays a proven win when there is one, and leaves other positions to another player.
+"""
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+from hive.game_engine.board import Board
+from hive.game_engine.game_functions import has_player_lost, opposite_colour
+from hive.game_engine.game_state import Colour, Game
+from hive.game_engine.move_codes import pack_move
+from hive.game_engine.moves import Move, NoMove
+from hive.game_engine.player_functions import get_players_possible_moves_or_placements
+from hive.game_engine.queen_threats import empty_queen_neighbours, find_winning_moves
+from hive.play.player import Player
+
+INFINITY = 1 << 30
+DEFAULT_MAX_MEMO = 100000
+
+PROVEN = 'PROVEN'
+DISPROVEN = 'DISPROVEN'
+UNKNOWN = 'UNKNOWN'
+
+
+@dataclass
+class ProofResult:
+    status: str
+    move: Optional[Union[Move, NoMove]]
+    nodes: int
+    seconds: float
+
+
+class _Node:
+    __slots__ = ('move', 'parent', 'children', 'proof', 'disproof', 'is_or', 'plies_left')
+
+    def __init__(self, move, parent: Optional['_Node'], is_or: bool, plies_left: int):
+        self.move = move
+        self.parent = parent
+        self.children: Optional[List['_Node']] = None
+        self.proof = 1
+        self.disproof = 1
+        self.is_or = is_or  # attacker to move
+        self.plies_left = plies_left
+
+    def set_status(self, status: str):
+        if status == PROVEN:
+            self.proof, self.disproof = 0, INFINITY
+        else:
+            self.proof, self.disproof = INFINITY, 0
+
+    @property
+    def solved(self) -> bool:
+        return self.proof == 0 or self.disproof == 0
+
+
+class ProofNumberSearch:
+    """Proves or disproves forced wins, keeping solved positions between calls"""
+
+    def __init__(self, max_nodes: int = 10000, max_plies: int = 5, max_memo: int = DEFAULT_MAX_MEMO):
+        self.max_nodes = max_nodes
+        self.max_plies = max_plies
+        self.max_memo = max_memo
+        # position key (see _key) -> (status, plies left when solved, winning move if proven with the attacker to move)
+        self.memo: Dict[tuple, Tuple[str, int, Optional[Union[Move, NoMove]]]] = {}
+        self.nodes = 0
+
+    def prove_win(self, game: Union[Game, Board], colour: Colour) -> ProofResult:
+        """Does colour have a forced win from here, with colour to move"""
+        start = time.perf_counter()
+        self.nodes = 0
+        board = Board.from_game(game) if isinstance(game, Game) else game
+
+        root = _Node(None, None, is_or=True, plies_left=self.max_plies)
+        status = self._evaluate(board, colour, root.plies_left, True)
+        if status is not None:
+            root.set_status(status)
+
+        while not root.solved and self.nodes < self.max_nodes:
+            node = self._select(root, board)
+            self._expand(node, board, colour)
+            self._update(node, board, colour)
+
+        return ProofResult(status=self._root_status(root),
+                           move=self._best_move(root, board, colour),
+                           nodes=self.nodes,
+                           seconds=time.perf_counter() - start)
+
+    def _select(self, node: _Node, board: Board) -> _Node:
+        """The most proving leaf - its moves are left played on the board"""
+        while node.children is not None:
+            if node.is_or:
+                node = min(node.children, key=lambda child: child.proof)
+            else:
+                node = min(node.children, key=lambda child: child.disproof)
+            board.play(node.move)
+        return node
+
+    def _expand(self, node: _Node, board: Board, colour: Colour):
+        if node.plies_left == 0:
+            node.set_status(DISPROVEN)  # out of plies - no win found in time
+            return
+
+        # duplicates removed by move code - Move equality doesn't tell a piece's own move from the
+        # pillbug moving it to the same place, which leave different positions
+        moves = {pack_move(move): move
+                 for move in get_players_possible_moves_or_placements(board.current_turn, board)}.values()
+        node.children = []
+        for move in moves:
+            child = _Node(move, node, is_or=not node.is_or, plies_left=node.plies_left - 1)
+            board.play(move)
+            self.nodes += 1
+            status = self._evaluate(board, colour, child.plies_left, child.is_or)
+            board.undo()
+            if status is not None:
+                child.set_status(status)
+                if (node.is_or and status == PROVEN) or (not node.is_or and status == DISPROVEN):
+                    node.children = [child]  # settles this node - no need to look at the other moves
+                    break
+            node.children.append(child)
+
+    def _evaluate(self, board: Board, colour: Colour, plies_left: int, attacker_to_move: bool) -> Optional[str]:
+        """PROVEN or DISPROVEN if known without searching, otherwise None"""
+        opponent = opposite_colour(colour)
+        colour_lost, opponent_lost = has_player_lost(board, colour), has_player_lost(board, opponent)
+        if colour_lost or opponent_lost:
+            return PROVEN if opponent_lost and not colour_lost else DISPROVEN
+
+        known = self.memo.get(self._key(board, colour))
+        if known is not None:
+            status, solved_plies, _ = known
+            if (status == PROVEN and plies_left >= solved_plies) or (status == DISPROVEN and plies_left <= solved_plies):
+                return status
+
+        if plies_left == 0:
+            return None
+        if find_winning_moves(board, board.current_turn):
+            return PROVEN if attacker_to_move else DISPROVEN
+        if attacker_to_move and plies_left == 1:
+            return DISPROVEN  # the last move, and it doesn't win
+        return None
+
+    def _update(self, node: _Node, board: Board, colour: Colour):
+        """Recalculate proof and disproof numbers from node back up to the root, taking its moves back off the board"""
+        while True:
+            if node.children is not None:
+                children = node.children
+                if node.is_or:
+                    node.proof = min((child.proof for child in children), default=INFINITY)
+                    node.disproof = min(sum(child.disproof for child in children), INFINITY)
+                else:
+                    node.proof = min(sum(child.proof for child in children), INFINITY)
+                    node.disproof = min((child.disproof for child in children), default=INFINITY)
+
+            if node.solved:
+                # solved nodes aren't visited again, so only the winning move is worth keeping
+                winning = [child for child in node.children or [] if node.is_or and child.proof == 0][:1]
+                move = winning[0].move if winning else None
+                self._remember(self._key(board, colour), PROVEN if node.proof == 0 else DISPROVEN, node.plies_left, move)
+                if node.children is not None:
+                    node.children = winning
+
+            if node.parent is None:
+                return
+            board.undo()
+            node = node.parent
+
+    def _remember(self, key: tuple, status: str, plies_left: int, move: Optional[Union[Move, NoMove]]):
+        """Memoise a solved position, dropping the oldest once there are more than max_memo"""
+        self.memo.pop(key, None)
+        self.memo[key] = (status, plies_left, move)
+        while len(self.memo) > self.max_memo:
+            del self.memo[next(iter(self.memo))]
+
+    def _root_status(self, root: _Node) -> str:
+        if root.proof == 0:
+            return PROVEN
+        if root.disproof == 0:
+            return DISPROVEN
+        return UNKNOWN
+
+    def _best_move(self, root: _Node, board: Board, colour: Colour) -> Optional[Union[Move, NoMove]]:
+        if root.proof != 0:
+            return None
+        if root.children:
+            return root.children[0].move
+        known = self.memo.get(self._key(board, colour))
+        if known is not None and known[2] is not None:
+            return known[2]
+        wins = find_winning_moves(board, colour)
+        return wins[0] if wins else None
+
+    def _key(self, board: Board, colour: Colour) -> tuple:
+        """The attacker and the position (the hash includes the last move, which the pillbug rules depend on)"""
+        return colour, board.zobrist
+
+
+def prove_win(game: Union[Game, Board], colour: Colour, max_nodes: int = 10000, max_plies: int = 5) -> ProofResult:
+    return ProofNumberSearch(max_nodes=max_nodes, max_plies=max_plies).prove_win(game, colour)
+
+
+class ProofNumberAI(Player):
+    """Plays a forced win when one can be proven, otherwise asks the fallback player.
+
+    The solver only runs once the opponent's queen has at most max_empty_around_queen empty
+    neighbours - before that a forced win within a few plies is very unlikely.
+    """
+
+    def __init__(self, colour: Colour, fallback: Optional[Player] = None,
+                 max_nodes: int = 10000, max_plies: int = 5, max_empty_around_queen: int = 3,
+                 max_memo: int = DEFAULT_MAX_MEMO):
+        super().__init__(colour)
+        if fallback is None:
+            from hive.play.agents.scored_moves_based_ai import ScoreMovesAI
+            fallback = ScoreMovesAI(colour)
+        self.fallback = fallback
+        self.max_empty_around_queen = max_empty_around_queen
+        self.search = ProofNumberSearch(max_nodes=max_nodes, max_plies=max_plies, max_memo=max_memo)
+        self.last_result: Optional[ProofResult] = None
+
+    def get_move(self, game: Game) -> Union[Move, NoMove]:
+        self.last_result = None
+        queen_loc = game.queens.get(opposite_colour(self.colour))
+        if queen_loc is not None and len(empty_queen_neighbours(game.grid, queen_loc)) <= self.max_empty_around_queen:
+            self.last_result = self.search.prove_win(game, self.colour)
+            if self.last_result.status == PROVEN and self.last_result.move is not None:
+                return self.last_result.move
+        return self.fallback.get_move(game)
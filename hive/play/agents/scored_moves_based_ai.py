@@ -7,6 +7,7 @@ from hive.game_engine.game_state import Colour, Game
 from hive.game_engine.grid_functions import pieces_around_location
 from hive.game_engine.moves import Move, NoMove
 from hive.game_engine.player_functions import get_players_possible_moves_or_placements
+from hive.game_engine.queen_threats import find_winning_moves
 from hive.play.player import Player
 
 
@@ -109,6 +110,11 @@ class ScoreMovesAI(Player):
         self.scores = scores or MoveScores()
 
     def get_move(self, game) -> Union[Move|NoMove]:
+        # always take a win
+        wins = find_winning_moves(game, self.colour)
+        if wins:
+            return random.choice(wins)
+
         possible_moves = get_players_possible_moves_or_placements(self.colour, game)
         if len(possible_moves) == 0:
             return NoMove(self.colour)
@@ -0,0 +1,258 @@
+"""
+A transposition table in shared memory, for several processes searching at once (see lazy_smp.py).
+
+It works like TranspositionTable (same buckets, replacement, probe / store, bound flags, and mate
+scores stored counted from the position), but the slots live in a multiprocessing.shared_memory
+block which every process maps, so a result stored by one process is found by the others.  One
+process creates the table and the others attach to it by name:
+
+    table = SharedTranspositionTable(size_mb=64)
+    other = SharedTranspositionTable.attach(table.name, table.n_buckets)    # in a worker
+    ...
+    other.close()
+    table.close(); table.unlink()    # the creator frees the memory
+
+There are no locks.  Each slot is three 64-bit words - check, data (score, depth, flag, age) and
+move code - and check is written as key ^ data ^ move.  A slot half written by one process while
+another reads it fails the check and is treated as empty, so a torn entry is never used (the
+lockless hashing of Hyatt and Mann).  Two processes storing to a bucket at once can overwrite each
+other's entry, which only loses a result.
+
+    check  8 bytes  key ^ data ^ move
+    data   8 bytes  score + 2**31 (32 bits), depth (8), flag (3, with NO_MOVE_BIT), age (8), occupied
+    move   8 bytes  best move as a move code (see move_codes.py)
+
+The age of the current search (8 bytes) follows the last slot.  Only the creator's new_search()
+moves it on, so every process stores with the same age however many searches it has run - the
+creator starts each search before handing it to the others.
+"""
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional, Tuple, Union
+
+from hive.game_engine.move_codes import pack_move, unpack_move
+from hive.game_engine.moves import Move, NoMove
+from hive.play.agents.transposition_table import (BUCKET_SIZE, DEFAULT_SIZE_MB, EXACT, FLAG_MASK, LOWER_BOUND,
+                                                  MAX_DEPTH, NO_MOVE_BIT, UPPER_BOUND, TTEntry, TTStats,
+                                                  decode_score, encode_score, score_from_tt, score_to_tt)
+
+ENTRY_WORDS = 3
+ENTRY_BYTES = 8 * ENTRY_WORDS
+
+_SCORE_OFFSET = 1 << 31
+_SCORE_MASK = (1 << 32) - 1
+_DEPTH_SHIFT = 32
+_FLAG_SHIFT = 40
+_AGE_SHIFT = 43
+_OCCUPIED = 1 << 51
+_MASK_64 = (1 << 64) - 1
+
+
+def _pack_data(score: float, depth: int, flags: int, age: int) -> int:
+    return ((encode_score(score) + _SCORE_OFFSET)
+            | (depth << _DEPTH_SHIFT) | (flags << _FLAG_SHIFT) | (age << _AGE_SHIFT) | _OCCUPIED)
+
+
+def _data_score(data: int) -> float:
+    return decode_score((data & _SCORE_MASK) - _SCORE_OFFSET)
+
+
+def _data_depth(data: int) -> int:
+    return (data >> _DEPTH_SHIFT) & 0xFF
+
+
+def _data_flags(data: int) -> int:
+    return (data >> _FLAG_SHIFT) & 0b111
+
+
+def _data_age(data: int) -> int:
+    return (data >> _AGE_SHIFT) & 0xFF
+
+
+def _attach_untracked(name: str) -> SharedMemory:
+    """Attach to an existing block, leaving it to the creator to free"""
+    try:
+        return SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        # earlier versions register the block again, but with the resource tracker the creator's
+        # pool processes share - where it is already registered, and unregistered by unlink()
+        return SharedMemory(name=name)
+
+
+class SharedTranspositionTable:
+    """Search results by Zobrist key, in a fixed number of slots in shared memory"""
+
+    def __init__(self, size_mb: float = DEFAULT_SIZE_MB, max_entries: Optional[int] = None,
+                 _attach: Optional[Tuple[str, int]] = None):
+        """A new table sized to fit in size_mb megabytes, or to hold max_entries if given"""
+        if _attach is None:
+            if max_entries is None:
+                max_entries = int(size_mb * (1 << 20)) // ENTRY_BYTES
+            self.n_buckets = max(1, max_entries // BUCKET_SIZE)
+            self._shm = SharedMemory(create=True, size=self.n_buckets * BUCKET_SIZE * ENTRY_BYTES + 8)
+            self.owner = True
+        else:
+            name, self.n_buckets = _attach
+            self._shm = _attach_untracked(name)
+            self.owner = False
+        self._words = self._shm.buf[:self.nbytes].cast('Q')
+        self._age = self._shm.buf[self.nbytes:self.nbytes + 8].cast('Q')
+        if self.owner:
+            self.clear()
+            self._age[0] = 0
+        self.stats = TTStats()
+
+    @classmethod
+    def attach(cls, name: str, n_buckets: int) -> 'SharedTranspositionTable':
+        """The table another process created"""
+        return cls(_attach=(name, n_buckets))
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def capacity(self) -> int:
+        return self.n_buckets * BUCKET_SIZE
+
+    @property
+    def nbytes(self) -> int:
+        return self.capacity * ENTRY_BYTES
+
+    def __len__(self) -> int:
+        return sum(1 for slot in range(self.capacity) if self._read(slot) is not None)
+
+    @property
+    def age(self) -> int:
+        return self._age[0]
+
+    def new_search(self):
+        """
+        Start a new search (eg the next move) - entries from earlier searches are replaced first.
+        Does nothing in an attached process, which keeps the age of the creator's search.
+        """
+        if self.owner:
+            self._age[0] = (self._age[0] + 1) & 0xFF
+
+    def clear(self):
+        self._shm.buf[:self.nbytes] = bytes(self.nbytes)
+
+    def close(self):
+        """Unmap the table from this process"""
+        if self._words is not None:
+            self._words.release()
+            self._age.release()
+            self._words = None
+            self._age = None
+            self._shm.close()
+
+    def unlink(self):
+        """Free the shared memory - by the creator, once every process has closed it"""
+        if self.owner:
+            self._shm.unlink()
+
+    def _read(self, slot: int) -> Optional[Tuple[int, int, int]]:
+        """(key, data, move code) in a slot, or None if it is empty or part written"""
+        words = self._words
+        i = slot * ENTRY_WORDS
+        check, data, move = words[i], words[i + 1], words[i + 2]
+        if not data & _OCCUPIED:
+            return None
+        return check ^ data ^ move, data, move
+
+    def _find(self, key: int) -> Tuple[int, int, int]:
+        """(slot, data, move code) holding key, or (-1, 0, 0)"""
+        start = (key % self.n_buckets) * BUCKET_SIZE
+        for slot in range(start, start + BUCKET_SIZE):
+            entry = self._read(slot)
+            if entry is not None and entry[0] == key:
+                return slot, entry[1], entry[2]
+        return -1, 0, 0
+
+    @staticmethod
+    def _best_move(data: int, move: int) -> Optional[Union[Move, NoMove]]:
+        if _data_flags(data) & NO_MOVE_BIT:
+            return None
+        return unpack_move(move)
+
+    def get(self, key: int) -> Optional[TTEntry]:
+        slot, data, move = self._find(key)
+        if slot < 0:
+            return None
+        return TTEntry(key, _data_depth(data), _data_score(data), _data_flags(data) & FLAG_MASK,
+                       self._best_move(data, move), _data_age(data))
+
+    def probe(self, key: int, depth: int, alpha: float, beta: float,
+              ply: int = 0) -> Tuple[Optional[float], Optional[Union[Move, NoMove]]]:
+        """(score if it can be used at this depth and window, else None; the best move hint, if any)"""
+        self.stats.probes += 1
+        slot, data, move = self._find(key)
+        if slot < 0:
+            return None, None
+        self.stats.hits += 1
+
+        best_move = self._best_move(data, move)
+        if _data_depth(data) >= depth:
+            flag = _data_flags(data) & FLAG_MASK
+            score = score_from_tt(_data_score(data), ply)
+            if (flag == EXACT
+                    or (flag == LOWER_BOUND and score >= beta)
+                    or (flag == UPPER_BOUND and score <= alpha)):
+                self.stats.cutoffs += 1
+                return score, best_move
+        return None, best_move
+
+    def store(self, key: int, depth: int, score: float, flag: int = EXACT,
+              best_move: Optional[Union[Move, NoMove]] = None, ply: int = 0):
+        self.stats.stores += 1
+        depth = min(depth, MAX_DEPTH)
+        score = score_to_tt(score, ply)
+        age = self.age
+        start = (key % self.n_buckets) * BUCKET_SIZE
+
+        empty, victim, victim_worth = -1, -1, None
+        for slot in range(start, start + BUCKET_SIZE):
+            entry = self._read(slot)
+            if entry is None:
+                if empty < 0:
+                    empty = slot
+                continue
+            entry_key, data, move = entry
+            if entry_key == key:
+                # same position - keep a deeper result from this search over a shallower bound
+                if _data_age(data) == age and _data_depth(data) > depth and flag != EXACT:
+                    if best_move is not None and _data_flags(data) & NO_MOVE_BIT:
+                        flags = _data_flags(data) & FLAG_MASK
+                        self._write(slot, key, _pack_data(_data_score(data), _data_depth(data), flags,
+                                                          _data_age(data)), pack_move(best_move))
+                    return
+                if best_move is None and not _data_flags(data) & NO_MOVE_BIT:
+                    best_move = unpack_move(move)
+                self._store_at(slot, key, depth, score, flag, best_move)
+                return
+            if entry_key % self.n_buckets != key % self.n_buckets:
+                # a torn entry which reads as another bucket's key - as good as empty
+                if empty < 0:
+                    empty = slot
+                continue
+            worth = (_data_age(data) == age, _data_depth(data))
+            if victim < 0 or worth < victim_worth:
+                victim, victim_worth = slot, worth
+
+        if empty < 0:
+            self.stats.replacements += 1
+            empty = victim
+        self._store_at(empty, key, depth, score, flag, best_move)
+
+    def _store_at(self, slot: int, key: int, depth: int, score: float, flag: int,
+                  best_move: Optional[Union[Move, NoMove]]):
+        if best_move is None:
+            self._write(slot, key, _pack_data(score, depth, flag | NO_MOVE_BIT, self.age), 0)
+        else:
+            self._write(slot, key, _pack_data(score, depth, flag, self.age), pack_move(best_move))
+
+    def _write(self, slot: int, key: int, data: int, move: int):
+        words = self._words
+        i = slot * ENTRY_WORDS
+        words[i + 1] = data
+        words[i + 2] = move
+        words[i] = (key ^ data ^ move) & _MASK_64
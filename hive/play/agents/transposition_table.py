@@ -0,0 +1,247 @@
+"""
+A bounded transposition table for alpha-beta search.
+
+Each entry records what a search of a position found: the score, the depth searched, whether
+the score is exact or only a bound (an alpha-beta search that cuts off only learns the score is
+at least / at most something), and the best move found, which is worth trying first next time
+even when the score can't be reused.
+
+The table has a fixed number of slots, grouped into buckets of BUCKET_SIZE.  A position can
+only go in its own bucket (key modulo the number of buckets), so when a bucket is full an entry
+must be replaced: entries from earlier searches (older age) go first, then the shallowest.
+Entries are kept between the iterations of iterative deepening and between moves - call
+new_search() at the start of each move so old entries age out rather than being cleared.
+
+Entries are held in preallocated arrays, one per field, rather than as objects in a dict -
+ENTRY_BYTES per entry (key, packed move, score, depth, flag, age), sized up front from a
+memory budget and never resized, so there is nothing for the garbage collector to track:
+
+    key      8 bytes  Zobrist hash of the position
+    move     8 bytes  best move as a move code (see move_codes.py)
+    score    4 bytes  int32, +-inf stored as +-SCORE_LIMIT
+    depth    1 byte
+    flag     1 byte   EXACT, LOWER_BOUND, UPPER_BOUND or EMPTY (with NO_MOVE_BIT if no best move)
+    age      1 byte   search the entry was stored in, mod 256
+
+Scores are from the root's point of view, except that a win or loss (MATE_SCORE less the plies to
+reach it) is counted from the root, and the table is kept between moves - so the same position
+can be reached at a different ply, or from a different root.  Pass the ply from the root to probe
+and store: mate scores are stored counted from the position itself and converted back on probe.
+"""
+from array import array
+from dataclasses import dataclass
+from typing import NamedTuple, Optional, Tuple, Union
+
+from hive.game_engine.move_codes import pack_move, unpack_move
+from hive.game_engine.moves import Move, NoMove
+
+EXACT = 0
+LOWER_BOUND = 1  # the true score is at least this (the search failed high, score >= beta)
+UPPER_BOUND = 2  # the true score is at most this (the search failed low, score <= alpha)
+EMPTY = 3
+FLAG_MASK = 0b11
+NO_MOVE_BIT = 0b100
+
+BUCKET_SIZE = 4
+ENTRY_BYTES = 8 + 8 + 4 + 1 + 1 + 1
+DEFAULT_SIZE_MB = 64
+
+SCORE_LIMIT = (1 << 31) - 1
+MAX_DEPTH = 255
+
+# Scores are ints, so a null window (alpha, alpha + 1) can't contain a score.  A win scores
+# MATE_SCORE less the plies taken to reach it, so quicker wins (and slower losses) are preferred,
+# and any evaluation is well inside +-WIN_THRESHOLD.
+MATE_SCORE = 1_000_000
+WIN_THRESHOLD = MATE_SCORE - 1000
+INFINITE_SCORE = MATE_SCORE + 1
+
+
+def bound_type(score: float, alpha: float, beta: float) -> int:
+    """The bound a score is, given the window (alpha, beta) it was searched with"""
+    if score <= alpha:
+        return UPPER_BOUND
+    if score >= beta:
+        return LOWER_BOUND
+    return EXACT
+
+
+def entries_for_size(size_mb: float) -> int:
+    """Number of entries that fit in size_mb megabytes"""
+    return int(size_mb * (1 << 20)) // ENTRY_BYTES
+
+
+def score_to_tt(score: float, ply: int) -> float:
+    """A score found ply plies from the root, as stored - a win or loss counted from the position"""
+    if WIN_THRESHOLD <= score <= MATE_SCORE:
+        return score + ply
+    if -MATE_SCORE <= score <= -WIN_THRESHOLD:
+        return score - ply
+    return score
+
+
+def score_from_tt(score: float, ply: int) -> float:
+    """A stored score, as found ply plies from the root"""
+    if WIN_THRESHOLD <= score <= MATE_SCORE:
+        return score - ply
+    if -MATE_SCORE <= score <= -WIN_THRESHOLD:
+        return score + ply
+    return score
+
+
+def encode_score(score: float) -> int:
+    if score >= SCORE_LIMIT:
+        return SCORE_LIMIT
+    if score <= -SCORE_LIMIT:
+        return -SCORE_LIMIT
+    return int(score)
+
+
+def decode_score(score: int) -> float:
+    if score == SCORE_LIMIT:
+        return float('inf')
+    if score == -SCORE_LIMIT:
+        return float('-inf')
+    return score
+
+
+class TTEntry(NamedTuple):
+    """One entry, read out of the table"""
+    key: int
+    depth: int
+    score: float  # as stored - a win or loss counted from the position
+    flag: int
+    best_move: Optional[Union[Move, NoMove]]
+    age: int
+
+
+@dataclass
+class TTStats:
+    probes: int = 0
+    hits: int = 0  # probes which found the position
+    cutoffs: int = 0  # probes whose score could be used
+    stores: int = 0
+    replacements: int = 0  # another position's entry overwritten
+
+
+class TranspositionTable:
+    """Search results by Zobrist key, in a fixed number of slots"""
+
+    def __init__(self, size_mb: float = DEFAULT_SIZE_MB, max_entries: Optional[int] = None):
+        """Sized to fit in size_mb megabytes, or to hold max_entries if given"""
+        if max_entries is None:
+            max_entries = entries_for_size(size_mb)
+        self.n_buckets = max(1, max_entries // BUCKET_SIZE)
+        capacity = self.n_buckets * BUCKET_SIZE
+        self.keys = array('Q', bytes(8 * capacity))
+        self.moves = array('Q', bytes(8 * capacity))
+        self.scores = array('i', bytes(4 * capacity))
+        self.depths = array('B', bytes(capacity))
+        self.flags = array('B', [EMPTY]) * capacity
+        self.ages = array('B', bytes(capacity))
+        self.age = 0
+        self.stats = TTStats()
+
+    def __len__(self) -> int:
+        return self.capacity - self.flags.count(EMPTY)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.keys)
+
+    @property
+    def nbytes(self) -> int:
+        return self.capacity * ENTRY_BYTES
+
+    def new_search(self):
+        """Start a new search (eg the next move) - entries from earlier searches are replaced first"""
+        self.age = (self.age + 1) & 0xFF
+
+    def clear(self):
+        self.flags = array('B', [EMPTY]) * self.capacity
+
+    def _find(self, key: int) -> int:
+        """The slot holding key, or -1"""
+        start = (key % self.n_buckets) * BUCKET_SIZE
+        keys, flags = self.keys, self.flags
+        for slot in range(start, start + BUCKET_SIZE):
+            if keys[slot] == key and flags[slot] != EMPTY:
+                return slot
+        return -1
+
+    def _best_move(self, slot: int) -> Optional[Union[Move, NoMove]]:
+        if self.flags[slot] & NO_MOVE_BIT:
+            return None
+        return unpack_move(self.moves[slot])
+
+    def get(self, key: int) -> Optional[TTEntry]:
+        slot = self._find(key)
+        if slot < 0:
+            return None
+        return TTEntry(key, self.depths[slot], decode_score(self.scores[slot]), self.flags[slot] & FLAG_MASK,
+                       self._best_move(slot), self.ages[slot])
+
+    def probe(self, key: int, depth: int, alpha: float, beta: float,
+              ply: int = 0) -> Tuple[Optional[float], Optional[Union[Move, NoMove]]]:
+        """(score if it can be used at this depth and window, else None; the best move hint, if any)"""
+        self.stats.probes += 1
+        slot = self._find(key)
+        if slot < 0:
+            return None, None
+        self.stats.hits += 1
+
+        if self.depths[slot] >= depth:
+            flag = self.flags[slot] & FLAG_MASK
+            score = score_from_tt(decode_score(self.scores[slot]), ply)
+            if (flag == EXACT
+                    or (flag == LOWER_BOUND and score >= beta)
+                    or (flag == UPPER_BOUND and score <= alpha)):
+                self.stats.cutoffs += 1
+                return score, self._best_move(slot)
+        return None, self._best_move(slot)
+
+    def store(self, key: int, depth: int, score: float, flag: int = EXACT,
+              best_move: Optional[Union[Move, NoMove]] = None, ply: int = 0):
+        self.stats.stores += 1
+        depth = min(depth, MAX_DEPTH)
+        score = score_to_tt(score, ply)
+        start = (key % self.n_buckets) * BUCKET_SIZE
+        keys, flags, ages, depths = self.keys, self.flags, self.ages, self.depths
+
+        empty, victim, victim_worth = -1, -1, None
+        for slot in range(start, start + BUCKET_SIZE):
+            if flags[slot] == EMPTY:
+                if empty < 0:
+                    empty = slot
+                continue
+            if keys[slot] == key:
+                # same position - keep a deeper result from this search over a shallower bound
+                if ages[slot] == self.age and depths[slot] > depth and flag != EXACT:
+                    if best_move is not None and flags[slot] & NO_MOVE_BIT:
+                        self.moves[slot] = pack_move(best_move)
+                        flags[slot] &= FLAG_MASK
+                    return
+                if best_move is None and not flags[slot] & NO_MOVE_BIT:
+                    best_move = self._best_move(slot)
+                self._write(slot, key, depth, score, flag, best_move)
+                return
+            worth = (ages[slot] == self.age, depths[slot])
+            if victim < 0 or worth < victim_worth:
+                victim, victim_worth = slot, worth
+
+        if empty < 0:
+            self.stats.replacements += 1
+            empty = victim
+        self._write(empty, key, depth, score, flag, best_move)
+
+    def _write(self, slot: int, key: int, depth: int, score: float, flag: int,
+               best_move: Optional[Union[Move, NoMove]]):
+        self.keys[slot] = key
+        self.scores[slot] = encode_score(score)
+        self.depths[slot] = depth
+        self.ages[slot] = self.age
+        if best_move is None:
+            self.flags[slot] = flag | NO_MOVE_BIT
+        else:
+            self.moves[slot] = pack_move(best_move)
+            self.flags[slot] = flag
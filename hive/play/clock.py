@@ -0,0 +1,38 @@
+"""
+A player's game clock, and how much of it to spend on each move.
+
+Under a time control each player has remaining seconds for the rest of the game, plus an
+increment added after each of their moves.  A move's budget is an even share of the remaining
+time over the moves the game is still expected to last, plus the increment, and never more than
+the clock holds less a reserve for the overhead outside the search:
+
+    clock = GameClock(remaining=300, increment=2)
+    budget = clock.allocate(game, WHITE)
+    ...
+    clock.charge(elapsed)    # remaining -= elapsed, then += increment
+"""
+from dataclasses import dataclass
+
+from hive.game_engine.game_state import Colour, Game
+
+EXPECTED_MOVES = 30  # moves per player in a typical game
+MIN_MOVES_LEFT = 10  # past the expected length, still plan for this many more
+MIN_BUDGET = 0.01
+
+
+@dataclass
+class GameClock:
+    remaining: float
+    increment: float = 0.0
+    reserve: float = 0.05  # seconds kept back from each move's budget
+    expected_moves: int = EXPECTED_MOVES
+
+    def allocate(self, game: Game, colour: Colour) -> float:
+        """Seconds to spend on colour's next move"""
+        moves_left = max(MIN_MOVES_LEFT, self.expected_moves - game.player_turns[colour])
+        budget = self.remaining / moves_left + self.increment
+        return max(MIN_BUDGET, min(budget, self.remaining - self.reserve))
+
+    def charge(self, elapsed: float):
+        """A move took elapsed seconds"""
+        self.remaining += self.increment - elapsed
@@ -0,0 +1,184 @@
+"""
+An opening book built from the expert games in game_strings/.
+
+On the first few moves every agent searches from scratch, just when placements make the
+branching factor largest - but thousands of expert games have already played those positions.
+The book records, for every position in the first max_plies of each game, which moves were
+played, how often, and how the game ended for the player making the move.
+
+Positions are keyed by their canonical key (see canonical.py) so openings played shifted,
+rotated or mirrored all count towards the same entry, and moves are stored in the canonical
+frame as move codes (see move_codes.py).
+
+    python -m hive.play.opening_book --max-plies 8 --out opening_book.bin
+
+    book = OpeningBook.load("opening_book.bin")
+    for move, stats in book.lookup(game): ...
+
+The file is a header and five columns sorted by position key - key, move code, count, wins,
+draws - read straight into arrays.  A lookup is a binary search over the keys.
+"""
+import argparse
+import glob
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from hive.game_engine.canonical import canonical_position, transform_move, untransform_move
+from hive.game_engine.game_state import BLACK, WHITE, Game
+from hive.game_engine.history import iter_history
+from hive.game_engine.move_codes import MoveCode, pack_move, unpack_move
+from hive.game_engine.moves import Move, NoMove
+from hive.trajectory.boardspace import replay_trajectory
+from hive.trajectory.game_string import GameString, load_replay_game_strings
+
+GAME_STRINGS_DIR = os.path.join(Path(__file__).parents[2], "game_strings")
+DEFAULT_MAX_PLIES = 8
+
+_MAGIC = b"HVOB"
+_VERSION = 2  # 2: position keys include the piece moved last turn
+_HEADER = struct.Struct("<4sIII")  # magic, version, max plies, number of entries
+
+RESULT_WINNER = {"WhiteWins": WHITE, "BlackWins": BLACK, "Draw": None}
+
+
+class BookMove(NamedTuple):
+    code: MoveCode  # in the canonical frame
+    count: int
+    wins: int  # for the player making the move
+    draws: int
+
+    @property
+    def score(self) -> float:
+        """Average result for the player making the move (win 1, draw 0.5, loss 0)"""
+        return (self.wins + 0.5 * self.draws) / self.count if self.count else 0.0
+
+
+class OpeningBook:
+    """Moves played from each canonical position, sorted by key for lookup"""
+
+    def __init__(self, keys: array, codes: array, counts: array, wins: array, draws: array, max_plies: int):
+        self.keys = keys
+        self.codes = codes
+        self.counts = counts
+        self.wins = wins
+        self.draws = draws
+        self.max_plies = max_plies
+
+    def __len__(self) -> int:
+        """Number of (position, move) entries"""
+        return len(self.keys)
+
+    @classmethod
+    def from_stats(cls, stats: Dict[Tuple[int, MoveCode], List[int]], max_plies: int) -> 'OpeningBook':
+        entries = sorted((key, code, count, wins, draws) for (key, code), (count, wins, draws) in stats.items())
+        columns = list(zip(*entries)) or [(), (), (), (), ()]
+        return cls(array('Q', columns[0]), array('Q', columns[1]),
+                   array('I', columns[2]), array('I', columns[3]), array('I', columns[4]), max_plies)
+
+    def book_moves(self, key: int) -> List[BookMove]:
+        """The moves recorded for a canonical position key, most played first"""
+        start, end = bisect_left(self.keys, key), bisect_right(self.keys, key)
+        moves = [BookMove(self.codes[i], self.counts[i], self.wins[i], self.draws[i]) for i in range(start, end)]
+        return sorted(moves, key=lambda book_move: -book_move.count)
+
+    def lookup(self, game: Game) -> List[Tuple[Union[Move, NoMove], BookMove]]:
+        """The moves recorded for this position, mapped onto the game's own locations"""
+        position = canonical_position(game)
+        return [(untransform_move(unpack_move(book_move.code), position.transform), book_move)
+                for book_move in self.book_moves(position.key)]
+
+    def save(self, filepath: str):
+        with open(filepath, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, self.max_plies, len(self)))
+            for column in (self.keys, self.codes, self.counts, self.wins, self.draws):
+                _to_little_endian(column).tofile(f)
+
+    @classmethod
+    def load(cls, filepath: str) -> 'OpeningBook':
+        with open(filepath, "rb") as f:
+            magic, version, max_plies, length = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"{filepath} is not a version {_VERSION} opening book")
+            columns = []
+            for typecode in ('Q', 'Q', 'I', 'I', 'I'):
+                column = array(typecode)
+                column.fromfile(f, length)
+                columns.append(_to_little_endian(column))
+        return cls(*columns, max_plies=max_plies)
+
+
+def _to_little_endian(column: array) -> array:
+    """The file is little endian - swap on big endian machines (swapping is its own inverse)"""
+    if sys.byteorder == "little":
+        return column
+    swapped = array(column.typecode, column)
+    swapped.byteswap()
+    return swapped
+
+
+def opening_positions(game_string: GameString, max_plies: int) -> Iterable[Tuple[Game, Union[Move, NoMove]]]:
+    """(position, move played from it) for the first max_plies of a game"""
+    final = replay_trajectory(game_string.moves[:max_plies])
+    games = list(iter_history(final))
+    for before, after in zip(reversed(games[1:]), reversed(games[:-1])):
+        yield before, after.move
+
+
+def add_game(stats: Dict[Tuple[int, MoveCode], List[int]], game_string: GameString, max_plies: int):
+    """Count the opening moves of one game into stats - (key, move code) -> [count, wins, draws]"""
+    winner = RESULT_WINNER.get(game_string.result.strip())
+    for game, move in opening_positions(game_string, max_plies):
+        position = canonical_position(game)
+        code = pack_move(transform_move(move, position.transform))
+        entry = stats[(position.key, code)]
+        entry[0] += 1
+        if winner is None:
+            entry[2] += 1
+        elif winner == game.current_turn:
+            entry[1] += 1
+
+
+def build_book(game_strings: Iterable[GameString], max_plies: int = DEFAULT_MAX_PLIES) -> OpeningBook:
+    stats = defaultdict(lambda: [0, 0, 0])
+    for game_string in game_strings:
+        try:
+            add_game(stats, game_string, max_plies)
+        except Exception as e:
+            print(f"Skipping game that failed to replay: {e}")
+    return OpeningBook.from_stats(stats, max_plies)
+
+
+def corpus_game_strings(directory: str = GAME_STRINGS_DIR,
+                        pattern: str = "BoardGameArena_Base+MLP+NoBots_*.txt") -> List[GameString]:
+    game_strings = []
+    for filepath in sorted(glob.glob(os.path.join(directory, pattern))):
+        game_strings += load_replay_game_strings(filepath)
+    return game_strings
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build an opening book from the replays in game_strings/")
+    parser.add_argument("--max-plies", type=int, default=DEFAULT_MAX_PLIES, help="plies from the start of each game")
+    parser.add_argument("--directory", default=GAME_STRINGS_DIR)
+    parser.add_argument("--out", default="opening_book.bin")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    game_strings = corpus_game_strings(args.directory)
+    book = build_book(game_strings, args.max_plies)
+    book.save(args.out)
+    positions = len(set(book.keys))
+    print(f"{len(game_strings)} games: {positions} positions, {len(book)} moves "
+          f"written to {args.out} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,140 @@
+"""
+Lightweight counters for the hot engine functions.
+
+cProfile over a whole self-play or training process is slow and hard to read.  Instead the
+functions that matter are decorated with @profiled, which counts calls and time spent, and the
+position cache counts hits against the same names.  When profiling is off the wrappers only
+check a flag, so they can stay in production code.
+
+Turn it on for a block of code - one game, one search - and get a report for just that block:
+
+    with profile() as p:
+        play(player_1, player_2)
+    print(p.report())
+
+or for a whole process with HIVE_PROFILE=1, reading the totals with report().
+
+Times are inclusive (a profiled function calling another profiled function counts the time in
+both), and include the cost of cache lookups.
+"""
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, Dict, Iterator, Optional
+
+
+@dataclass
+class Counter:
+    calls: int = 0
+    cache_hits: int = 0
+    seconds: float = 0.0
+
+    def __sub__(self, other: 'Counter') -> 'Counter':
+        return Counter(self.calls - other.calls, self.cache_hits - other.cache_hits, self.seconds - other.seconds)
+
+
+class _State:
+    enabled = os.environ.get("HIVE_PROFILE", "0") == "1"
+
+
+_state = _State()
+_counters: Dict[str, Counter] = {}
+
+
+def is_enabled() -> bool:
+    return _state.enabled
+
+
+def enable():
+    _state.enabled = True
+
+
+def disable():
+    _state.enabled = False
+
+
+def reset():
+    _counters.clear()
+
+
+def _counter(name: str) -> Counter:
+    counter = _counters.get(name)
+    if counter is None:
+        counter = _counters[name] = Counter()
+    return counter
+
+
+def profiled(func: Optional[Callable] = None, *, name: Optional[str] = None) -> Callable:
+    """Count calls and time for a function, under its name (or the name given)"""
+
+    def decorator(f: Callable) -> Callable:
+        counter_name = name or f.__name__
+
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return f(*args, **kwargs)
+            counter = _counter(counter_name)
+            counter.calls += 1
+            start = time.perf_counter()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                counter.seconds += time.perf_counter() - start
+
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def record_cache_hit(name: str):
+    """Called by the position cache - only when profiling is enabled"""
+    _counter(name).cache_hits += 1
+
+
+def snapshot() -> Dict[str, Counter]:
+    """A copy of the counters so far"""
+    return {name: Counter(c.calls, c.cache_hits, c.seconds) for name, c in _counters.items()}
+
+
+class Profile:
+    """The counters for one block of code (see profile)"""
+
+    def __init__(self):
+        self.counters: Dict[str, Counter] = {}
+
+    def report(self) -> str:
+        return format_report(self.counters)
+
+
+@contextmanager
+def profile() -> Iterator[Profile]:
+    """Profile a block of code.  Blocks can be nested - each gets its own counts"""
+    result = Profile()
+    before = snapshot()
+    was_enabled = _state.enabled
+    _state.enabled = True
+    try:
+        yield result
+    finally:
+        _state.enabled = was_enabled
+        result.counters = {name: counter - before.get(name, Counter()) for name, counter in snapshot().items()}
+        result.counters = {name: counter for name, counter in result.counters.items() if counter.calls or counter.cache_hits}
+
+
+def report() -> str:
+    """Report of everything counted in this process"""
+    return format_report(_counters)
+
+
+def format_report(counters: Dict[str, Counter]) -> str:
+    lines = [f"{'function':<30} {'calls':>10} {'cache hits':>10} {'hit rate':>8} {'total ms':>10} {'us/call':>8}"]
+    for name, c in sorted(counters.items(), key=lambda item: -item[1].seconds):
+        hit_rate = c.cache_hits / c.calls if c.calls else 0.0
+        per_call = c.seconds / c.calls * 1e6 if c.calls else 0.0
+        lines.append(f"{name:<30} {c.calls:>10} {c.cache_hits:>10} {hit_rate:>8.0%} {c.seconds * 1e3:>10.1f} {per_call:>8.1f}")
+    return "\n".join(lines)
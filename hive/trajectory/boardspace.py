@@ -31,7 +31,10 @@ import os
 from hive.game_engine.game_state import Game, Piece, Location, Colour, WHITE, BLACK
 from hive.game_engine import pieces
 from hive.game_engine.grid_functions import positions_around_location
+from hive.game_engine.game_functions import locate_piece
+from hive.game_engine.history import replace_last_move, with_checkpointed_history
 from hive.game_engine.moves import Move, NoMove
+from hive.game_engine.zobrist import set_current_turn
 
 
 # Mapping between internal color representation and BoardSpace notation
@@ -231,14 +234,11 @@ def find_piece_by_id(game: Game, piece_id: str) -> Optional[Tuple[Piece, Locatio
     else:
         piece_num = int(piece_id[2:])
     
-    for loc, stack in game.grid.items():
-        for piece in stack:
-            if (piece.colour == color and 
-                piece.name == piece_type and 
-                piece.number == piece_num):
-                return (piece, loc)
-    
-    return None
+    piece = Piece(colour=color, name=piece_type, number=piece_num)
+    found = locate_piece(game, piece)
+    if found is None:
+        return None
+    return (piece, found[0])
 
 
 def calculate_relative_direction(from_loc: Location, to_loc: Location) -> Tuple[int, int]:
@@ -523,13 +523,16 @@ def load_trajectory(filename: str) -> List[MoveString]:
     return moves
 
 
-def replay_trajectory(moves: List[MoveString], turn_info: Optional[str] = None) -> Game:
+def replay_trajectory(moves: List[MoveString], turn_info: Optional[str] = None,
+                      checkpoint_interval: Optional[int] = None) -> Game:
     """
     Replay a trajectory to get the final game state.
     
     Args:
         moves: The list of moves to replay
         turn_info: Optional turn information string (e.g., "Black[18]")
+        checkpoint_interval: If given, keep a checkpointed history (see history.py) rather than
+            the full chain of parent games
         
     Returns:
         Game: The final game state
@@ -538,6 +541,8 @@ def replay_trajectory(moves: List[MoveString], turn_info: Optional[str] = None)
     from hive.game_engine.moves import is_pillbug_move
     
     game = initial_game()
+    if checkpoint_interval is not None:
+        game = with_checkpointed_history(game, checkpoint_interval)
     
     # Track the current player's turn (WHITE starts in Hive)
     current_player = WHITE
@@ -592,7 +597,7 @@ def replay_trajectory(moves: List[MoveString], turn_info: Optional[str] = None)
                 pillbug_moved_other_piece=True
             )
             # Update the game's move
-            game = game.set("move", updated_move)
+            game = replace_last_move(game, updated_move)
         
         # Switch to the other player's turn
         current_player = BLACK if current_player == WHITE else WHITE
@@ -608,9 +613,9 @@ def replay_trajectory(moves: List[MoveString], turn_info: Optional[str] = None)
             
             # Set the current turn
             if turn_color == "White":
-                game = game.set("current_turn", WHITE)
+                game = set_current_turn(game, WHITE)
             elif turn_color == "Black":
-                game = game.set("current_turn", BLACK)
+                game = set_current_turn(game, BLACK)
     
     return game
 
@@ -15,7 +15,7 @@ class GameDataLoader:
     which is memory-efficient for large datasets. It always returns Game objects.
     """
     
-    def __init__(self, filepath: str, batch_size: int = 100):
+    def __init__(self, filepath: str, batch_size: int = 100, checkpoint_interval: Optional[int] = None):
         """
         Initialize the GameDataLoader.
         
@@ -23,9 +23,12 @@ class GameDataLoader:
             filepath: Path to the file containing game strings
             batch_size: Number of games to load in each batch
             create_index: Whether to create an index of file positions on initialization
+            checkpoint_interval: If given, games keep a checkpointed history rather than every
+                earlier state (see game_engine/history.py) - much less memory for large batches
         """
         self.filepath = filepath
         self.batch_size = batch_size
+        self.checkpoint_interval = checkpoint_interval
         self.line_positions = []
         
         self._create_index()
@@ -118,7 +121,7 @@ class GameDataLoader:
                     
                     try:
                         # Convert GameString to Game object
-                        game = replay_trajectory(game_string.moves, game_string.turn)
+                        game = replay_trajectory(game_string.moves, game_string.turn, self.checkpoint_interval)
                         if game is not None:
                             games.append(game)
                         else:
@@ -188,7 +191,7 @@ class GameDataLoader:
                 
                 try:
                     # Convert GameString to Game object
-                    game = replay_trajectory(game_string.moves, game_string.turn)
+                    game = replay_trajectory(game_string.moves, game_string.turn, self.checkpoint_interval)
                     if game is None:
                         print(f"Error at position {idx}: replay_trajectory returned None")
                         return None
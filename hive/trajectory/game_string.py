@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, Tuple
 
+from hive.game_engine.history import iter_history
 from hive.game_engine.player_functions import get_players_possible_moves_or_placements
 from hive.render.to_text import game_to_text
 from hive.trajectory.boardspace import MoveString, replay_trajectory
@@ -66,11 +67,7 @@ if __name__ == "__main__":
 
     game = replay_trajectory(game_string.moves, game_string.turn)
 
-    game_moves = []
-    game_moves.append(game)
-    while game.move is not None:
-        game = game.parent
-        game_moves.append(game)
+    game_moves = list(iter_history(game))
 
     game_moves.reverse()
 
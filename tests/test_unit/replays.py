@@ -0,0 +1,38 @@
+"""
+Games replayed from the recorded games in tests/data, shared by the unit tests.
+"""
+import os
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from hive.game_engine.game_state import Game
+from hive.trajectory.boardspace import replay_trajectory
+from hive.trajectory.game_string import GameString, load_replay_game_strings
+
+REPLAY_FILE = os.path.join(Path(__file__).parents[1], "data", "BoardGameArena_Base+MLP+NoBots_20240704_110945.txt")
+
+
+def replay_game_string(idx: int = 0) -> GameString:
+    return load_replay_game_strings(REPLAY_FILE, start_end_idx=(idx, idx + 1))[0]
+
+
+def replay_moves(idx: int = 0) -> list:
+    return replay_game_string(idx).moves
+
+
+def replayed_game(idx: int = 0, plies: Optional[int] = None) -> Game:
+    """The position after the first plies moves of a recorded game (all of them if None)"""
+    return replay_trajectory(replay_moves(idx)[:plies])
+
+
+def replayed_games(idx: int = 0) -> Iterator[Game]:
+    """Every position of a recorded game, last first"""
+    game = replayed_game(idx)
+    while game is not None:
+        yield game
+        game = game.parent
+
+
+def replayed_games_in_order(idx: int = 0) -> List[Game]:
+    """Every position of a recorded game, first to last"""
+    return list(reversed(list(replayed_games(idx))))
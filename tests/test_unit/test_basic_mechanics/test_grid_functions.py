@@ -1,8 +1,10 @@
 from hive.game_engine import pieces
 from hive.game_engine.game_functions import Game
-from hive.game_engine.grid_functions import get_placeable_locations, can_remove_piece, is_piece_connected_to_hive
+from hive.game_engine.grid_functions import get_placeable_locations, can_remove_piece, is_piece_connected_to_hive, get_pinned_locations, pieces_around_location
 from hive.render.to_text import game_to_text
 from hive.game_engine.game_state import WHITE, Piece, BLACK, create_immutable_grid
+from hive.trajectory.boardspace import replay_trajectory
+from tests.test_unit.replays import replay_game_string
 
 
 def test_can_identify_all_6_positions_around_a_single_white_piece():
@@ -74,6 +76,30 @@ def test_piece_is_connected_to_all_others():
     assert is_piece_connected_to_hive(grid, (0, 2)) == False
 
 
+def test_pinned_locations_on_a_ring_and_a_tail():
+    # a ring of 6 around (6, 2), with a tail sticking out of (8, 2)
+    grid = {(4, 2): (Piece(WHITE, pieces.ANT, 1),),
+            (5, 1): (Piece(WHITE, pieces.ANT, 2),),
+            (7, 1): (Piece(WHITE, pieces.ANT, 3),),
+            (8, 2): (Piece(BLACK, pieces.ANT, 1),),
+            (7, 3): (Piece(BLACK, pieces.ANT, 2),),
+            (5, 3): (Piece(BLACK, pieces.ANT, 3),),
+            (10, 2): (Piece(BLACK, pieces.SPIDER, 1),),
+            (12, 2): (Piece(BLACK, pieces.SPIDER, 2),)}
+    grid = create_immutable_grid(grid)
+
+    assert get_pinned_locations(grid) == {(8, 2), (10, 2)}
+
 
+def test_pinned_locations_match_connectivity_check():
+    game_string = replay_game_string()
+    game = replay_trajectory(game_string.moves, game_string.turn)
 
+    while game is not None:
+        grid = game.grid
+        for loc in grid.keys():
+            neighbours_connected = all(is_piece_connected_to_hive(grid, n, ignore_positions=[loc])
+                                       for n in pieces_around_location(grid, loc))
+            assert can_remove_piece(grid, loc) == (len(grid) <= 2 or neighbours_connected)
+        game = game.parent
 
@@ -0,0 +1,43 @@
+from hive.game_engine.board import Board
+from hive.game_engine.game_state import initial_game
+from hive.game_engine.player_functions import get_players_possible_moves_or_placements
+from hive.game_engine.zobrist import hash_game
+from tests.test_unit.replays import replayed_games_in_order
+
+
+def test_round_trip_empty_game():
+    game = initial_game()
+    assert Board.from_game(game).to_game() == game
+
+
+def test_play_matches_game_states():
+    games = replayed_games_in_order()
+    board = Board.from_game(games[0])
+
+    for game in games[1:]:
+        board.play(game.move)
+        assert board.to_game(parent=game.parent) == game
+        assert board.zobrist == game.zobrist == hash_game(game)
+
+
+def test_undo_restores_every_earlier_state():
+    games = replayed_games_in_order()
+    board = Board.from_game(games[0])
+    for game in games[1:]:
+        board.play(game.move)
+
+    for game in reversed(games[:-1]):
+        board.undo()
+        assert board.to_game(parent=game.parent) == game
+    assert board.ply == 0
+
+
+def test_move_generation_on_board_matches_game():
+    games = replayed_games_in_order()
+    board = Board.from_game(games[0])
+
+    for game in games[1:]:
+        board.play(game.move)
+        board_moves = get_players_possible_moves_or_placements(board.current_turn, board)
+        game_moves = get_players_possible_moves_or_placements(game.current_turn, game)
+        assert sorted(map(repr, board_moves)) == sorted(map(repr, game_moves))
@@ -0,0 +1,68 @@
+from hive.game_engine.canonical import (SYMMETRIES, Transform, canonical_key, canonical_position, inverse_location,
+                                        transform_grid, transform_location, transform_move, untransform_move)
+from hive.game_engine.game_state import BLACK, WHITE, initial_game
+from hive.game_engine.grid_functions import positions_around_location
+from hive.game_engine.player_functions import get_players_possible_moves_or_placements
+from tests.test_unit.replays import replayed_game
+
+
+def _transforms():
+    return [Transform(rotation, reflected, offset)
+            for rotation, reflected in SYMMETRIES
+            for offset in [(0, 0), (2, 0), (-3, 5)]]
+
+
+def test_transforms_keep_neighbours_adjacent():
+    for transform in _transforms():
+        centre = transform_location((0, 0), transform)
+        around = {transform_location(loc, transform) for loc in positions_around_location((0, 0))}
+        assert around == set(positions_around_location(centre))
+
+
+def test_inverse_location():
+    for transform in _transforms():
+        for loc in [(0, 0), (3, 1), (-4, 2), (7, -3)]:
+            assert inverse_location(transform_location(loc, transform), transform) == loc
+
+
+def test_twelve_distinct_symmetries():
+    images = {transform_location((5, 1), Transform(rotation, reflected, (0, 0))) for rotation, reflected in SYMMETRIES}
+    assert len(images) == 12
+
+
+def test_equivalent_positions_share_a_key():
+    game = replayed_game(0, 20)
+    key = canonical_key(game)
+    for transform in _transforms():
+        moved = initial_game(transform_grid(game.grid, transform), current_turn=game.current_turn)
+        moved = moved.set(piece_moved_last_turn=game.piece_moved_last_turn,
+                          move=transform_move(game.move, transform))
+        assert canonical_key(moved) == key
+
+
+def test_key_depends_on_position_and_side_to_move():
+    game = replayed_game(0, 20)
+    assert canonical_key(game) != canonical_key(replayed_game(0, 21))
+    other_turn = initial_game(game.grid, current_turn=BLACK if game.current_turn == WHITE else WHITE)
+    assert canonical_key(game) != canonical_key(other_turn)
+    assert game.piece_moved_last_turn is not None
+    assert canonical_key(game) != canonical_key(initial_game(game.grid, current_turn=game.current_turn))
+    assert canonical_key(initial_game()) == canonical_key(initial_game()) == 0
+
+
+def test_moves_map_between_equivalent_positions():
+    game = initial_game(replayed_game(1, 16).grid)
+    position = canonical_position(game)
+    moves = get_players_possible_moves_or_placements(WHITE, game)
+
+    for transform in _transforms()[::4]:
+        moved = initial_game(transform_grid(game.grid, transform))
+        moved_position = canonical_position(moved)
+        assert moved_position.key == position.key
+
+        # the same moves, through the canonical frame
+        moved_moves = get_players_possible_moves_or_placements(WHITE, moved)
+        via_canonical = [untransform_move(transform_move(move, position.transform), moved_position.transform)
+                         for move in moves]
+        assert set(via_canonical) == set(moved_moves)
+        assert all(untransform_move(transform_move(move, transform), transform) == move for move in moves)
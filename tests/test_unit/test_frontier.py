@@ -0,0 +1,27 @@
+from hive.game_engine import pieces
+from hive.game_engine.frontier import compute_frontier, placeable_locations
+from hive.game_engine.game_functions import place_piece
+from hive.game_engine.game_state import BLACK, WHITE, Game, Piece
+from hive.game_engine.grid_functions import get_placeable_locations
+from tests.test_unit.replays import replayed_games
+
+
+def test_frontier_from_empty_game():
+    game = Game()
+    assert placeable_locations(game, WHITE) == [(0, 0)]
+
+    game = place_piece(game, Piece(WHITE, pieces.QUEEN, 1), (0, 0))
+    assert len(placeable_locations(game, BLACK)) == 6
+
+    game = place_piece(game, Piece(BLACK, pieces.QUEEN, 1), (2, 0))
+    assert len(placeable_locations(game, WHITE)) == 3
+    assert len(placeable_locations(game, BLACK)) == 3
+
+
+def test_incremental_frontier_matches_full_recompute():
+    for idx in range(3):
+        for game in replayed_games(idx):
+            assert game.frontier == compute_frontier(game.grid)
+            for colour in [WHITE, BLACK]:
+                assert set(placeable_locations(game, colour)) == set(get_placeable_locations(game.grid, colour))
+            game = game.parent
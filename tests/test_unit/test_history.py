@@ -0,0 +1,71 @@
+import pickle
+
+import pytest
+
+from hive.game_engine import pieces
+from hive.game_engine.game_functions import place_piece
+from hive.game_engine.game_state import BLACK, WHITE, Piece, initial_game
+from hive.game_engine.history import (NO_HISTORY, game_at_ply, history_length, iter_history, previous_game,
+                                      with_checkpointed_history, without_history)
+from hive.trajectory.boardspace import replay_trajectory
+from tests.test_unit.replays import replay_moves
+
+
+def _position(game):
+    """Everything but the history itself"""
+    return game.set(parent=None, history=None)
+
+
+@pytest.mark.parametrize("interval", [1, 5, 16])
+def test_checkpointed_history_rebuilds_every_position(interval):
+    full = list(iter_history(replay_trajectory(replay_moves())))
+    checkpointed_game = replay_trajectory(replay_moves(), checkpoint_interval=interval)
+
+    assert checkpointed_game.parent is None
+    assert history_length(checkpointed_game) == len(full) - 1
+
+    checkpointed = list(iter_history(checkpointed_game))
+    assert [_position(g) for g in checkpointed] == [_position(g) for g in full]
+
+    for ply, game in enumerate(reversed(full)):
+        assert _position(game_at_ply(checkpointed_game, ply)) == _position(game)
+
+
+def test_previous_game_in_every_mode():
+    full_game = replay_trajectory(replay_moves())
+    checkpointed_game = replay_trajectory(replay_moves(), checkpoint_interval=4)
+
+    assert _position(previous_game(checkpointed_game)) == _position(full_game.parent)
+    assert previous_game(full_game) is full_game.parent
+
+    # a rebuilt position keeps its own history
+    earlier = previous_game(previous_game(checkpointed_game))
+    assert _position(previous_game(earlier)) == _position(full_game.parent.parent.parent)
+
+
+def test_no_history():
+    game = without_history(initial_game())
+    game = place_piece(game, Piece(WHITE, pieces.QUEEN, 1), (0, 0))
+    game = place_piece(game, Piece(BLACK, pieces.QUEEN, 1), (2, 0))
+
+    assert game.history is NO_HISTORY
+    assert game.parent is None
+    assert previous_game(game) is None
+    assert history_length(game) == 0
+    assert list(iter_history(game)) == [game]
+
+
+def test_no_history_survives_pickling():
+    game = pickle.loads(pickle.dumps(without_history(initial_game())))
+    assert game.history is NO_HISTORY
+    assert history_length(game) == 0
+
+    game = place_piece(game, Piece(WHITE, pieces.QUEEN, 1), (0, 0))
+    assert game.history is NO_HISTORY
+    assert previous_game(game) is None
+
+
+def test_out_of_range_ply():
+    game = replay_trajectory(replay_moves(), checkpoint_interval=8)
+    with pytest.raises(IndexError):
+        game_at_ply(game, history_length(game) + 1)
@@ -0,0 +1,144 @@
+from hive.game_engine.game_functions import has_player_lost, opposite_colour
+from hive.game_engine.history import history_length
+from hive.game_engine.player_functions import get_players_possible_moves_or_placements
+from hive.play.agents import minimax_ai
+from hive.play.agents.minimax_ai import INFINITE_SCORE, MATE_SCORE, MinimaxAI
+from hive.play.clock import GameClock
+from tests.test_unit.replays import replayed_game
+
+
+def _plain_negamax(ai, game, depth, colour, ply=0):
+    """Every move searched with no pruning"""
+    lost, won = has_player_lost(game, colour), has_player_lost(game, opposite_colour(colour))
+    if lost or won:
+        return 0 if lost and won else (MATE_SCORE - ply if won else -(MATE_SCORE - ply))
+    if depth == 0:
+        return ai._evaluate_position(game, colour)
+    return max(-_plain_negamax(ai, move.play(game), depth - 1, opposite_colour(colour), ply + 1)
+               for move in get_players_possible_moves_or_placements(colour, game))
+
+
+def test_scores_match_plain_negamax():
+    for idx, plies in [(0, 7), (2, 8)]:
+        game = replayed_game(idx, plies)
+        colour = game.current_turn
+        moves = get_players_possible_moves_or_placements(colour, game)
+        expected = _plain_negamax(MinimaxAI(colour), game, 2, colour)
+
+        ai = MinimaxAI(colour, tt_size_mb=1)
+        move, score = ai._find_best_move(game, moves, 2)
+        assert score == expected
+        assert -_plain_negamax(ai, move.play(game), 1, opposite_colour(colour), 1) == expected
+
+        # an aspiration window that misses the score is widened until it doesn't
+        for previous in (expected - 50, expected + 50):
+            ai = MinimaxAI(colour, tt_size_mb=1, aspiration_window=5)
+            assert ai._iterative_deepening_search(game, moves, 2, previous)[1] == expected
+            assert ai.researches > 0
+
+
+def test_nodes_reported_per_depth():
+    game = replayed_game(0, 12)
+    ai = MinimaxAI(game.current_turn, max_depth=3, time_limit=60, tt_size_mb=1)
+    ai.get_move(game)
+    assert sorted(ai.nodes_per_depth) == [1, 2, 3]
+    assert sum(ai.nodes_per_depth.values()) == ai.nodes_evaluated
+    assert ai.nodes_per_depth[3] > ai.nodes_per_depth[1]
+
+
+def test_prefers_the_quickest_win():
+    checked = 0
+    for game in [replayed_game(idx, None) for idx in range(2)]:
+        loser = game.current_turn
+        before = game.parent
+        winner = before.current_turn
+        if not has_player_lost(game, loser):
+            continue
+        ai = MinimaxAI(winner, max_depth=3, time_limit=60, tt_size_mb=1)
+        moves = get_players_possible_moves_or_placements(winner, before)
+        assert ai._find_best_move(before, moves, 3)[1] == MATE_SCORE - 1
+        assert has_player_lost(ai.get_move(before).play(before), loser)
+        checked += 1
+    assert checked
+
+
+def test_mate_scores_are_kept_between_moves():
+    # a forced loss found two plies into one move's search is read back at the root of the next
+    game = replayed_game(4, None)
+    loser = game.current_turn
+    assert has_player_lost(game, loser)
+    plies = history_length(game)
+    first, second = replayed_game(4, plies - 4), replayed_game(4, plies - 2)
+
+    ai = MinimaxAI(loser, max_depth=4, time_limit=60, tt_size_mb=1)
+    ai.get_move(first)
+    ai.max_depth = 2  # eg less time for the next move
+    ai.get_move(second)
+
+    moves = get_players_possible_moves_or_placements(loser, second)
+    assert ai._find_best_move(second, moves, 2)[1] == -(MATE_SCORE - 2)
+
+
+class _NodeClock:
+    """perf_counter which moves on a second each time it is read - with check_every=1, a second per node"""
+
+    def __init__(self):
+        self.now = 0
+
+    def perf_counter(self):
+        self.now += 1
+        return self.now
+
+
+def test_deadline_is_kept_part_way_through_an_iteration(monkeypatch):
+    monkeypatch.setattr(minimax_ai, "time", _NodeClock())
+    game = replayed_game(0, 20)
+    time_limit = 200
+    ai = MinimaxAI(game.current_turn, max_depth=6, time_limit=time_limit, tt_size_mb=1, check_every=16)
+    move = ai.get_move(game)
+    assert ai.search_aborted and ai.completed_depth < 6
+    assert ai.nodes_evaluated <= (time_limit + 1) * ai.check_every  # stopped at the first check past the deadline
+    assert move in get_players_possible_moves_or_placements(game.current_turn, game)
+
+
+def test_partial_iteration_gives_the_best_root_move_searched(monkeypatch):
+    game = replayed_game(0, 12)
+    colour = game.current_turn
+    full = MinimaxAI(colour, max_depth=2, tt_size_mb=1)
+    full.get_move(game)
+
+    monkeypatch.setattr(minimax_ai, "time", _NodeClock())
+    time_limit = full.nodes_per_depth[1] + full.nodes_per_depth[2] // 2  # abort half way through depth 2
+    ai = MinimaxAI(colour, max_depth=2, time_limit=time_limit, tt_size_mb=1, check_every=1)
+    completed = []
+    iteration = ai._iterative_deepening_search
+
+    def record_iteration(*args):
+        completed.append(iteration(*args))
+        return completed[-1]
+
+    ai._iterative_deepening_search = record_iteration
+    move = ai.get_move(game)
+    assert ai.search_aborted and ai.completed_depth == 1
+    assert len(completed) == 1
+
+    # played the move which searched best at depth 2 - no worse there than the depth 1 best
+    def depth_2_score(root_move):
+        return MinimaxAI(colour, tt_size_mb=1).search_root_move(game, root_move, 2, -INFINITE_SCORE, INFINITE_SCORE)
+
+    assert depth_2_score(move) >= depth_2_score(completed[0][0])
+
+
+def test_clock_allocation():
+    game = replayed_game(0, 12)
+    clock = GameClock(remaining=60, increment=2)
+    budget = clock.allocate(game, game.current_turn)
+    assert 2 < budget < 60 / 10 + 2
+    assert GameClock(remaining=1, increment=5).allocate(game, game.current_turn) <= 1
+
+    clock.charge(3)
+    assert clock.remaining == 59
+
+    ai = MinimaxAI(game.current_turn, max_depth=2, tt_size_mb=1, clock=GameClock(remaining=30, increment=1))
+    ai.get_move(game)
+    assert 30 < ai.clock.remaining <= 31
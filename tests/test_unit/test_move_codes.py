@@ -0,0 +1,49 @@
+import pytest
+
+from hive.game_engine import pieces
+from hive.game_engine.game_state import BLACK, WHITE, Piece
+from hive.game_engine.move_codes import PackedMove, pack_move, pack_moves, unpack_move, unpack_moves
+from hive.game_engine.moves import Move, NoMove
+from hive.game_engine.player_functions import get_players_possible_moves_or_placements
+from tests.test_unit.replays import replayed_games
+
+
+def _fields(move):
+    return vars(move)
+
+
+def test_round_trip_every_move_of_a_game():
+    for game in replayed_games():
+        moves = get_players_possible_moves_or_placements(game.current_turn, game)
+        codes = pack_moves(moves)
+        assert codes.typecode == 'Q'
+        for move, back in zip(moves, unpack_moves(codes)):
+            assert _fields(back) == _fields(move)
+
+
+def test_round_trip_pillbug_and_pass():
+    pillbug_move = Move(piece=Piece(BLACK, pieces.ANT, 3), current_location=(-3, -1), current_stack_idx=0,
+                        new_location=(-2, 2), new_stack_idx=0, colour=WHITE, pillbug_moved_other_piece=True)
+    assert _fields(unpack_move(pack_move(pillbug_move))) == _fields(pillbug_move)
+
+    no_move = NoMove(colour=BLACK)
+    assert unpack_move(pack_move(no_move)) == no_move
+
+
+def test_packed_moves_compare_exactly():
+    place_ant_1 = Move(Piece(WHITE, pieces.ANT, 1), None, None, (2, 0), 0)
+    place_ant_2 = Move(Piece(WHITE, pieces.ANT, 2), None, None, (2, 0), 0)
+
+    # Move matches placements on the piece name, and hashes consistently with that
+    assert place_ant_1 == place_ant_2
+    assert hash(place_ant_1) == hash(place_ant_2)
+
+    assert PackedMove.from_move(place_ant_1) != PackedMove.from_move(place_ant_2)
+    assert PackedMove.from_move(place_ant_1) == PackedMove(pack_move(place_ant_1))
+    assert PackedMove.from_move(place_ant_1).piece == Piece(WHITE, pieces.ANT, 1)
+    assert PackedMove.from_move(place_ant_1).is_placement
+
+
+def test_out_of_range_raises():
+    with pytest.raises(ValueError):
+        pack_move(Move(Piece(WHITE, pieces.ANT, 1), None, None, (5000, 0), 0))
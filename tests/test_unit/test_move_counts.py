@@ -0,0 +1,31 @@
+from hive.game_engine.game_state import BLACK, WHITE
+from hive.game_engine.moves import count_possible_moves, get_possible_moves, has_possible_moves
+from hive.game_engine.player_functions import _filter_pillbug_moves, count_players_moves, get_mobility, get_players_moves
+from hive.play.agents.board_score.ai_generated_board_score import score_board_advanced
+from tests.test_unit.replays import replayed_games
+
+
+def test_counts_match_move_lists():
+    for idx in range(3):
+        for game in replayed_games(idx):
+            for loc, stack in game.grid.items():
+                moves = get_possible_moves(game.grid, loc, len(stack) - 1)
+                assert count_possible_moves(game.grid, loc, len(stack) - 1) == len(moves)
+                assert has_possible_moves(game.grid, loc, len(stack) - 1) == (len(moves) > 0)
+
+
+def test_players_counts_match_filtered_moves():
+    for idx in range(3):
+        for game in replayed_games(idx):
+            for colour in (WHITE, BLACK):
+                counts = count_players_moves(colour, game)
+                for loc, count in counts.items():
+                    stack = game.grid[loc]
+                    moves = get_possible_moves(game.grid, loc, len(stack) - 1)
+                    assert count == len(_filter_pillbug_moves(game, moves, stack[-1]))
+                assert sum(counts.values()) == len(get_players_moves(colour, game)) == get_mobility(game)[colour]
+
+
+def test_score_board_advanced_runs():
+    for game in replayed_games(0):
+        score_board_advanced(game, WHITE)
@@ -0,0 +1,45 @@
+from hive.benchmark.move_generators import (CAN_REMOVE, PLACEABLE, curated_grids, find_regressions, piece_cases,
+                                            run_benchmarks)
+from hive.game_engine.moves import move_functions
+from hive.game_engine.position_cache import position_cache
+
+
+def test_curated_grids_cover_every_piece_type():
+    assert set(piece_cases(curated_grids())) == set(move_functions)
+
+
+def test_run_benchmarks():
+    results = run_benchmarks(curated_grids(), repeat=1)
+    names = {key.split("/")[0] for key in results}
+    assert names == set(move_functions) | {PLACEABLE, CAN_REMOVE}
+    assert all(micros > 0 for micros in results.values())
+    assert position_cache.enabled  # turned back on afterwards
+
+
+def test_every_curated_piece_is_benchmarked(monkeypatch):
+    grids = curated_grids()
+    calls = set()
+
+    def recording(name, generator):
+        def generate(grid, loc, stack_idx):
+            result = generator(grid, loc, stack_idx)
+            calls.add((name, id(grid), loc, len(result)))
+            return result
+        return generate
+
+    for name, generator in list(move_functions.items()):
+        monkeypatch.setitem(move_functions, name, recording(name, generator))
+    run_benchmarks(grids, repeat=1)
+    monkeypatch.undo()
+
+    for name, cases in piece_cases(grids).items():
+        for grid, loc, stack_idx in cases:
+            assert (name, id(grid), loc, len(move_functions[name](grid, loc, stack_idx))) in calls
+
+
+def test_find_regressions():
+    baseline = {"ANT/small": 10.0, "QUEEN/small": 10.0}
+    results = {"ANT/small": 13.0, "QUEEN/small": 11.0, "SPIDER/small": 50.0}
+    regressions = find_regressions(results, baseline, threshold=0.2)
+    assert list(regressions) == ["ANT/small"]
+    assert abs(regressions["ANT/small"] - 0.3) < 1e-9
@@ -0,0 +1,103 @@
+from hive.game_engine.game_functions import opposite_colour
+from hive.game_engine.grid_functions import positions_around_location
+from hive.game_engine.moves import Move
+from hive.game_engine.player_functions import get_players_possible_moves_or_placements
+from hive.game_engine.queen_threats import find_queen_threats
+from hive.play.agents.minimax_ai import MinimaxAI
+from hive.play.agents.move_ordering import HISTORY_LIMIT, MoveOrderer, _adjacency_gain
+from tests.test_unit.replays import replayed_game
+
+
+def _position():
+    game = replayed_game(0, 20)
+    return game, get_players_possible_moves_or_placements(game.current_turn, game)
+
+
+def test_order_is_a_permutation():
+    game, moves = _position()
+    ordered = MoveOrderer().order(game, moves, game.current_turn)
+    assert sorted(map(repr, ordered)) == sorted(map(repr, moves))
+
+
+def test_tt_move_then_threats_then_killers():
+    game, moves = _position()
+    orderer = MoveOrderer()
+    killer, tt_move = moves[-1], moves[-2]
+    orderer.record_cutoff(killer, ply=3, depth=1)
+
+    ordered = orderer.order(game, moves, game.current_turn, ply=3, tt_move=tt_move)
+    assert ordered[:2] == [tt_move, killer]
+    assert orderer.order(game, moves, game.current_turn, ply=2)[0] != killer  # killers are per ply
+
+    threat = moves[-3]
+    ordered = orderer.order(game, moves, game.current_turn, ply=3, tt_move=tt_move, threats=[threat])
+    assert ordered[:3] == [tt_move, threat, killer]
+
+
+def test_killers_keep_the_latest_two():
+    game, moves = _position()
+    orderer = MoveOrderer()
+    for move in moves[-3:]:
+        orderer.record_cutoff(move, ply=0, depth=1)
+    assert len(orderer.killers[0]) == 2
+    assert orderer.order(game, moves, game.current_turn)[:2] == [moves[-1], moves[-2]]
+
+    orderer.new_search()
+    assert orderer.killers == []
+
+
+def test_history_favours_deep_cutoffs_and_is_bounded():
+    game, moves = _position()
+    orderer = MoveOrderer()
+    shallow, deep = moves[-1], moves[-2]
+    orderer.record_cutoff(shallow, ply=0, depth=1)
+    orderer.record_cutoff(deep, ply=1, depth=4)
+    orderer.killers = []
+    ordered = orderer.order(game, moves, game.current_turn)
+    assert ordered.index(deep) < ordered.index(shallow)
+
+    for _ in range(HISTORY_LIMIT):
+        orderer.record_cutoff(deep, ply=0, depth=10)
+    assert max(orderer.history.values()) < HISTORY_LIMIT * 2
+
+
+def test_queen_adjacency_matches_playing_the_move():
+    for idx in range(3):
+        game = replayed_game(idx, 24)
+        colour = game.current_turn
+        opponent_queen, own_queen = game.queens.get(opposite_colour(colour)), game.queens.get(colour)
+        if opponent_queen is None or own_queen is None:
+            continue
+
+        def occupied_around(g, loc):
+            return sum(1 for around in positions_around_location(loc) if g.grid.get(around))
+
+        for move in get_players_possible_moves_or_placements(colour, game):
+            if move.current_location is None or move.piece.name == "QUEEN" or move.pillbug_moved_other_piece:
+                continue
+            new_game = move.play(game)
+            expected = (occupied_around(new_game, opponent_queen) - occupied_around(game, opponent_queen)
+                        - occupied_around(new_game, own_queen) + occupied_around(game, own_queen)
+                        + (move.new_location == opponent_queen))
+            gain = _adjacency_gain(game.grid, move, opponent_queen, set(positions_around_location(opponent_queen)),
+                                   set(positions_around_location(own_queen)))
+            assert gain == expected
+
+
+def test_ordering_plays_no_moves(monkeypatch):
+    game, moves = _position()
+    threats = find_queen_threats(game, game.current_turn).threats
+
+    def fail(*args):
+        raise AssertionError("ordering played a move")
+
+    monkeypatch.setattr(Move, "play", fail)
+    MoveOrderer().order(game, moves, game.current_turn, threats=threats)
+
+
+def test_minimax_records_cutoffs():
+    game = replayed_game(1, 14)
+    ai = MinimaxAI(game.current_turn, max_depth=2, time_limit=60, tt_size_mb=1)
+    move = ai.get_move(game)
+    assert move in get_players_possible_moves_or_placements(game.current_turn, game)
+    assert ai.move_orderer.history
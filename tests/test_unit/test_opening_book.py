@@ -0,0 +1,80 @@
+from hive.game_engine.canonical import SYMMETRIES, Transform, transform_grid
+from hive.game_engine.game_state import initial_game
+from hive.game_engine.player_functions import get_players_possible_moves_or_placements
+from hive.play.agents.opening_book_ai import OpeningBookAI
+from hive.play.opening_book import OpeningBook, build_book, opening_positions
+from hive.play.player import Player
+from hive.trajectory.game_string import load_replay_game_strings
+from tests.test_unit.replays import REPLAY_FILE
+
+
+def _book():
+    return build_book(load_replay_game_strings(REPLAY_FILE), max_plies=6)
+
+
+def test_every_opening_move_is_in_the_book():
+    book = _book()
+    for game_string in load_replay_game_strings(REPLAY_FILE):
+        for game, move in opening_positions(game_string, 6):
+            assert move in [book_move for book_move, _ in book.lookup(game)]
+
+
+def test_counts_and_results():
+    book = _book()
+    game_strings = load_replay_game_strings(REPLAY_FILE)
+    game, move = next(opening_positions(game_strings[0], 6))  # the first placement - every game starts here
+    entries = book.lookup(game)
+    assert sum(stats.count for _, stats in entries) == len(game_strings)
+    for _, stats in entries:
+        assert stats.wins + stats.draws <= stats.count
+        assert 0.0 <= stats.score <= 1.0
+
+
+def test_save_and_load(tmp_path):
+    book = _book()
+    filepath = str(tmp_path / "book.bin")
+    book.save(filepath)
+    loaded = OpeningBook.load(filepath)
+    assert loaded.max_plies == book.max_plies
+    assert list(loaded.keys) == list(book.keys)
+    assert list(loaded.codes) == list(book.codes)
+    assert list(loaded.counts) == list(book.counts)
+    assert list(loaded.wins) == list(book.wins)
+    assert list(loaded.draws) == list(book.draws)
+
+
+def test_lookup_in_a_rotated_position():
+    book = _book()
+    game_string = load_replay_game_strings(REPLAY_FILE)[0]
+    for game, _ in list(opening_positions(game_string, 6))[2:]:
+        entries = book.lookup(game)
+        for rotation, reflected in SYMMETRIES:
+            transform = Transform(rotation, reflected, (4, -2))
+            rotated = initial_game(transform_grid(game.grid, transform), current_turn=game.current_turn)
+            rotated_entries = book.lookup(rotated)
+            assert [stats for _, stats in rotated_entries] == [stats for _, stats in entries]
+
+            # the same moves, up to any symmetry of the position itself
+            legal = get_players_possible_moves_or_placements(rotated.current_turn, rotated)
+            assert all(book_move in legal for book_move, _ in rotated_entries)
+
+
+class _Fallback(Player):
+    def get_move(self, game):
+        return 'fallback'
+
+
+def test_opening_book_ai():
+    book = _book()
+    game_string = load_replay_game_strings(REPLAY_FILE)[0]
+    positions = list(opening_positions(game_string, 6))
+
+    game, _ = positions[2]
+    ai = OpeningBookAI(game.current_turn, book, fallback=_Fallback(game.current_turn), min_count=1)
+    move = ai.get_move(game)
+    assert move in get_players_possible_moves_or_placements(game.current_turn, game)
+
+    last, move = positions[-1]
+    after = move.play(last)
+    ai = OpeningBookAI(after.current_turn, book, fallback=_Fallback(after.current_turn), min_count=1)
+    assert ai.get_move(after) == 'fallback'  # past the end of the book
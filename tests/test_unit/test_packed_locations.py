@@ -0,0 +1,25 @@
+from hive.game_engine import pieces
+from hive.game_engine.game_state import BLACK, WHITE, Piece, create_immutable_grid
+from hive.game_engine.grid_functions import get_empty_locations, positions_around_location
+from hive.game_engine.packed_locations import pack_location, packed_neighbours, unpack_location, unpack_locations
+
+
+def test_pack_round_trip():
+    for loc in [(0, 0), (-3, 1), (7, -5), (-120, -64), (250, 300)]:
+        assert unpack_location(pack_location(loc)) == loc
+
+
+def test_packed_neighbours_match_positions_around_location():
+    for loc in [(0, 0), (-3, 1), (7, -5)]:
+        assert tuple(unpack_locations(packed_neighbours(pack_location(loc)))) == positions_around_location(loc)
+
+
+def test_empty_locations_around_two_pieces():
+    grid = create_immutable_grid({(0, 0): (Piece(WHITE, pieces.ANT, 1),),
+                                  (2, 0): (Piece(BLACK, pieces.ANT, 1),)})
+
+    expected = {pos for loc in grid for pos in positions_around_location(loc) if pos not in grid}
+    empty = get_empty_locations(grid)
+
+    assert len(empty) == len(expected) == 8
+    assert set(empty) == expected
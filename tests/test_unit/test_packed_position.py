@@ -0,0 +1,23 @@
+import pickle
+
+from hive.game_engine.packed_position import pack_position, unpack_position
+from hive.game_engine.player_functions import get_players_possible_moves_or_placements
+from tests.test_unit.replays import replayed_games
+
+
+def test_round_trip_every_position_of_a_game():
+    for idx in range(2):
+        for game in replayed_games(idx):
+            back = unpack_position(pickle.loads(pickle.dumps(pack_position(game))))
+            assert back.parent is None
+            for field in ('grid', 'current_turn', 'player_turns', 'queens', 'unplayed_pieces', 'move',
+                          'piece_moved_last_turn', 'zobrist', 'frontier', 'piece_locations'):
+                assert getattr(back, field) == getattr(game, field), field
+
+            moves = get_players_possible_moves_or_placements(game.current_turn, game)
+            assert set(map(repr, get_players_possible_moves_or_placements(back.current_turn, back))) == set(map(repr, moves))
+
+
+def test_much_smaller_than_a_pickled_game():
+    game = next(replayed_games())
+    assert len(pickle.dumps(pack_position(game))) * 20 < len(pickle.dumps(game))
@@ -0,0 +1,51 @@
+from hive.game_engine.player_functions import get_players_possible_moves_or_placements
+from hive.game_engine.queen_threats import find_winning_moves
+from hive.play.agents.minimax_ai import MinimaxAI
+from hive.play.agents.parallel_search import RootResult, _decode_best, _encode_best, merge_results
+from tests.test_unit.replays import replayed_game
+
+
+def test_shared_best_orders_by_score_then_lower_index():
+    for score, index in [(0, 0), (-5, 3), (1000001, 700), (-1000001, 65535)]:
+        assert _decode_best(_encode_best(score, index)) == (score, index)
+    assert _encode_best(10, 5) > _encode_best(10, 6) > _encode_best(9, 0) > _encode_best(-3, 0)
+
+
+def test_merge_is_deterministic():
+    results = [RootResult(0, 10, True, 1), RootResult(1, 20, False, 1), RootResult(2, 15, True, 1),
+               RootResult(3, 15, True, 1), RootResult(4, None, False, 1)]
+    assert merge_results(results).index == 2
+    assert merge_results(list(reversed(results))).index == 2
+    assert merge_results([RootResult(0, 5, False, 1)]) is None
+
+
+def test_parallel_search_matches_serial_scores():
+    game = replayed_game(0, 12)
+    moves = get_players_possible_moves_or_placements(game.current_turn, game)
+
+    chosen = []
+    for _ in range(2):
+        ai = MinimaxAI(game.current_turn, max_depth=2, time_limit=60, tt_size_mb=1, processes=2)
+        try:
+            chosen.append(ai.get_move(game))
+            assert ai.completed_depth == 2 and not ai.search_aborted
+            assert sorted(ai.nodes_per_depth) == [1, 2]
+        finally:
+            ai.close()
+    # the same again, whichever worker finishes first (a fresh AI, as tables kept from the last
+    # search can change the scores of shallower iterations, and so the order ties are broken in)
+    move = chosen[0]
+    assert chosen[1] == move
+
+    serial = MinimaxAI(game.current_turn, max_depth=2, time_limit=60, tt_size_mb=1)
+    best_score = serial._find_best_move(game, moves, 2)[1]
+    assert serial.search_root_move(game, move, 2, -10 ** 7, 10 ** 7) == best_score
+
+
+def test_parallel_search_takes_a_win():
+    game = replayed_game(1, None).parent
+    ai = MinimaxAI(game.current_turn, max_depth=3, time_limit=60, tt_size_mb=1, processes=2)
+    try:
+        assert ai.get_move(game) in find_winning_moves(game, game.current_turn)
+    finally:
+        ai.close()
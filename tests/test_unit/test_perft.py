@@ -0,0 +1,43 @@
+from hive.benchmark.perft import check_results, perft, save_results
+from hive.game_engine.game_functions import get_winner
+from hive.game_engine.game_state import initial_game
+from hive.game_engine.player_functions import get_players_possible_moves_or_placements
+from hive.game_engine.zobrist import MASK_64
+from tests.test_unit.replays import replayed_game
+
+
+def _game_perft(game, depth):
+    """perft by playing Moves on Games, without the Board"""
+    if depth == 0:
+        return 1, game.zobrist
+    if get_winner(game) is not None:
+        return 0, 0
+    leaves, checksum = 0, 0
+    for move in get_players_possible_moves_or_placements(game.current_turn, game):
+        child_leaves, child_checksum = _game_perft(move.play(game), depth - 1)
+        leaves += child_leaves
+        checksum = (checksum + child_checksum) & MASK_64
+    return leaves, checksum
+
+
+def test_empty_board():
+    assert perft(initial_game(), 1).leaves == 8  # one placement per piece type
+    assert perft(initial_game(), 2).leaves == 8 * 8 * 6
+
+
+def test_matches_playing_moves_on_games():
+    game = replayed_game(0, 12)
+
+    result = perft(game, 2)
+    assert (result.leaves, result.checksum) == _game_perft(game, 2)
+    assert result.nodes == 1 + len(get_players_possible_moves_or_placements(game.current_turn, game)) + result.leaves
+
+
+def test_check_against_saved(tmp_path):
+    results = [perft(initial_game(), 2, name="empty")]
+    filepath = str(tmp_path / "perft.json")
+    save_results(results, filepath)
+    assert check_results(results, filepath) == []
+
+    results[0].checksum ^= 1
+    assert len(check_results(results, filepath)) == 1
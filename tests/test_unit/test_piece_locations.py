@@ -0,0 +1,47 @@
+from hive.game_engine import pieces
+from hive.game_engine.board import Board
+from hive.game_engine.game_functions import locate_piece, move_piece
+from hive.game_engine.game_state import BLACK, WHITE, Game, Piece, index_pieces, initial_game
+from hive.trajectory.boardspace import find_piece_by_id, get_piece_id
+from tests.test_unit.replays import replayed_game
+
+
+def test_index_kept_up_to_date_through_a_game():
+    game = replayed_game()
+    while game is not None:
+        assert dict(game.piece_locations) == index_pieces(game.grid)
+        game = game.parent
+
+
+def test_index_tracks_stacks():
+    beetle = Piece(WHITE, pieces.BEETLE, 1)
+    queen = Piece(BLACK, pieces.QUEEN, 1)
+    game = initial_game({(0, 0): (queen,), (2, 0): (beetle,)})
+    assert locate_piece(game, beetle) == ((2, 0), 0)
+
+    game = move_piece(game, (2, 0), (0, 0), WHITE)
+    assert locate_piece(game, beetle) == ((0, 0), 1)
+    assert locate_piece(game, queen) == ((0, 0), 0)
+    assert Piece(WHITE, pieces.QUEEN, 1) in game.unplayed_pieces[WHITE]
+    assert locate_piece(game, Piece(WHITE, pieces.QUEEN, 1)) is None
+
+
+def test_hand_built_game_falls_back_to_the_grid():
+    queen = Piece(BLACK, pieces.QUEEN, 1)
+    game = Game(grid={(0, 0): (queen,)})
+    assert locate_piece(game, queen) == ((0, 0), 0)
+
+
+def test_find_piece_by_id():
+    game = replayed_game()
+    for piece, (loc, _) in game.piece_locations.items():
+        assert find_piece_by_id(game, get_piece_id(piece)) == (piece, loc)
+
+
+def test_board_keeps_the_index():
+    game = replayed_game()
+    board = Board.from_game(game.parent)
+    board.play(game.move)
+    assert board.piece_locations == dict(game.piece_locations)
+    board.undo()
+    assert board.piece_locations == dict(game.parent.piece_locations)
@@ -0,0 +1,63 @@
+from hive.game_engine import pieces
+from hive.game_engine.game_functions import place_piece
+from hive.game_engine.game_state import BLACK, WHITE, Piece, initial_game
+from hive.game_engine.grid_functions import pieces_around_location
+from hive.game_engine.position_cache import PositionCache, clear_position_cache, configure_position_cache, position_cache, position_cache_stats
+
+
+def _two_piece_game():
+    game = initial_game()
+    game = place_piece(game, Piece(WHITE, pieces.QUEEN, 1), (0, 0))
+    game = place_piece(game, Piece(BLACK, pieces.QUEEN, 1), (2, 0))
+    return game
+
+
+def test_repeated_call_is_a_hit():
+    game = _two_piece_game()
+    clear_position_cache()
+
+    first = pieces_around_location(game.grid, (1, 1))
+    second = pieces_around_location(game.grid, (1, 1))
+
+    assert first == second == ((0, 0), (2, 0))
+    assert position_cache_stats().misses == 1
+    assert position_cache_stats().hits == 1
+
+
+def test_equal_grids_share_results():
+    game_a = _two_piece_game()
+    game_b = initial_game(grid=dict(game_a.grid))
+    clear_position_cache()
+
+    pieces_around_location(game_a.grid, (1, 1))
+    pieces_around_location(game_b.grid, (1, 1))
+
+    assert position_cache_stats().hits == 1
+
+
+def test_least_recently_used_position_is_evicted():
+    cache = PositionCache(max_positions=2)
+    game = initial_game()
+    grids = []
+    for colour, location in [(WHITE, (0, 0)), (BLACK, (2, 0)), (WHITE, (-2, 0))]:
+        game = place_piece(game, Piece(colour, pieces.ANT, 1), location)
+        grids.append(game.grid)
+
+    for grid in grids:
+        cache.results_for(grid)
+
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+
+
+def test_cache_can_be_turned_off():
+    clear_position_cache()
+    configure_position_cache(enabled=False)
+    try:
+        game = _two_piece_game()
+        pieces_around_location(game.grid, (1, 1))
+        pieces_around_location(game.grid, (1, 1))
+        assert len(position_cache) == 0
+        assert position_cache_stats().hits == 0
+    finally:
+        configure_position_cache(enabled=True)
@@ -0,0 +1,47 @@
+from hive import profiling
+from hive.game_engine.player_functions import get_players_possible_moves_or_placements
+from hive.game_engine.position_cache import clear_position_cache
+from hive.profiling import profile, profiled
+from hive.trajectory.boardspace import replay_trajectory
+from tests.test_unit.replays import replay_moves
+
+
+def test_profile_a_game():
+    clear_position_cache()
+    with profile() as p:
+        game = replay_trajectory(replay_moves())
+        get_players_possible_moves_or_placements(game.current_turn, game)
+        get_players_possible_moves_or_placements(game.current_turn, game)
+
+    assert not profiling.is_enabled()
+    for name in ("place_piece", "move_piece", "get_possible_moves", "can_remove_piece", "get_pinned_locations"):
+        assert p.counters[name].calls > 0
+        assert p.counters[name].seconds >= 0
+    assert p.counters["place_piece"].calls + p.counters["move_piece"].calls >= len(replay_moves())
+    assert p.counters["get_pinned_locations"].cache_hits > 0  # second move generation is from the cache
+    assert "can_remove_piece" in p.report()
+
+
+def test_nothing_counted_when_off():
+    @profiled(name="test_profiling.add")
+    def add(a, b):
+        return a + b
+
+    before = profiling.snapshot().get("test_profiling.add")
+    assert add(1, 2) == 3
+    assert profiling.snapshot().get("test_profiling.add") == before
+
+
+def test_nested_profiles():
+    @profiled
+    def work():
+        return 1
+
+    with profile() as outer:
+        work()
+        with profile() as inner:
+            work()
+        work()
+
+    assert inner.counters["work"].calls == 1
+    assert outer.counters["work"].calls == 3
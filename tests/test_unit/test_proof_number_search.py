@@ -0,0 +1,84 @@
+from hive.game_engine.board import Board
+from hive.game_engine.game_functions import get_winner
+from hive.game_engine.move_codes import pack_move
+from hive.game_engine.player_functions import get_players_possible_moves_or_placements
+from hive.game_engine.queen_threats import find_winning_moves
+from hive.play.agents.proof_number_search import (DISPROVEN, PROVEN, UNKNOWN, ProofNumberAI, ProofNumberSearch,
+                                                  _Node, prove_win)
+from hive.play.player import Player
+from tests.test_unit.replays import replayed_games
+
+
+def test_proves_win_in_two():
+    game = list(replayed_games(3))[3]  # the winner to move, 3 plies from the end
+    colour = game.current_turn
+    result = prove_win(game, colour, max_nodes=5000, max_plies=3)
+    assert result.status == PROVEN
+
+    # every reply to the move leaves a win in one
+    after = result.move.play(game)
+    for reply in get_players_possible_moves_or_placements(after.current_turn, after):
+        after_reply = reply.play(after)
+        assert get_winner(after_reply) == colour or len(find_winning_moves(after_reply, colour)) > 0
+
+
+def test_disproves_when_the_opponent_wins_next():
+    game = list(replayed_games(2))[1]  # the loser to move - the winner surrounds the queen next move
+    assert get_winner(game) is None
+    result = prove_win(game, game.current_turn, max_nodes=5000, max_plies=3)
+    assert result.status == DISPROVEN
+    assert result.move is None
+
+
+def test_memo_kept_between_calls():
+    game = list(replayed_games(3))[3]
+    search = ProofNumberSearch(max_nodes=5000, max_plies=3)
+    first = search.prove_win(game, game.current_turn)
+    second = search.prove_win(game, game.current_turn)
+    assert first.status == second.status == PROVEN
+    assert second.nodes == 0
+    assert second.move == first.move
+
+
+def test_memo_is_bounded():
+    game = list(replayed_games(3))[3]
+    search = ProofNumberSearch(max_nodes=5000, max_plies=3, max_memo=4)
+    assert search.prove_win(game, game.current_turn).status == PROVEN
+    assert 0 < len(search.memo) <= 4
+    assert search.prove_win(game, game.current_turn).status == PROVEN
+
+
+def test_pillbug_moves_are_separate_children():
+    game = list(replayed_games(1))[21]
+    moves = get_players_possible_moves_or_placements(game.current_turn, game)
+    codes = {pack_move(move) for move in moves}
+    assert len(set(moves)) < len(codes)  # some moves are equal but for the pillbug moving the piece
+
+    root = _Node(None, None, is_or=True, plies_left=3)
+    ProofNumberSearch(max_plies=3)._expand(root, Board.from_game(game), game.current_turn)
+    assert sorted(pack_move(child.move) for child in root.children) == sorted(codes)
+
+
+def test_stops_at_node_budget():
+    game = list(replayed_games(1))[-12]
+    result = prove_win(game, game.current_turn, max_nodes=50, max_plies=5)
+    assert result.status == UNKNOWN
+    assert result.move is None
+    assert result.nodes >= 50
+
+
+class _Fallback(Player):
+    def get_move(self, game):
+        return 'fallback'
+
+
+def test_proof_number_ai():
+    game = list(replayed_games(3))[3]
+    ai = ProofNumberAI(game.current_turn, fallback=_Fallback(game.current_turn), max_nodes=5000, max_plies=3)
+    assert ai.get_move(game) == ai.last_result.move
+    assert ai.last_result.status == PROVEN
+
+    early = list(replayed_games(3))[-6]
+    ai = ProofNumberAI(early.current_turn, fallback=_Fallback(early.current_turn))
+    assert ai.get_move(early) == 'fallback'
+    assert ai.last_result is None or ai.last_result.status != PROVEN
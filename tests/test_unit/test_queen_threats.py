@@ -0,0 +1,93 @@
+from hive.game_engine import pieces
+from hive.game_engine.game_functions import get_winner, opposite_colour
+from hive.game_engine.game_state import BLACK, WHITE, Piece, initial_game
+from hive.game_engine.grid_functions import positions_around_location
+from hive.game_engine.player_functions import get_players_possible_moves_or_placements
+from hive.game_engine.queen_threats import find_queen_threats, find_winning_moves, hex_distance
+from hive.play.agents.minimax_ai import MinimaxAI
+from hive.play.agents.scored_moves_based_ai import ScoreMovesAI
+from tests.test_unit.replays import replayed_games
+
+
+def _empty_around(game, colour):
+    return sum(1 for loc in positions_around_location(game.queens[colour]) if not game.grid.get(loc))
+
+
+def _brute_force(game, colour):
+    """Wins and threats found by playing every move"""
+    opponent = opposite_colour(colour)
+    before = _empty_around(game, opponent)
+    wins, threats = set(), set()
+    for move in get_players_possible_moves_or_placements(colour, game):
+        if getattr(move, 'piece', None) is None:
+            continue
+        new_game = move.play(game)
+        if get_winner(new_game) == colour:
+            wins.add(move)
+        elif _empty_around(new_game, opponent) == 1 and before > 1:
+            threats.add(move)
+    return wins, threats
+
+
+def test_matches_playing_every_move():
+    found_win = False
+    for idx in range(4):
+        for game in replayed_games(idx):
+            if get_winner(game) is not None:
+                continue
+            for colour in (WHITE, BLACK):
+                if game.queens.get(opposite_colour(colour)) is None:
+                    continue
+                threats = find_queen_threats(game, colour)
+                wins, brute_threats = _brute_force(game, colour)
+                assert set(threats.wins) == wins
+                assert set(threats.threats) == brute_threats
+                found_win = found_win or len(wins) > 0
+    assert found_win  # the replays end in wins, so the position before has one
+
+
+def _surround_in_one_game():
+    grid = {(0, 0): (Piece(BLACK, pieces.QUEEN, 1),),
+            (-1, -1): (Piece(WHITE, pieces.QUEEN, 1),),
+            (1, -1): (Piece(WHITE, pieces.SPIDER, 1),),
+            (2, 0): (Piece(WHITE, pieces.BEETLE, 1),),
+            (1, 1): (Piece(WHITE, pieces.SPIDER, 2),),
+            (-1, 1): (Piece(WHITE, pieces.GRASSHOPPER, 1),),
+            (-3, 1): (Piece(WHITE, pieces.ANT, 1),),
+            (4, 0): (Piece(BLACK, pieces.ANT, 1),)}
+    return initial_game(grid)
+
+
+def test_ant_completes_the_surround():
+    game = _surround_in_one_game()
+    wins = find_winning_moves(game, WHITE)
+    assert len(wins) > 0
+    assert all(move.new_location == (-2, 0) for move in wins)
+    assert any(move.piece == Piece(WHITE, pieces.ANT, 1) for move in wins)
+    assert find_queen_threats(game, BLACK).wins == []
+
+
+def test_agents_take_the_win():
+    game = _surround_in_one_game()
+    wins = find_winning_moves(game, WHITE)
+
+    assert ScoreMovesAI(WHITE).get_move(game) in wins
+
+    ai = MinimaxAI(WHITE)
+    moves = get_players_possible_moves_or_placements(WHITE, game)
+    assert ai._order_moves(game, moves)[0] in wins
+    assert ai._find_best_move(game, moves, 2)[0] in wins
+
+
+def test_no_queen_no_threats():
+    game = initial_game({(0, 0): (Piece(WHITE, pieces.ANT, 1),)})
+    threats = find_queen_threats(game, WHITE)
+    assert threats.wins == [] and threats.threats == []
+
+
+def test_hex_distance():
+    assert hex_distance((0, 0), (2, 0)) == 1
+    assert hex_distance((0, 0), (1, 1)) == 1
+    assert hex_distance((0, 0), (4, 0)) == 2
+    assert hex_distance((0, 0), (3, 1)) == 2
+    assert hex_distance((0, 0), (0, 2)) == 2
@@ -0,0 +1,145 @@
+import multiprocessing
+
+from hive.game_engine import pieces
+from hive.game_engine.game_state import WHITE, Piece
+from hive.game_engine.moves import Move, NoMove
+from hive.game_engine.player_functions import get_players_possible_moves_or_placements
+from hive.game_engine.queen_threats import find_winning_moves
+from hive.play.agents.minimax_ai import MinimaxAI
+from hive.play.agents.shared_transposition_table import ENTRY_WORDS, SharedTranspositionTable
+from hive.play.agents.transposition_table import BUCKET_SIZE, EXACT, LOWER_BOUND, MATE_SCORE, UPPER_BOUND
+from tests.test_unit.replays import replayed_game
+
+MOVE = Move(Piece(WHITE, pieces.ANT, 1), (0, 0), 0, (4, 0), 0, colour=WHITE)
+
+
+def _table(**kwargs):
+    return SharedTranspositionTable(**kwargs)
+
+
+def _free(*tables):
+    for table in tables:
+        table.close()
+    tables[0].unlink()
+
+
+def test_probe_and_store_like_the_local_table():
+    tt = _table(max_entries=64)
+    try:
+        tt.store(1, depth=3, score=50, flag=EXACT, best_move=MOVE)
+        assert tt.probe(1, 3, -100, 100) == (50, MOVE)
+        assert tt.probe(1, 4, -100, 100) == (None, MOVE)
+
+        tt.store(2, depth=3, score=-50, flag=UPPER_BOUND, best_move=NoMove(WHITE))
+        assert tt.probe(2, 3, -40, 100) == (-50, NoMove(WHITE))
+        assert tt.probe(2, 3, -100, 100)[0] is None
+
+        tt.store(3, depth=300, score=float('-inf'), flag=LOWER_BOUND)
+        entry = tt.get(3)
+        assert (entry.depth, entry.score, entry.flag, entry.best_move) == (255, float('-inf'), LOWER_BOUND, None)
+        assert tt.get(2 ** 64 - 1) is None and len(tt) == 3
+
+        tt.store(1, depth=2, score=3, flag=LOWER_BOUND)  # a shallower bound doesn't replace
+        assert tt.get(1).depth == 3
+    finally:
+        _free(tt)
+
+
+def test_mate_scores_are_counted_from_the_position():
+    tt = _table(max_entries=64)
+    try:
+        tt.store(1, depth=2, score=MATE_SCORE - 5, ply=3)
+        assert tt.get(1).score == MATE_SCORE - 2
+        assert tt.probe(1, 2, -100, 100, ply=1)[0] == MATE_SCORE - 3
+
+        tt.store(2, depth=2, score=-(MATE_SCORE - 4), ply=2)
+        assert tt.probe(2, 2, -100, 100)[0] == -(MATE_SCORE - 2)
+    finally:
+        _free(tt)
+
+
+def test_replacement_within_a_bucket():
+    tt = _table(max_entries=2 * BUCKET_SIZE)
+    try:
+        keys = [i * tt.n_buckets for i in range(BUCKET_SIZE + 1)]
+        for depth, key in enumerate(keys[:-1]):
+            tt.store(key, depth=depth + 1, score=0)
+        tt.store(keys[-1], depth=10, score=0)
+        assert len(tt) == BUCKET_SIZE
+        assert tt.get(keys[0]) is None and tt.get(keys[-1]) is not None
+    finally:
+        _free(tt)
+
+
+def test_torn_entries_are_ignored():
+    tt = _table(max_entries=64)
+    try:
+        tt.store(5, depth=4, score=7, best_move=MOVE)
+        slot = (5 % tt.n_buckets) * BUCKET_SIZE
+        tt._words[slot * ENTRY_WORDS + 1] ^= 1 << 35  # the depth changed, but not the check
+        assert tt.get(5) is None
+        tt.store(5, depth=2, score=1)
+        assert tt.get(5).score == 1
+    finally:
+        _free(tt)
+
+
+def _store_in_other_process(name, n_buckets):
+    table = SharedTranspositionTable.attach(name, n_buckets)
+    table.store(42, depth=6, score=-9, flag=EXACT, best_move=MOVE)
+    table.close()
+
+
+def test_shared_between_processes():
+    tt = _table(size_mb=0.1)
+    other = SharedTranspositionTable.attach(tt.name, tt.n_buckets)
+    try:
+        other.store(7, depth=1, score=3)
+        assert tt.get(7).score == 3
+
+        process = multiprocessing.Process(target=_store_in_other_process, args=(tt.name, tt.n_buckets))
+        process.start()
+        process.join()
+        assert process.exitcode == 0
+        assert tt.probe(42, 6, -100, 100) == (-9, MOVE)
+    finally:
+        _free(tt, other)
+
+
+def test_age_is_the_creators_in_every_process():
+    tt = _table(size_mb=0.1)
+    other = SharedTranspositionTable.attach(tt.name, tt.n_buckets)
+    try:
+        tt.new_search()
+        for _ in range(3):
+            other.new_search()  # eg a worker which has run more searches than the others
+        assert other.age == tt.age == 1
+        other.store(7, depth=1, score=3)
+        assert tt.get(7).age == tt.age
+
+        tt.new_search()
+        process = multiprocessing.Process(target=_store_in_other_process, args=(tt.name, tt.n_buckets))
+        process.start()
+        process.join()
+        assert tt.get(42).age == tt.age == 2
+    finally:
+        _free(tt, other)
+
+
+def test_lazy_smp_search():
+    game = replayed_game(0, 12)
+    ai = MinimaxAI(game.current_turn, max_depth=2, time_limit=60, tt_size_mb=1, processes=2, lazy_smp=True)
+    try:
+        move = ai.get_move(game)
+        assert move in get_players_possible_moves_or_placements(game.current_turn, game)
+        assert ai.completed_depth == 2 and not ai.search_aborted
+        assert len(ai._parallel().table) > 0
+    finally:
+        ai.close()
+
+    game = replayed_game(1, None).parent
+    ai = MinimaxAI(game.current_turn, max_depth=3, time_limit=60, tt_size_mb=1, processes=2, lazy_smp=True)
+    try:
+        assert ai.get_move(game) in find_winning_moves(game, game.current_turn)
+    finally:
+        ai.close()
@@ -0,0 +1,59 @@
+from hive.game_engine import pieces
+from hive.game_engine.game_state import Piece, WHITE, BLACK, create_immutable_grid
+from hive.game_engine.grid_functions import one_move_away
+from hive.game_engine.slide_graph import get_slide_reachable, get_slide_walk_ends
+from tests.test_unit.replays import replayed_games
+
+
+def _reference_ant(grid, loc):
+    """Breadth first search one step at a time, as get_ant_moves used to"""
+    visited = {loc}
+    to_visit = set(one_move_away(grid, loc))
+    while to_visit:
+        current = to_visit.pop()
+        if current in visited:
+            continue
+        visited.add(current)
+        to_visit.update(m for m in one_move_away(grid, current, positions_to_ignore=(loc,)) if m not in visited)
+    visited.remove(loc)
+    return visited
+
+
+def _reference_spider(grid, loc):
+    """Every 3 step path, as get_spider_moves used to"""
+    paths = [[loc]]
+    for _ in range(3):
+        paths = [path + [next_pos]
+                 for path in paths
+                 for next_pos in one_move_away(grid, path[-1], positions_to_ignore=(loc,))
+                 if next_pos not in path]
+    return [path[-1] for path in paths]
+
+
+def test_ant_cant_slide_through_a_gate_into_the_ring():
+    # five pieces ringing (0, 0), open at (2, 0) - which is between (1, -1) and (1, 1), a gate too
+    # narrow to slide through into (0, 0)
+    grid = create_immutable_grid({(-2, 0): (Piece(BLACK, pieces.QUEEN, 1),),
+                                  (-1, -1): (Piece(BLACK, pieces.SPIDER, 1),),
+                                  (1, -1): (Piece(BLACK, pieces.BEETLE, 1),),
+                                  (1, 1): (Piece(WHITE, pieces.QUEEN, 1),),
+                                  (-1, 1): (Piece(WHITE, pieces.SPIDER, 1),),
+                                  (-4, 0): (Piece(WHITE, pieces.ANT, 1),)})
+
+    reachable = get_slide_reachable(grid, (-4, 0))
+    assert sorted(reachable) == sorted(_reference_ant(grid, (-4, 0)))
+    assert (2, 0) in reachable
+    assert (0, 0) not in reachable
+
+
+def test_matches_one_step_at_a_time_on_replayed_games():
+    checked = 0
+    for idx in range(3):
+        for game in replayed_games(idx):
+            for loc in game.grid:
+                if len(game.grid) < 2:
+                    continue
+                assert sorted(get_slide_reachable(game.grid, loc)) == sorted(_reference_ant(game.grid, loc))
+                assert get_slide_walk_ends(game.grid, loc, 3) == _reference_spider(game.grid, loc)
+                checked += 1
+    assert checked > 100
@@ -0,0 +1,123 @@
+from hive.game_engine import pieces
+from hive.game_engine.game_state import WHITE, Piece
+from hive.game_engine.moves import Move, NoMove
+from hive.game_engine.player_functions import get_players_possible_moves_or_placements
+from hive.play.agents.minimax_ai import MinimaxAI
+from hive.play.agents.transposition_table import (BUCKET_SIZE, ENTRY_BYTES, EXACT, LOWER_BOUND, MATE_SCORE,
+                                                  UPPER_BOUND, TranspositionTable, bound_type)
+from tests.test_unit.replays import replayed_game
+
+
+def test_bound_type():
+    assert bound_type(5, 0, 10) == EXACT
+    assert bound_type(0, 0, 10) == UPPER_BOUND
+    assert bound_type(12, 0, 10) == LOWER_BOUND
+
+
+MOVE = Move(Piece(WHITE, pieces.ANT, 1), (0, 0), 0, (4, 0), 0, colour=WHITE)
+DEEP_MOVE = Move(Piece(WHITE, pieces.QUEEN, 1), None, None, (2, 0), 0, colour=WHITE)
+
+
+def test_probe_respects_depth_and_bounds():
+    tt = TranspositionTable(max_entries=64)
+    tt.store(1, depth=3, score=50, flag=EXACT, best_move=MOVE)
+    assert tt.probe(1, 3, -100, 100) == (50, MOVE)
+    assert tt.probe(1, 4, -100, 100) == (None, MOVE)  # too shallow, but still a move hint
+
+    tt.store(2, depth=3, score=50, flag=LOWER_BOUND)
+    assert tt.probe(2, 3, -100, 40)[0] == 50  # at least 50 - fails high against beta 40
+    assert tt.probe(2, 3, -100, 100)[0] is None
+
+    tt.store(3, depth=3, score=-50, flag=UPPER_BOUND)
+    assert tt.probe(3, 3, -40, 100)[0] == -50  # at most -50 - fails low against alpha -40
+    assert tt.probe(3, 3, -100, 100)[0] is None
+
+    assert tt.probe(4, 0, -100, 100) == (None, None)
+
+
+def test_mate_scores_are_counted_from_the_position():
+    tt = TranspositionTable(max_entries=64)
+    tt.store(1, depth=2, score=MATE_SCORE - 5, ply=3)  # a win two plies on, found three plies from the root
+    assert tt.get(1).score == MATE_SCORE - 2
+    assert tt.probe(1, 2, -100, 100, ply=1)[0] == MATE_SCORE - 3
+
+    tt.store(2, depth=2, score=-(MATE_SCORE - 4), ply=2)
+    assert tt.probe(2, 2, -100, 100)[0] == -(MATE_SCORE - 2)
+
+    tt.store(3, depth=2, score=50, ply=3)
+    assert tt.probe(3, 2, -100, 100, ply=1)[0] == 50
+
+
+def test_fixed_capacity_and_replacement():
+    tt = TranspositionTable(max_entries=2 * BUCKET_SIZE)
+    capacity = tt.capacity
+
+    # fill one bucket (keys with the same remainder), then one more
+    keys = [i * tt.n_buckets for i in range(BUCKET_SIZE + 1)]
+    for depth, key in enumerate(keys[:-1]):
+        tt.store(key, depth=depth + 1, score=0)
+    tt.store(keys[-1], depth=10, score=0)
+
+    assert tt.capacity == capacity
+    assert len(tt) == BUCKET_SIZE
+    assert tt.get(keys[0]) is None  # the shallowest went
+    assert tt.get(keys[-1]) is not None
+    assert tt.stats.replacements == 1
+
+
+def test_older_searches_replaced_first():
+    tt = TranspositionTable(max_entries=BUCKET_SIZE)
+    for key in range(BUCKET_SIZE):
+        tt.store(key, depth=10, score=0)
+    tt.new_search()
+    tt.store(100, depth=1, score=0)
+    tt.store(101, depth=1, score=0)
+    assert tt.get(100) is not None and tt.get(101) is not None  # the deep entries were stale
+
+
+def test_same_position_keeps_deeper_result_and_move():
+    tt = TranspositionTable(max_entries=64)
+    tt.store(7, depth=5, score=10, flag=EXACT, best_move=DEEP_MOVE)
+    tt.store(7, depth=2, score=3, flag=LOWER_BOUND)
+    entry = tt.get(7)
+    assert (entry.depth, entry.score, entry.best_move) == (5, 10, DEEP_MOVE)
+
+    tt.store(7, depth=6, score=4, flag=UPPER_BOUND)
+    entry = tt.get(7)
+    assert (entry.depth, entry.score, entry.best_move) == (6, 4, DEEP_MOVE)
+
+
+def test_sized_in_megabytes():
+    tt = TranspositionTable(size_mb=1)
+    assert tt.capacity > 40000
+    assert tt.nbytes <= 1 << 20
+    assert sum(column.itemsize * len(column)
+               for column in (tt.keys, tt.moves, tt.scores, tt.depths, tt.flags, tt.ages)) == tt.capacity * ENTRY_BYTES
+    assert len(tt) == 0
+
+
+def test_entries_round_trip():
+    tt = TranspositionTable(max_entries=64)
+    tt.store(2 ** 64 - 1, depth=300, score=float('inf'), flag=LOWER_BOUND, best_move=NoMove(WHITE))
+    tt.store(0, depth=1, score=-123456, flag=UPPER_BOUND)
+    entry = tt.get(2 ** 64 - 1)
+    assert (entry.depth, entry.score, entry.flag, entry.best_move) == (255, float('inf'), LOWER_BOUND, NoMove(WHITE))
+    entry = tt.get(0)
+    assert (entry.score, entry.flag, entry.best_move) == (-123456, UPPER_BOUND, None)
+    tt.clear()
+    assert tt.get(0) is None and len(tt) == 0
+
+
+def test_minimax_keeps_table_between_moves():
+    game = replayed_game(1, 14)
+
+    ai = MinimaxAI(game.current_turn, max_depth=2, time_limit=60, tt_size_mb=0.1)
+    move = ai.get_move(game)
+    assert move in get_players_possible_moves_or_placements(game.current_turn, game)
+    stored = len(ai.transposition_table)
+    assert stored > 0
+
+    # asked again, the root result is reused rather than searched
+    assert ai.get_move(game) == move
+    assert ai.nodes_evaluated == 0
+    assert len(ai.transposition_table) == stored
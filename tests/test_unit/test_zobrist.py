@@ -0,0 +1,78 @@
+from hive.game_engine import pieces
+from hive.game_engine.game_functions import move_piece, pass_move, place_piece
+from hive.game_engine.game_state import BLACK, WHITE, Piece, initial_game
+from hive.game_engine.history import replace_last_move
+from hive.game_engine.moves import Move
+from hive.game_engine.zobrist import hash_game
+from hive.trajectory.boardspace import replay_trajectory
+from tests.test_unit.replays import replay_game_string
+
+
+def test_empty_game_hashes_to_zero():
+    assert initial_game().zobrist == 0
+
+
+def test_incremental_hash_matches_full_recompute():
+    game = initial_game()
+    game = place_piece(game, Piece(WHITE, pieces.QUEEN, 1), (0, 0))
+    assert game.zobrist == hash_game(game)
+
+    game = place_piece(game, Piece(BLACK, pieces.BEETLE, 1), (2, 0))
+    assert game.zobrist == hash_game(game)
+
+    # beetle climbs onto the queen
+    game = move_piece(game, (2, 0), (0, 0), BLACK)
+    assert game.zobrist == hash_game(game)
+
+    game = pass_move(game, WHITE)
+    assert game.zobrist == hash_game(game)
+
+
+def test_transposition_gives_same_hash():
+    queen = Piece(WHITE, pieces.QUEEN, 1)
+    ant = Piece(BLACK, pieces.ANT, 1)
+
+    game = initial_game()
+    game = place_piece(game, queen, (0, 0))
+    game = place_piece(game, ant, (2, 0))
+    game_a = pass_move(move_piece(game, (0, 0), (1, -1), WHITE), BLACK)  # the pass clears the last move
+
+    grid = {(1, -1): (queen,), (2, 0): (ant,)}
+    game_b = initial_game(grid=grid, current_turn=WHITE)
+
+    assert game_a.zobrist == game_b.zobrist
+
+
+def test_side_to_move_changes_hash():
+    grid = {(0, 0): (Piece(WHITE, pieces.QUEEN, 1),)}
+    assert initial_game(grid=grid, current_turn=WHITE).zobrist != initial_game(grid=grid, current_turn=BLACK).zobrist
+
+
+def test_last_move_changes_hash():
+    # the same grid and side to move, but the pillbug rules differ with the piece moved last turn
+    queen = Piece(WHITE, pieces.QUEEN, 1)
+    ant = Piece(BLACK, pieces.ANT, 1)
+    game = initial_game()
+    game = place_piece(game, queen, (0, 0))
+    game = place_piece(game, ant, (2, 0))
+    game = pass_move(game, WHITE)
+    moved = move_piece(game, (2, 0), (1, -1), BLACK)
+
+    placed = initial_game(grid={(0, 0): (queen,), (1, -1): (ant,)}, current_turn=WHITE)
+    assert placed.zobrist == hash_game(placed)
+    assert moved.zobrist == hash_game(moved)
+    assert moved.zobrist != placed.zobrist
+
+    # and with whether a pillbug moved it
+    thrown = replace_last_move(moved, Move(ant, (2, 0), 0, (1, -1), 0, colour=WHITE, pillbug_moved_other_piece=True))
+    assert thrown.zobrist == hash_game(thrown)
+    assert thrown.zobrist not in (moved.zobrist, placed.zobrist)
+
+
+def test_replayed_game_hash_matches_full_recompute():
+    game_string = replay_game_string()
+    game = replay_trajectory(game_string.moves, game_string.turn)
+
+    while game is not None:
+        assert game.zobrist == hash_game(game)
+        game = game.parent